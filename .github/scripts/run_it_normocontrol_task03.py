@@ -7,8 +7,10 @@ It:
 - Maps GitHub username -> student directory via `students/students.csv`.
 - Ensures the PR changes include the target file:
     `students/<Student>/task_03/Пояснительная_записка.docx`
-- Runs `scripts/standards_verification/check_it_docx.py` for that single file.
-- Collects generated markdown reports from `normocontrol_reports/`.
+- Checks that single file with the IT normocontrol checker: through the warm
+  checker daemon (`scripts/standards_verification/checker_daemon.py`) when it
+  is running, otherwise in this process (no checker subprocess).
+- Saves the markdown report to `normocontrol_reports/`.
 - Writes a ready-to-post PR comment body to `.github/it_normocontrol_comment.md`.
 - Writes a machine-readable result to `.github/it_normocontrol_result.json`.
 
@@ -19,12 +21,13 @@ Exit codes:
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import io
 import json
 import os
-import re
-import subprocess
 import sys
+import traceback
 import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
@@ -208,57 +211,40 @@ def _truncate_for_comment(text: str, limit: int) -> str:
     return truncated
 
 
-def _detect_new_report(before: set[Path], after: set[Path]) -> Path | None:
-    """Return the newest report file created between two snapshots."""
-
-    new_files = [p for p in after - before if p.is_file()]
-    if not new_files:
-        return None
-
-    return max(new_files, key=lambda p: p.stat().st_mtime)
-
-
 def _run_checker(root: Path, docx_path: Path) -> CheckRun:
-    """Run the checker script for a given .docx file."""
-
-    checker = root / "scripts" / "standards_verification" / "check_it_docx.py"
-    reports_dir = root / "normocontrol_reports"
-    reports_dir.mkdir(parents=True, exist_ok=True)
+    """Check a given .docx file (with the checker daemon if it is running)."""
 
-    before = set(reports_dir.glob("it_normocontrol_report_*.md"))
+    checker_dir = root / "scripts" / "standards_verification"
+    if str(checker_dir) not in sys.path:
+        sys.path.insert(0, str(checker_dir))
 
-    proc = subprocess.run(
-        [sys.executable, str(checker), str(docx_path)],
-        cwd=str(root),
-        text=True,
-        capture_output=True,
-    )
-
-    after = set(reports_dir.glob("it_normocontrol_report_*.md"))
-    report_path = _detect_new_report(before, after)
-
-    report_text = ""
-    if report_path and report_path.exists():
-        report_text = _read_text(report_path)
+    stderr = io.StringIO()
+    try:
+        from check_it_docx import save_report, summary_lines
+        from checker_daemon import run_check
 
-    # Fallback: try to parse report path from stdout
-    if not report_text:
-        match = re.search(r"Report:\s*(.+?it_normocontrol_report_\d{8}_\d{6}\.md)", proc.stdout, flags=re.DOTALL)
-        if match:
-            guessed = Path(match.group(1).strip())
-            if not guessed.is_absolute():
-                guessed = (root / guessed).resolve()
-            if guessed.exists():
-                report_path = guessed
-                report_text = _read_text(guessed)
+        with contextlib.redirect_stderr(stderr):
+            result = run_check(docx_path)
+        report_path = save_report(result.report, root / "normocontrol_reports")
+    except Exception:
+        details = stderr.getvalue() + traceback.format_exc()
+        print(details, file=sys.stderr)
+        return CheckRun(
+            docx_path=docx_path,
+            exit_code=1,
+            report_path=None,
+            report_text="",
+            stdout="",
+            stderr=details,
+        )
 
     return CheckRun(
         docx_path=docx_path,
-        exit_code=int(proc.returncode),
+        exit_code=1 if result.report.has_errors() else 0,
         report_path=report_path,
-        report_text=report_text,
-        stdout=proc.stdout,
-        stderr=proc.stderr,
+        report_text=_read_text(report_path),
+        stdout="\n".join(summary_lines(result, report_path)) + "\n",
+        stderr=stderr.getvalue(),
     )
 
 
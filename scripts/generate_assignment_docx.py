@@ -125,23 +125,36 @@ def _set_cell_text(cell, text: str) -> None:
     cell.text = text
 
 
-def _find_cells_containing(doc, needle: str) -> List[Tuple[int, int, int]]:
-    """Return list of (table_idx, row_idx, col_idx) whose cell text contains needle (case-insensitive)."""
-    needle_l = needle.lower()
-    hits: List[Tuple[int, int, int]] = []
-    for ti, tbl in enumerate(doc.tables):
-        for ri, row in enumerate(tbl.rows):
-            for ci, cell in enumerate(row.cells):
-                if needle_l in (cell.text or "").lower():
-                    hits.append((ti, ri, ci))
-    return hits
+def _table_grids(doc):
+    """Grid models of `doc.tables`, built from the lxml tree in one pass per table.
+
+    Unlike python-docx `row.cells`, this stays linear on merged cells
+    (gridSpan/vMerge), see tests/helpers/ooxml_tables.py.
+    """
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+    from tests.helpers.ooxml_tables import TableGrid
+
+    return [TableGrid.from_element(tbl._tbl) for tbl in doc.tables]
+
+
+def _find_cells_containing(grids, needle: str) -> List[Tuple[int, object]]:
+    """Return list of (table_idx, GridCell) whose cell text contains needle (case-insensitive).
+
+    Each merged cell is reported once, at its first row and grid column.
+    """
+    return [(ti, cell) for ti, grid in enumerate(grids) for cell in grid.find(needle)]
 
 
 def _fill_doc_template(template_path: Path, out_path: Path, student: Student, variant: Variant, issued_date: Optional[str], dry_run: bool) -> None:
     _ensure_python_docx()
     from docx import Document  # type: ignore
 
+    from docx.table import _Cell  # type: ignore
+
     doc = Document(str(template_path))
+    grids = _table_grids(doc)
 
     # Strategy:
     # 1) Fill project topic: the cell that contains "1. Тема проекта" -> fill the next cell to the right if exists.
@@ -151,23 +164,22 @@ def _fill_doc_template(template_path: Path, out_path: Path, student: Student, va
     actions = []
 
     def fill_next_to_label(label_substr: str, value: str) -> None:
-        hits = _find_cells_containing(doc, label_substr)
+        hits = _find_cells_containing(grids, label_substr)
         if not hits:
             actions.append(f"label-not-found: {label_substr}")
             return
-        # Use first occurrence
-        ti, ri, ci = hits[0]
-        tbl = doc.tables[ti]
-        row = tbl.rows[ri]
-        if ci + 1 >= len(row.cells):
+        # Use first occurrence; the right neighbour starts after the label's span
+        ti, label = hits[0]
+        ri = label.row
+        target = grids[ti].right_of(label)
+        if target is None:
             actions.append(f"no-right-cell: {label_substr}")
             return
-        target = row.cells[ci + 1]
         if dry_run:
-            actions.append(f"would-fill [{label_substr}] -> (table {ti} row {ri} col {ci+1})")
+            actions.append(f"would-fill [{label_substr}] -> (table {ti} row {ri} col {target.col})")
         else:
-            _set_cell_text(target, value)
-            actions.append(f"filled [{label_substr}] -> (table {ti} row {ri} col {ci+1})")
+            _set_cell_text(_Cell(target.element, doc.tables[ti]), value)
+            actions.append(f"filled [{label_substr}] -> (table {ti} row {ri} col {target.col})")
 
     topic = f"{variant.title_line}"
     fill_next_to_label("Тема проекта", topic)
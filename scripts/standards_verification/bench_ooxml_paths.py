@@ -0,0 +1,188 @@
+"""Micro-benchmark for the precompiled OOXML query registry.
+
+Compares the per-paragraph / per-run cost of the property helpers in
+`tests/helpers/ooxml_utils.py` before and after switching to
+`tests/helpers/ooxml_paths.py` (precompiled XPath objects and Clark-notation
+names instead of namespaced `.find()` calls and f-string attribute names).
+
+The "before" variants are verbatim copies of the previous helpers, kept
+here only for comparison.
+
+Usage (from the repository root):
+- `python scripts/standards_verification/bench_ooxml_paths.py`
+- `python scripts/standards_verification/bench_ooxml_paths.py path/to/Your.docx`
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+
+def _resolve_repo_root() -> Path:
+    """Resolve repository root from script location."""
+
+    return Path(__file__).resolve().parents[2]
+
+
+def _synthetic_document(paragraphs: int):
+    """Build a document.xml tree with typical explanatory-note paragraphs."""
+
+    from lxml import etree
+
+    from tests.helpers.ooxml_utils import NS
+
+    paragraph = (
+        "<w:p>"
+        '<w:pPr><w:pStyle w:val="a"/><w:spacing w:line="240" w:lineRule="auto" w:after="0"/>'
+        '<w:ind w:firstLine="709"/><w:jc w:val="both"/></w:pPr>'
+        '<w:r><w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:sz w:val="28"/></w:rPr>'
+        "<w:t>Текст абзаца пояснительной записки</w:t></w:r>"
+        "<w:r><w:t> и продолжение.</w:t></w:r>"
+        "</w:p>"
+    )
+    xml = f'<w:document xmlns:w="{NS["w"]}"><w:body>{paragraph * paragraphs}<w:sectPr/></w:body></w:document>'
+    return etree.fromstring(xml.encode("utf-8"))
+
+
+def _legacy_paragraph_properties(paragraph) -> dict:
+    """Previous get_paragraph_properties (namespaced find + f-strings)."""
+
+    from tests.helpers.ooxml_utils import NS
+
+    props = {}
+    p_pr = paragraph.find("w:pPr", namespaces=NS)
+    if p_pr is None:
+        return props
+    spacing = p_pr.find("w:spacing", namespaces=NS)
+    if spacing is not None:
+        props["spacing"] = {
+            "line": spacing.get(f"{{{NS['w']}}}line"),
+            "lineRule": spacing.get(f"{{{NS['w']}}}lineRule"),
+            "before": spacing.get(f"{{{NS['w']}}}before"),
+            "after": spacing.get(f"{{{NS['w']}}}after"),
+        }
+    ind = p_pr.find("w:ind", namespaces=NS)
+    if ind is not None:
+        props["ind"] = {
+            "left": ind.get(f"{{{NS['w']}}}left"),
+            "right": ind.get(f"{{{NS['w']}}}right"),
+            "firstLine": ind.get(f"{{{NS['w']}}}firstLine"),
+            "hanging": ind.get(f"{{{NS['w']}}}hanging"),
+        }
+    jc = p_pr.find("w:jc", namespaces=NS)
+    if jc is not None:
+        props["jc"] = jc.get(f"{{{NS['w']}}}val")
+    style = p_pr.find("w:pStyle", namespaces=NS)
+    if style is not None:
+        props["style"] = style.get(f"{{{NS['w']}}}val")
+    return props
+
+
+def _legacy_run_properties(run) -> dict:
+    """Previous get_run_properties (namespaced find + f-strings)."""
+
+    from tests.helpers.ooxml_utils import NS
+
+    props = {}
+    r_pr = run.find("w:rPr", namespaces=NS)
+    if r_pr is None:
+        return props
+    sz = r_pr.find("w:sz", namespaces=NS)
+    if sz is not None:
+        props["sz"] = int(sz.get(f"{{{NS['w']}}}val"))
+    r_fonts = r_pr.find("w:rFonts", namespaces=NS)
+    if r_fonts is not None:
+        props["rFonts"] = {
+            "ascii": r_fonts.get(f"{{{NS['w']}}}ascii"),
+            "hAnsi": r_fonts.get(f"{{{NS['w']}}}hAnsi"),
+            "cs": r_fonts.get(f"{{{NS['w']}}}cs"),
+        }
+    if r_pr.find("w:b", namespaces=NS) is not None:
+        props["b"] = True
+    if r_pr.find("w:i", namespaces=NS) is not None:
+        props["i"] = True
+    return props
+
+
+def _per_item_ns(func, items, repeat: int) -> float:
+    """Best-of-`repeat` cost of calling `func` once per item, in nanoseconds."""
+
+    def run() -> None:
+        for item in items:
+            func(item)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / max(len(items), 1) * 1e9
+
+
+def main() -> int:
+    """CLI entrypoint."""
+
+    parser = argparse.ArgumentParser(description="Benchmark OOXML property helpers before/after ooxml_paths")
+    parser.add_argument("docx", nargs="?", type=Path, help="Optional .docx to benchmark on (default: synthetic)")
+    parser.add_argument("--paragraphs", type=int, default=5000, help="Synthetic document size (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions; best time is reported (default: 5)")
+    args = parser.parse_args()
+
+    repo_root = _resolve_repo_root()
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+    from lxml import etree
+
+    from tests.helpers.ooxml_paths import XP_PARAGRAPHS, XP_RUNS
+    from tests.helpers.ooxml_utils import NS, DocxPackage, get_paragraph_properties, get_run_properties
+
+    if args.docx:
+        with DocxPackage(args.docx) as package:
+            doc_xml = package.document_xml
+        source = args.docx.name
+    else:
+        doc_xml = _synthetic_document(args.paragraphs)
+        source = f"synthetic ({args.paragraphs} paragraphs)"
+
+    paragraphs = XP_PARAGRAPHS(doc_xml)
+    runs = XP_RUNS(doc_xml)
+
+    legacy_xpath = lambda root: root.xpath(".//w:p", namespaces=NS)  # noqa: E731
+    compiled_xpath = XP_PARAGRAPHS
+    assert legacy_xpath(doc_xml) == compiled_xpath(doc_xml)
+    for paragraph in paragraphs[:50]:
+        # New keys (outlineLvl, numPr) are not produced by the legacy helper
+        current = get_paragraph_properties(paragraph)
+        assert all(current.get(k) == v for k, v in _legacy_paragraph_properties(paragraph).items())
+
+    rows = [
+        (
+            "paragraph properties",
+            "ns/paragraph",
+            _per_item_ns(_legacy_paragraph_properties, paragraphs, args.repeat),
+            _per_item_ns(get_paragraph_properties, paragraphs, args.repeat),
+        ),
+        (
+            "run properties",
+            "ns/run",
+            _per_item_ns(_legacy_run_properties, runs, args.repeat),
+            _per_item_ns(get_run_properties, runs, args.repeat),
+        ),
+        (
+            "all paragraphs query",
+            "ns/paragraph",
+            _per_item_ns(legacy_xpath, [doc_xml], args.repeat) / max(len(paragraphs), 1),
+            _per_item_ns(compiled_xpath, [doc_xml], args.repeat) / max(len(paragraphs), 1),
+        ),
+    ]
+
+    print(f"Source: {source}; paragraphs={len(paragraphs)}, runs={len(runs)}, lxml={etree.__version__}")
+    print(f"{'helper':<24}{'unit':<14}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name, unit, before, after in rows:
+        print(f"{name:<24}{unit:<14}{before:>10.0f}{after:>10.0f}{before / after:>9.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,334 @@
+"""Batch IT normocontrol checker (short checklist) for many .docx files.
+
+Runs the checks of `check_it_docx.py` for every document found in the given
+inputs and writes one merged report:
+- a .docx file;
+- a directory (all .docx files below it, recursively);
+- a glob pattern, e.g. `students/*/task_03/*.docx` (quote it in the shell).
+
+Documents are checked in worker processes (`--jobs N`, default: number of
+CPUs); every worker keeps its own warm imports and per-document caches.
+When the checker daemon (`checker_daemon.py`) is running, the documents are
+sent to it instead (up to N requests at a time), and its warm process
+checks them; `--no-daemon` always checks in local worker processes.
+Progress is printed to stderr as documents complete. The merged report does
+not depend on the completion order: documents are listed in the order of
+their names (paths relative to the current directory).
+
+Exit codes:
+- 0: no errors (warnings allowed)
+- 1: at least one error, or no documents found
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from check_it_docx import (
+    CompiledConfig,
+    DocumentCheck,
+    _RULES,
+    _ensure_tests_helpers_on_syspath,
+    _resolve_repo_root,
+    check_document,
+    default_config,
+)
+from checker_daemon import check_with_daemon, daemon_running, default_socket_path
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+# Compiled checklist of a worker process (set once by `_init_worker`)
+_WORKER_CONFIG: CompiledConfig | None = None
+
+
+def _document_name(path: Path, base: Path) -> str:
+    """Name of a document in the report: path relative to `base` (posix form)."""
+
+    try:
+        return path.relative_to(base).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def collect_documents(inputs: list[str], base: Path | None = None) -> tuple[list[tuple[str, Path]], list[str]]:
+    """Expand files, directories and glob patterns into documents to check.
+
+    Word lock files (`~$*.docx`) are skipped; a file reached through several
+    inputs is checked once.
+
+    Returns:
+        ((name, path) pairs sorted by name, inputs that matched no documents)
+    """
+
+    base = (base or Path.cwd()).resolve()
+    found: dict[Path, str] = {}
+    unmatched: list[str] = []
+    for raw in inputs:
+        if _GLOB_CHARS.intersection(raw):
+            candidates = [Path(match) for match in glob.glob(raw, recursive=True)]
+        else:
+            candidates = [Path(raw)]
+
+        matched = False
+        for candidate in candidates:
+            if candidate.is_dir():
+                paths = candidate.rglob("*.docx")
+            elif candidate.is_file() and candidate.suffix.lower() == ".docx":
+                paths = [candidate]
+            else:
+                continue
+            for path in paths:
+                if path.name.startswith("~$") or not path.is_file():
+                    continue
+                resolved = path.resolve()
+                found.setdefault(resolved, _document_name(resolved, base))
+                matched = True
+        if not matched:
+            unmatched.append(raw)
+
+    documents = sorted(((name, path) for path, name in found.items()), key=lambda item: item[0])
+    return documents, unmatched
+
+
+def _init_worker(compiled: CompiledConfig) -> None:
+    """Receive the compiled checklist once per worker process."""
+
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = compiled
+
+
+def _check_one(
+    docx_path: Path,
+    doc_name: str,
+    compiled: CompiledConfig | None,
+    streaming: bool,
+    use_cache: bool,
+    rules: list[str] | None,
+) -> DocumentCheck:
+    """Check one document (runs in a worker process).
+
+    `compiled` is None in worker processes, which use the checklist passed
+    to `_init_worker`. An unexpected exception is reported as an error of
+    this document instead of aborting the whole batch.
+    """
+
+    try:
+        return check_document(
+            docx_path, compiled or _WORKER_CONFIG, doc_name=doc_name, streaming=streaming, use_cache=use_cache, rules=rules
+        )
+    except Exception as exc:  # noqa: BLE001 - one broken document must not stop the batch
+        _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+        from tests.helpers.report import NormocontrolReport
+
+        report = NormocontrolReport()
+        report.add_document(doc_name)
+        report.add_issue(
+            doc_name,
+            "package",
+            "error",
+            "Документ не может быть проверен",
+            expected="Проверка без внутренних ошибок",
+            actual=f"{type(exc).__name__}: {exc}",
+        )
+        return DocumentCheck(report)
+
+
+def _check_via_daemon(
+    docx_path: Path,
+    doc_name: str,
+    compiled: CompiledConfig,
+    streaming: bool,
+    use_cache: bool,
+    rules: list[str] | None,
+) -> DocumentCheck:
+    """Check one document with the daemon (in a client thread), in-process if it refuses.
+
+    The daemon refuses a checklist other than its own, so `compiled` is
+    always honoured.
+    """
+
+    result = check_with_daemon(
+        docx_path, doc_name=doc_name, streaming=streaming, use_cache=use_cache, rules=rules, compiled=compiled
+    )
+    if result is not None:
+        return result
+    return _check_one(docx_path, doc_name, compiled, streaming, use_cache, rules)
+
+
+def _progress(done: int, total: int, doc_name: str, result: DocumentCheck) -> None:
+    summary = result.report.generate_summary()
+    cached = ", cached" if result.cached else ""
+    print(
+        f"[{done}/{total}] {doc_name} (errors={summary['errors']}, warnings={summary['warnings']}{cached})",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def check_batch(
+    documents: list[tuple[str, Path]],
+    compiled: CompiledConfig,
+    jobs: int = 1,
+    streaming: bool = False,
+    use_cache: bool = True,
+    rules: list[str] | None = None,
+    use_daemon: bool = True,
+):
+    """Check documents on `jobs` worker processes and merge their reports.
+
+    Args:
+        documents: (name, path) pairs, in report order.
+        compiled: Compiled checklist, sent once to every worker (the workers
+            do not parse the markdown).
+        jobs: Number of worker processes (1: check in this process), or of
+            concurrent requests to the daemon.
+        streaming, use_cache, rules: See `check_document`.
+        use_daemon: Send the documents to the checker daemon if it is running.
+
+    Returns:
+        NormocontrolReport with the documents in the order of `documents`.
+    """
+
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+    from tests.helpers.report import NormocontrolReport
+
+    total = len(documents)
+    results: list[DocumentCheck | None] = [None] * total
+    jobs = max(1, min(jobs, total))
+    daemon = use_daemon and daemon_running()
+    if daemon:
+        print(f"Using checker daemon: {default_socket_path()}", file=sys.stderr)
+    if jobs == 1 and not daemon:
+        for position, (doc_name, docx_path) in enumerate(documents):
+            results[position] = _check_one(docx_path, doc_name, compiled, streaming, use_cache, rules)
+            _progress(position + 1, total, doc_name, results[position])
+    else:
+        if daemon:
+            # The daemon forks a warm worker per request: client threads only wait
+            pool = ThreadPoolExecutor(max_workers=jobs)
+            task, task_config = _check_via_daemon, compiled
+        else:
+            pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(compiled,))
+            task, task_config = _check_one, None
+        with pool:
+            futures = {
+                pool.submit(task, docx_path, doc_name, task_config, streaming, use_cache, rules): position
+                for position, (doc_name, docx_path) in enumerate(documents)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                position = futures[future]
+                results[position] = future.result()
+                _progress(done, total, documents[position][0], results[position])
+
+    report = NormocontrolReport()
+    for result in results:
+        report.merge(result.report)
+    return report
+
+
+def main() -> int:
+    """CLI entrypoint."""
+
+    import argparse
+
+    repo_root = _resolve_repo_root()
+
+    parser = argparse.ArgumentParser(description="IT normocontrol checker for many .docx files")
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Files, directories (searched recursively) or glob patterns, e.g. 'students/*/task_03/*.docx'",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse document.xml incrementally with bounded memory (very large documents)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the result and parsed-document caches ($NORMOCONTROL_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--rules",
+        help="Comma-separated checks to run (default: all; see check_it_docx.py --list-rules)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Check in local worker processes even if the checker daemon is running",
+    )
+    parser.add_argument("--json", action="store_true", help="Also write the merged report as JSON")
+    parser.add_argument(
+        "--report-dir",
+        type=Path,
+        default=repo_root / "normocontrol_reports",
+        help="Directory for the merged report (default: normocontrol_reports/)",
+    )
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        print("ERROR: --jobs must be at least 1")
+        return 1
+
+    rules = None
+    if args.rules:
+        rules = [name.strip() for name in args.rules.split(",") if name.strip()]
+        unknown = sorted(set(rules) - {name for name, _needs, _check in _RULES})
+        if unknown:
+            print(f"ERROR: Unknown rules: {', '.join(unknown)} (see check_it_docx.py --list-rules)")
+            return 1
+
+    documents, unmatched = collect_documents(args.inputs)
+    for raw in unmatched:
+        print(f"WARNING: No .docx files found for: {raw}", file=sys.stderr)
+    if not documents:
+        print("ERROR: No .docx files to check")
+        return 1
+
+    report = check_batch(
+        documents,
+        default_config(),
+        jobs=args.jobs,
+        streaming=args.stream,
+        use_cache=not args.no_cache,
+        rules=rules,
+        use_daemon=not args.no_daemon,
+    )
+
+    args.report_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = args.report_dir / f"it_normocontrol_batch_{timestamp}.md"
+    report.to_markdown(report_path)
+    print(f"✓ Report: {report_path}")
+    if args.json:
+        json_path = report_path.with_suffix(".json")
+        report.to_json(json_path)
+        print(f"✓ JSON: {json_path}")
+
+    summary = report.generate_summary()
+    with_errors = sum(
+        1 for doc in report.documents_checked
+        if any(issue.severity == "error" for issue in report.get_issues_by_document(doc))
+    )
+    print(f"Checked: {summary['total_documents']} document(s), with errors: {with_errors}")
+    print(f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})")
+
+    return 1 if report.has_errors() else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,7 +3,8 @@
 This script is intended as a lightweight alternative to running pytest.
 It validates a single .docx file using the hybrid approach:
 - OOXML (ZIP + XML) for strict page setup and low-level formatting checks
-- python-docx for high-level structure checks
+- a paragraph text model built from the same XML tree for high-level
+  structure checks (no separate python-docx parse)
 
 Default target: tests/ПЗ.docx
 
@@ -14,14 +15,16 @@ Exit codes:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 import sys
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Callable
 from datetime import datetime
 from pathlib import Path
 
-from docx import Document
-
 
 @dataclass(frozen=True)
 class ItNormocontrolConfig:
@@ -77,7 +80,15 @@ def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig
         ValueError: If required values cannot be parsed.
     """
 
-    text = _read_text_file(standards_md_path)
+    return parse_it_normocontrol_config(_read_text_file(standards_md_path))
+
+
+def parse_it_normocontrol_config(text: str) -> ItNormocontrolConfig:
+    """Parse IT normocontrol requirements from the text of the markdown checklist.
+
+    Raises:
+        ValueError: If required values cannot be parsed.
+    """
 
     # 1) Margins
     # Example: "Поля (мм): левое 23, правое 10, верхнее 20, нижнее 15."
@@ -173,6 +184,168 @@ def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig
     )
 
 
+# Bump when the layout of ItNormocontrolConfig or of the artifact changes
+CONFIG_VERSION = 1
+
+# Compiled checklists of this process: (path, mtime_ns, size) -> CompiledConfig
+_COMPILED: dict[tuple[str, int, int], "CompiledConfig"] = {}
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Checklist compiled from the markdown, validated and versioned.
+
+    It is picklable and small: batch workers receive it once instead of
+    parsing the markdown themselves.
+
+    Attributes:
+        config: Parsed and validated values.
+        hash: SHA-256 of CONFIG_VERSION and the values (part of the result
+            cache keys: a change of the standard invalidates stored results).
+        source_sha256: SHA-256 of the markdown it was compiled from.
+        source_mtime_ns: Modification time of the markdown when last checked.
+        source_size: Size of the markdown in bytes.
+    """
+
+    config: ItNormocontrolConfig
+    hash: str
+    source_sha256: str = ""
+    source_mtime_ns: int = 0
+    source_size: int = 0
+
+
+def config_hash(config: ItNormocontrolConfig) -> str:
+    """SHA-256 of CONFIG_VERSION and the checklist values."""
+
+    data = json.dumps({"version": CONFIG_VERSION, "config": asdict(config)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def validate_config(config: ItNormocontrolConfig) -> None:
+    """Check that the parsed checklist values are plausible.
+
+    Raises:
+        ValueError: Listing every implausible value.
+    """
+
+    problems = []
+    margins = (config.margins_left_mm, config.margins_right_mm, config.margins_top_mm, config.margins_bottom_mm)
+    if any(margin <= 0 for margin in margins):
+        problems.append("поля страницы должны быть больше 0 мм")
+    if config.margins_left_mm + config.margins_right_mm >= config.page_width_mm:
+        problems.append("левое и правое поля не помещаются на странице")
+    if config.margins_top_mm + config.margins_bottom_mm >= config.page_height_mm:
+        problems.append("верхнее и нижнее поля не помещаются на странице")
+    if not config.main_font_name.strip():
+        problems.append("не указан основной шрифт")
+    for label, size in (("основной кегль", config.main_font_size_pt),
+                        ("кегль для таблиц/подписей", config.inline_objects_font_size_pt)):
+        if not 1 <= size <= 72:
+            problems.append(f"{label} вне диапазона 1–72 pt: {size}")
+    if not 0 < config.line_spacing_expected <= 3:
+        problems.append(f"межстрочный интервал вне диапазона (0; 3]: {config.line_spacing_expected}")
+    if not 0 <= config.first_line_indent_cm <= 5:
+        problems.append(f"абзацный отступ вне диапазона 0–50 мм: {config.first_line_indent_cm * 10:g} мм")
+    duplicates = sorted({s for s in config.required_sections_in_order
+                         if config.required_sections_in_order.count(s) > 1})
+    if duplicates:
+        problems.append(f"разделы повторяются: {', '.join(duplicates)}")
+    if problems:
+        raise ValueError("Некорректные значения в чек-листе: " + "; ".join(problems))
+
+
+def _config_artifact_path(standards_md: Path) -> Path:
+    from tests.helpers.ooxml_ir import cache_root
+
+    name = hashlib.sha256(str(standards_md).encode("utf-8")).hexdigest()[:16]
+    return cache_root() / "config" / f"{name}.json"
+
+
+def _read_config_artifact(path: Path) -> CompiledConfig | None:
+    """Artifact written by `compile_config` (None if missing, stale or damaged)."""
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != CONFIG_VERSION or data.get("checker") != checker_version():
+            return None
+        config = ItNormocontrolConfig(**data["config"])
+        compiled = CompiledConfig(
+            config,
+            data["hash"],
+            source_sha256=data["source_sha256"],
+            source_mtime_ns=int(data["source_mtime_ns"]),
+            source_size=int(data["source_size"]),
+        )
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    return compiled if compiled.hash == config_hash(config) else None
+
+
+def _write_config_artifact(path: Path, compiled: CompiledConfig) -> None:
+    from tests.helpers.ooxml_ir import atomic_write
+
+    data = {
+        "version": CONFIG_VERSION,
+        "checker": checker_version(),
+        "hash": compiled.hash,
+        "source_sha256": compiled.source_sha256,
+        "source_mtime_ns": compiled.source_mtime_ns,
+        "source_size": compiled.source_size,
+        "config": asdict(compiled.config),
+    }
+    try:
+        atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+    except OSError as exc:
+        print(f"WARNING: compiled checklist not saved: {exc}", file=sys.stderr)
+
+
+def compile_config(standards_md: Path) -> CompiledConfig:
+    """Compile the markdown checklist, reusing the stored artifact when it is current.
+
+    The artifact (a JSON file in the cache directory) is reused while the
+    markdown keeps its mtime and size; otherwise the markdown is read and the
+    artifact is reused only if its SHA-256 is unchanged (e.g. after a fresh
+    checkout), and recompiled and validated if not. Within a process the
+    result is also kept in memory.
+
+    Raises:
+        ValueError: If required values cannot be parsed or are implausible.
+    """
+
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+
+    standards_md = standards_md.resolve()
+    stat = standards_md.stat()
+    memo_key = (str(standards_md), stat.st_mtime_ns, stat.st_size)
+    compiled = _COMPILED.get(memo_key)
+    if compiled is not None:
+        return compiled
+
+    artifact_path = _config_artifact_path(standards_md)
+    stored = _read_config_artifact(artifact_path)
+    if stored is not None and (stored.source_mtime_ns, stored.source_size) == (stat.st_mtime_ns, stat.st_size):
+        compiled = stored
+    else:
+        data = standards_md.read_bytes()
+        source_sha256 = hashlib.sha256(data).hexdigest()
+        if stored is not None and stored.source_sha256 == source_sha256:
+            config = stored.config
+        else:
+            config = parse_it_normocontrol_config(data.decode("utf-8"))
+            validate_config(config)
+        compiled = CompiledConfig(
+            config,
+            config_hash(config),
+            source_sha256=source_sha256,
+            source_mtime_ns=stat.st_mtime_ns,
+            source_size=stat.st_size,
+        )
+        _write_config_artifact(artifact_path, compiled)
+
+    _COMPILED[memo_key] = compiled
+    return compiled
+
+
 def _ensure_tests_helpers_on_syspath(repo_root: Path) -> None:
     """Ensure the repository root is on sys.path.
 
@@ -192,12 +365,6 @@ def _resolve_repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def _extract_all_text(doc: Document) -> str:
-    """Extract joined plain text from a Word document."""
-
-    return "\n".join(p.text for p in doc.paragraphs)
-
-
 def _find_section_positions(text: str, section_titles: list[str]) -> dict[str, int]:
     """Find first occurrence positions of section titles in text.
 
@@ -216,17 +383,99 @@ def _find_section_positions(text: str, section_titles: list[str]) -> dict[str, i
     return positions
 
 
-def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check page size and margins using OOXML."""
+# Registered checks in report order: (name, views the check reads, check).
+# Filled by @_rule; the views are built by tests/helpers/ooxml_views.py.
+_RULES: list[tuple[str, tuple[str, ...], Callable]] = []
 
-    from tests.helpers.ooxml_utils import (
-        get_page_margins,
-        get_page_size,
-        mm_to_twips,
-        twips_to_mm,
-    )
 
-    margins = get_page_margins(doc_xml)
+def _rule(name: str, needs: tuple[str, ...] = ()) -> Callable:
+    """Register a check `check(doc_name, views, report, config)` reading `needs`."""
+
+    def decorator(check: Callable) -> Callable:
+        _RULES.append((name, tuple(needs), check))
+        return check
+
+    return decorator
+
+
+def _rule_registry():
+    """RuleRegistry with the checks of this script (tests.helpers must be importable)."""
+
+    from tests.helpers.ooxml_views import RuleRegistry
+
+    registry = RuleRegistry()
+    for name, needs, check in _RULES:
+        registry.register(name, needs)(check)
+    return registry
+
+
+@_rule("page_setup", needs=("sections",))
+def _check_page_setup_rule(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Page size and margins of every section (w:sectPr) collected during the document walk.
+
+    Sections with identical setup are reported together, so a single-section
+    document yields the same issues as before.
+    """
+
+    sections = views["sections"]
+    if not sections:
+        _check_page_setup(doc_name, None, None, report, config)
+        return
+
+    groups: dict[tuple, list] = {}
+    for section in sections:
+        key = (
+            tuple(sorted((section.margins or {}).items())) if section.margins is not None else None,
+            tuple(sorted((section.page_size or {}).items())) if section.page_size is not None else None,
+        )
+        groups.setdefault(key, []).append(section)
+
+    multiple = len(sections) > 1
+    for group in groups.values():
+        first = group[0]
+        _check_page_setup(
+            doc_name,
+            first.margins,
+            first.page_size,
+            report,
+            config,
+            section=", ".join(s.describe() for s in group) if multiple else "",
+            landscape=first.landscape,
+        )
+
+
+def _rotated_margins(expected: dict[str, float]) -> list[dict[str, float]]:
+    """Expected margins of a landscape page: as-is or rotated either way."""
+
+    top, right, bottom, left = (expected[k] for k in ("top", "right", "bottom", "left"))
+    return [
+        expected,
+        {"top": left, "right": top, "bottom": right, "left": bottom},
+        {"top": right, "right": bottom, "bottom": left, "left": top},
+    ]
+
+
+def _check_page_setup(
+    doc_name: str,
+    margins: dict[str, int] | None,
+    page_size: dict | None,
+    report,
+    config: ItNormocontrolConfig,
+    section: str = "",
+    landscape: bool = False,
+) -> None:
+    """Check page size and margins (in twips, as read from w:sectPr).
+
+    Args:
+        section: Sections the setup belongs to (prefix of issue locations)
+        landscape: Accept rotated A4 and rotated margins
+    """
+
+    from tests.helpers.ooxml_utils import mm_to_twips, twips_to_mm
+
+    def at(location: str) -> str:
+        return f"{section}: {location}" if section else location
+
     if not margins:
         report.add_issue(
             doc_name,
@@ -235,7 +484,7 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
             "Поля страницы не найдены",
             expected="Поля должны быть заданы",
             actual="Поля отсутствуют",
-            location="Разметка страницы → Поля",
+            location=at("Разметка страницы → Поля"),
         )
     else:
         expected = {
@@ -247,7 +496,18 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
         tolerance_mm = 1.5
         tolerance_twips = mm_to_twips(tolerance_mm)
 
-        for key, expected_mm in expected.items():
+        def mismatches(candidate: dict[str, float]) -> list[str]:
+            return [
+                key for key, expected_mm in candidate.items()
+                if key not in margins or abs(margins[key] - mm_to_twips(expected_mm)) > tolerance_twips
+            ]
+
+        if landscape:
+            # Word rotates margins together with the page; report against the closest variant
+            expected = min(_rotated_margins(expected), key=lambda candidate: len(mismatches(candidate)))
+
+        for key in mismatches(expected):
+            expected_mm = expected[key]
             if key not in margins:
                 report.add_issue(
                     doc_name,
@@ -256,26 +516,20 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
                     f"Поле '{key}' не задано",
                     expected=f"{expected_mm} мм",
                     actual="не задано",
-                    location="Разметка страницы → Поля",
+                    location=at("Разметка страницы → Поля"),
                 )
                 continue
 
-            actual_twips = margins[key]
-            expected_twips = mm_to_twips(expected_mm)
-            diff_twips = abs(actual_twips - expected_twips)
-
-            if diff_twips > tolerance_twips:
-                report.add_issue(
-                    doc_name,
-                    "page_setup",
-                    "error",
-                    f"Некорректное поле '{key}'",
-                    expected=f"{expected_mm} мм",
-                    actual=f"{twips_to_mm(actual_twips):.1f} мм",
-                    location="Разметка страницы → Поля → Настраиваемые поля",
-                )
+            report.add_issue(
+                doc_name,
+                "page_setup",
+                "error",
+                f"Некорректное поле '{key}'",
+                expected=f"{expected_mm} мм",
+                actual=f"{twips_to_mm(margins[key]):.1f} мм",
+                location=at("Разметка страницы → Поля → Настраиваемые поля"),
+            )
 
-    page_size = get_page_size(doc_xml)
     if not page_size:
         report.add_issue(
             doc_name,
@@ -284,10 +538,13 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
             "Размер страницы не найден",
             expected="A4 (210×297 мм)",
             actual="не найден",
+            location=section,
         )
     else:
         a4_width_twips = mm_to_twips(config.page_width_mm)
         a4_height_twips = mm_to_twips(config.page_height_mm)
+        if landscape:
+            a4_width_twips, a4_height_twips = a4_height_twips, a4_width_twips
         tolerance = mm_to_twips(5)
 
         width_diff = abs(page_size["width"] - a4_width_twips)
@@ -299,79 +556,56 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
                 "page_setup",
                 "warning",
                 "Размер страницы не соответствует A4",
-                expected="210×297 мм",
+                expected="297×210 мм (альбомная)" if landscape else "210×297 мм",
                 actual=f"{twips_to_mm(page_size['width']):.0f}×{twips_to_mm(page_size['height']):.0f} мм",
+                location=section,
             )
 
 
-def _check_paragraph_formatting(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check indentation and line spacing using OOXML (best-effort)."""
-
-    from tests.helpers.ooxml_utils import (
-        NS,
-        cm_to_twips,
-        get_paragraph_properties,
-        twips_to_cm,
-    )
-
-    paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
+@_rule("paragraph_formatting", needs=("formatting_table", "paragraph_index"))
+def _check_paragraph_formatting(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """First-line indent and line spacing (best-effort).
 
-    # Indent: 12.5 mm (1.25 cm)
-    expected_indent = cm_to_twips(config.first_line_indent_cm)
-    tolerance = cm_to_twips(0.1)  # 1mm
+    Evaluated column-wise over the FormattingTable filled during the walk.
+    """
 
-    invalid_indents: list[float] = []
-    for p in paragraphs:
-        props = get_paragraph_properties(p)
-        first_line_raw = props.get("ind", {}).get("firstLine")
-        if not first_line_raw:
-            continue
+    from tests.helpers.ooxml_columns import count_outside, rows_outside, select, where_equal
+    from tests.helpers.ooxml_utils import cm_to_twips, twips_to_cm
 
-        try:
-            first_line = int(round(float(first_line_raw)))
-        except (TypeError, ValueError):
-            continue
+    table = views["formatting_table"]
+    index = views["paragraph_index"]
 
-        if abs(first_line - expected_indent) > tolerance:
-            invalid_indents.append(twips_to_cm(first_line))
+    # Indent: 12.5 mm (1.25 cm), tolerance 1 mm
+    expected_indent = cm_to_twips(config.first_line_indent_cm)
+    tolerance = cm_to_twips(0.1)
+    low = expected_indent - tolerance
+    high = expected_indent + tolerance
 
+    invalid_indents = count_outside(table.first_line, low, high)
     if invalid_indents:
-        examples = ", ".join(f"{cm:.2f} см" for cm in invalid_indents[:5])
+        rows = rows_outside(table.first_line, low, high, limit=5)
+        examples = ", ".join(f"{twips_to_cm(table.first_line[row]):.2f} см" for row in rows)
         report.add_issue(
             doc_name,
             "paragraphs",
             "warning",
-            f"Найдены некорректные отступы первой строки ({len(invalid_indents)} шт.)",
+            f"Найдены некорректные отступы первой строки ({invalid_indents} шт.)",
             expected=f"{config.first_line_indent_cm:.2f} см",
             actual=examples,
+            location=index.locations(
+                [table.paragraph_ordinal[row] for row in rows],
+                total=invalid_indents,
+            ),
         )
 
     # Line spacing: 1.0 usually corresponds to w:spacing line=240 with lineRule=auto
-    paragraphs_with_spacing = doc_xml.xpath(".//w:p[w:pPr/w:spacing]", namespaces=NS)
-
-    invalid_spacing = 0
-    for p in paragraphs_with_spacing:
-        props = get_paragraph_properties(p)
-        spacing = props.get("spacing")
-        if not spacing:
-            continue
-
-        line = spacing.get("line")
-        line_rule = spacing.get("lineRule")
-        if not line or line_rule != "auto":
-            continue
-
-        try:
-            line_val = int(line)
-        except (TypeError, ValueError):
-            continue
-
-        # 240 = single, 360 = 1.5, 480 = double
-        if not (220 <= line_val <= 260):
-            invalid_spacing += 1
-
+    # (240 = single, 360 = 1.5, 480 = double)
+    paragraphs_with_spacing = sum(table.has_spacing)
     if paragraphs_with_spacing:
-        ratio = invalid_spacing / len(paragraphs_with_spacing)
+        auto = table.code("auto")
+        auto_lines = select(table.line, where_equal(table.line_rule, auto)) if auto is not None else []
+        invalid_spacing = count_outside(auto_lines, 220, 260)
+        ratio = invalid_spacing / paragraphs_with_spacing
         if ratio > 0.8:
             report.add_issue(
                 doc_name,
@@ -379,86 +613,216 @@ def _check_paragraph_formatting(doc_name: str, doc_xml, report, config: ItNormoc
                 "warning",
                 "Много параграфов с явно заданным некорректным интервалом",
                 expected="1.0 (одинарный)",
-                actual=f"{invalid_spacing} из {len(paragraphs_with_spacing)}",
+                actual=f"{invalid_spacing} из {paragraphs_with_spacing}",
             )
 
 
-def _check_fonts(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check that explicit font settings use Times New Roman and sizes 14/12pt."""
+def _share(part: int, total: int) -> str:
+    """Percentage for reports; small non-zero shares show as "<1%"."""
+
+    share = part / total if total else 0.0
+    if 0 < share < 0.005:
+        return "<1%"
+    return f"{share:.0%}"
 
-    from tests.helpers.ooxml_utils import (
-        NS,
-        get_run_properties,
-        pt_to_half_points,
-    )
 
-    runs = doc_xml.xpath(".//w:r", namespaces=NS)
-    fonts_used: set[str] = set()
-    sizes: list[int] = []
+# Fonts: warn when more text (body + headings) than this is in other fonts
+_FOREIGN_FONT_SHARE = 0.1
+_FONT_LOCATION_EXAMPLES = 3
+_FONT_SUMMARY_ENTRIES = 3
 
-    for run in runs[:250]:
-        props = get_run_properties(run)
 
-        r_fonts = props.get("rFonts")
-        if r_fonts:
-            for key in ("ascii", "hAnsi", "cs"):
-                font_name = r_fonts.get(key)
-                if font_name:
-                    fonts_used.add(font_name)
+def _allowed_font_sizes(config: ItNormocontrolConfig) -> dict[int, set[int]]:
+    """Allowed font sizes (half-points) per run context."""
 
-        if "sz" in props:
-            sizes.append(int(props["sz"]))
+    from tests.helpers.ooxml_columns import (
+        CONTEXT_BODY,
+        CONTEXT_CAPTION,
+        CONTEXT_HEADING,
+        CONTEXT_TABLE,
+    )
+    from tests.helpers.ooxml_utils import pt_to_half_points
+
+    size_main = pt_to_half_points(config.main_font_size_pt)
+    size_inline = pt_to_half_points(config.inline_objects_font_size_pt)
+    return {
+        CONTEXT_BODY: {size_main},
+        CONTEXT_HEADING: {size_main},
+        CONTEXT_TABLE: {size_inline},
+        CONTEXT_CAPTION: {size_inline},
+    }
+
+
+@_rule("fonts", needs=("formatting_table", "table_index", "font_histogram", "paragraph_index"))
+def _check_fonts(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check that effective fonts (styles + direct formatting) are Times New Roman 14/12pt.
+
+    Fonts are audited on every run of the document, its headers, footers
+    and notes (FontHistogram, weighted by characters). Font sizes are
+    checked on every run of the document, per context: body text and
+    headings use the main size, table cells and figure captions the smaller
+    one. The font histogram is added as an info entry only when it backs a
+    font error or warning.
+    """
+
+    from tests.helpers.ooxml_columns import (
+        CONTEXT_NAMES,
+        CONTEXT_TABLE,
+        select,
+        value_counts,
+        where_equal,
+    )
+    from tests.helpers.ooxml_utils import half_points_to_pt
 
+    table = views["formatting_table"]
+    histogram = views["font_histogram"]
+    reported = len(report.issues)
+
+    fonts_used = {font for font in histogram.fonts() if font}
     if fonts_used and config.main_font_name not in fonts_used:
         report.add_issue(
             doc_name,
             "fonts",
             "error",
-            "Times New Roman не найден среди явно заданных шрифтов",
+            "Times New Roman не найден среди используемых шрифтов (с учётом стилей)",
             expected=config.main_font_name,
             actual=", ".join(sorted(fonts_used))[:200],
         )
+    elif fonts_used:
+        _check_foreign_fonts(doc_name, report, config, histogram, views["paragraph_index"])
 
-    if sizes:
-        size_main = pt_to_half_points(config.main_font_size_pt)
-        size_table = pt_to_half_points(config.inline_objects_font_size_pt)
-
-        allowed = {size_main, size_table}
-        nonstandard = [s for s in sizes if s not in allowed]
-        ratio = len(nonstandard) / len(sizes)
-
-        if ratio > 0.5:
+    for context, allowed in _allowed_font_sizes(config).items():
+        size_counts = value_counts(select(table.sz, where_equal(table.run_context, context)))
+        total = sum(size_counts.values())
+        if not total:
+            continue
+        name = CONTEXT_NAMES[context]
+
+        nonstandard = total - sum(size_counts[size] for size in allowed)
+        if nonstandard / total > 0.5:
+            examples = sorted(size for size in size_counts if size not in allowed)[:5]
+            location = ""
+            if context == CONTEXT_TABLE:
+                location = _table_size_locations(table, views["table_index"], allowed)
             report.add_issue(
                 doc_name,
                 "fonts",
                 "warning",
-                "Много runs с нестандартным явно заданным размером шрифта",
-                expected=(
-                    f"{int(config.main_font_size_pt)}pt (основной) или "
-                    f"{int(config.inline_objects_font_size_pt)}pt (таблицы/подписи/рисунки)"
+                f"Много runs с нестандартным размером шрифта: {name} (с учётом стилей)",
+                expected=" или ".join(f"{half_points_to_pt(size):g}pt" for size in sorted(allowed)),
+                actual=(
+                    f"{nonstandard} из {total} "
+                    f"(пример: {', '.join(f'{half_points_to_pt(size):g}pt' for size in examples)})"
                 ),
-                actual=f"{len(nonstandard)} из {len(sizes)} (пример: {nonstandard[:5]})",
+                location=location,
             )
 
+    # The histogram backs the font findings; a clean document gets no entry
+    summary = _font_histogram_summary(histogram) if len(report.issues) > reported else ""
+    if summary:
+        report.add_issue(
+            doc_name,
+            "fonts",
+            "info",
+            "Шрифты и размеры по контекстам (доля символов)",
+            actual=summary,
+        )
+
+
+def _check_foreign_fonts(doc_name: str, report, config: ItNormocontrolConfig, histogram, index) -> None:
+    """Warn when a noticeable share of body text and headings is in another font."""
+
+    from tests.helpers.ooxml_columns import CONTEXT_BODY, CONTEXT_HEADING
+    from tests.helpers.ooxml_fonts import PART_DOCUMENT
+
+    main_font = config.main_font_name
+    text_contexts = (CONTEXT_BODY, CONTEXT_HEADING)
+    fonts = histogram.fonts(PART_DOCUMENT, text_contexts)
+    total = sum(length for font, length in fonts.items() if font)
+    foreign = {font: length for font, length in fonts.items() if font and font != main_font}
+    if not total or sum(foreign.values()) / total <= _FOREIGN_FONT_SHARE:
+        return
+
+    location = ""
+    first = histogram.first_use(next(iter(foreign)), PART_DOCUMENT, text_contexts)
+    if index is not None and first >= 0:
+        location = index.location(first, with_preview=True)
+    report.add_issue(
+        doc_name,
+        "fonts",
+        "warning",
+        f"Часть текста набрана не шрифтом {main_font} (с учётом стилей)",
+        expected=main_font,
+        actual=", ".join(f"{font} — {_share(length, total)}" for font, length in list(foreign.items())[:5]),
+        location=location,
+    )
+
+
+def _font_histogram_summary(histogram) -> str:
+    """Most used font/size pairs per document context, then headers and notes."""
 
-def _check_page_numbering(docx_path: Path, doc_name: str, report) -> None:
-    """Check presence of PAGE field in any header XML (best-effort, no render)."""
+    from tests.helpers.ooxml_columns import CONTEXT_NAMES, MISSING
+    from tests.helpers.ooxml_fonts import PART_DOCUMENT, PART_NAMES
+    from tests.helpers.ooxml_utils import half_points_to_pt
 
-    import zipfile
+    groups: dict[str, dict[str, int]] = {}
+    for (part, context, font, size), length in histogram.items():
+        group = CONTEXT_NAMES[context] if part == PART_DOCUMENT else PART_NAMES[part]
+        label = font or "?"
+        if size != MISSING:
+            label += f" {half_points_to_pt(size):g}pt"
+        entries = groups.setdefault(group, {})
+        entries[label] = entries.get(label, 0) + length
 
-    has_page_field = False
+    order = list(CONTEXT_NAMES.values()) + [PART_NAMES[part] for part in PART_NAMES if part != PART_DOCUMENT]
+    lines = []
+    for group in sorted(groups, key=order.index):
+        entries = groups[group]
+        total = sum(entries.values())
+        top = sorted(entries.items(), key=lambda item: (-item[1], item[0]))[:_FONT_SUMMARY_ENTRIES]
+        lines.append(f"{group}: " + ", ".join(f"{label} {_share(length, total)}" for label, length in top))
+    return "; ".join(lines)
 
-    with zipfile.ZipFile(docx_path, "r") as archive:
-        header_files = [name for name in archive.namelist() if name.startswith("word/header") and name.endswith(".xml")]
-        for header in header_files:
-            content = archive.read(header)
-            # A robust XML parse is possible, but this heuristic is enough for a quick check.
-            # PAGE field usually appears as instrText containing 'PAGE'.
-            if b"PAGE" in content.upper():
-                has_page_field = True
+
+def _table_size_locations(table, tables, allowed: set[int]) -> str:
+    """Table cells (via the grid model) of the first runs with a non-standard size."""
+
+    from tests.helpers.ooxml_columns import CONTEXT_TABLE, MISSING
+
+    if tables is None:
+        return ""
+    cells = []
+    for row in range(table.run_count):
+        if table.run_context[row] != CONTEXT_TABLE:
+            continue
+        size = table.sz[row]
+        if size == MISSING or size in allowed:
+            continue
+        found = tables.cell_for_paragraph(table.run_paragraph[row])
+        if found is None:
+            continue
+        where = found[0].describe(found[1])
+        if where not in cells:
+            cells.append(where)
+            if len(cells) == _FONT_LOCATION_EXAMPLES:
                 break
+    return "; ".join(cells)
+
+
+@_rule("page_numbering", needs=("header_fields", "headers", "sections"))
+def _check_page_numbering(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check that page numbers (PAGE field) are in the headers used by the document.
 
-    if not header_files:
+    Only header/footer parts referenced from document.xml.rels are inspected;
+    every section is checked through its (possibly inherited) default header.
+    """
+
+    fields = views["header_fields"]
+    headers = views["headers"]["header"]
+    footers = views["headers"]["footer"]
+    page_parts = {field.part for field in fields.by_code("PAGE")}
+
+    if not headers:
         report.add_issue(
             doc_name,
             "pagination",
@@ -467,22 +831,45 @@ def _check_page_numbering(docx_path: Path, doc_name: str, report) -> None:
         )
         return
 
-    if not has_page_field:
+    if not page_parts.intersection(headers.values()):
+        in_footer = bool(page_parts.intersection(footers.values()))
         report.add_issue(
             doc_name,
             "pagination",
             "warning",
             "Не найдено поле PAGE в колонтитулах (не удалось подтвердить нумерацию страниц)",
             expected="Поле PAGE в правом верхнем углу",
-            actual="PAGE не найден",
+            actual="PAGE только в нижнем колонтитуле" if in_footer else "PAGE не найден",
         )
+        return
 
+    # Sections inherit header references from the previous section. The
+    # number is not printed on the title page: the first section is exempt
+    # only when it sets up a separate first page (w:titlePg or a first-page
+    # header), otherwise its pages show the default header like any other.
+    unnumbered = []
+    inherited: str | None = None
+    for section in views["sections"]:
+        inherited = section.header_refs.get("default", inherited)
+        if section.index == 0 and (section.title_page or "first" in section.header_refs):
+            continue
+        part = headers.get(inherited) if inherited else None
+        if part not in page_parts:
+            unnumbered.append(section.describe())
 
-def _check_structure(doc_name: str, doc: Document, report) -> None:
-    """Check required sections and their order using plain text search.
+    if unnumbered:
+        report.add_issue(
+            doc_name,
+            "pagination",
+            "warning",
+            "Разделы без поля PAGE в верхнем колонтитуле",
+            expected="Сквозная нумерация страниц во всех разделах",
+            actual=", ".join(unnumbered)[:200],
+        )
 
-    The exact list/order is sourced from the IT checklist markdown.
-    """
+
+def _required_sections(report) -> list[str]:
+    """Required section titles in order (sourced from the IT checklist markdown)."""
 
     required_in_order = list(getattr(report, "_required_sections_in_order", []))
     if not required_in_order:
@@ -496,9 +883,43 @@ def _check_structure(doc_name: str, doc: Document, report) -> None:
             "Список использованных источников",
             "Приложения",
         ]
+    return required_in_order
+
 
-    text = _extract_all_text(doc)
-    positions = _find_section_positions(text, required_in_order)
+def _section_positions(views, report) -> dict[str, int]:
+    # List labels count: appendix headings are often auto-numbered ("Приложение А")
+    text = views["text_model"].text(labels=True)
+    return _find_section_positions(text, _required_sections(report))
+
+
+@_rule("table_of_contents", needs=("text_model", "field_index"))
+def _check_table_of_contents(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check that the table of contents is a TOC field, not typed by hand (best-effort)."""
+
+    from tests.helpers.ooxml_fields import DOCUMENT_PART
+
+    positions = _section_positions(views, report)
+    if not any(title.lower().startswith("оглавление") for title in positions):
+        return
+    if views["field_index"].by_code("TOC", part=DOCUMENT_PART):
+        return
+
+    report.add_issue(
+        doc_name,
+        "structure",
+        "info",
+        "Оглавление не содержит поля TOC (вероятно, набрано вручную)",
+        expected="Автоматическое оглавление (Ссылки → Оглавление)",
+        actual="поле TOC не найдено",
+    )
+
+
+@_rule("structure", needs=("text_model",))
+def _check_structure(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check required sections and their order using plain text search."""
+
+    required_in_order = _required_sections(report)
+    positions = _section_positions(views, report)
 
     missing = [title for title in required_in_order if title not in positions]
     if missing:
@@ -525,10 +946,12 @@ def _check_structure(doc_name: str, doc: Document, report) -> None:
         )
 
 
-def _check_references(doc_name: str, doc: Document, report) -> None:
+@_rule("references", needs=("text_model",))
+def _check_references(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
     """Check that bracketed references exist and sources section looks numbered."""
 
-    text = _extract_all_text(doc)
+    paragraphs = views["text_model"].body_paragraphs()
+    text = "\n".join(p.text for p in paragraphs)
 
     citations = re.findall(r"\[(\d+)\]", text)
     if not citations:
@@ -544,11 +967,11 @@ def _check_references(doc_name: str, doc: Document, report) -> None:
 
     max_citation = max(int(n) for n in citations)
 
-    # Heuristic: find the sources section and count numbered lines after it.
-    lower_lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    # Find the sources section and count the items of its list.
+    lines = [p for p in paragraphs if p.text.strip()]
     sources_index = None
-    for i, line in enumerate(lower_lines):
-        if line.lower() == "список использованных источников":
+    for i, paragraph in enumerate(lines):
+        if paragraph.text.strip().lower() == "список использованных источников":
             sources_index = i
             break
 
@@ -563,10 +986,24 @@ def _check_references(doc_name: str, doc: Document, report) -> None:
         )
         return
 
-    sources_lines = lower_lines[sources_index + 1 : sources_index + 80]
-    numbered = [line for line in sources_lines if re.match(r"^\d+\s+", line)]
+    # The list runs from the heading to the next heading (or the end of the
+    # document). A source is numbered either in its text ("1 Автор ...") or
+    # by a numbered list (w:numPr), whose label the NumberingResolver
+    # computed: it never appears in the text.
+    sources: list[str] = []
+    for paragraph in lines[sources_index + 1 :]:
+        if paragraph.is_heading:
+            break
+        if paragraph.is_numbered:
+            item = paragraph.list_item
+            if item.level == 0:
+                sources.append(item.label or str(item.number))
+            continue
+        match = re.match(r"^(\d+)\s+", paragraph.text.strip())
+        if match:
+            sources.append(match.group(1))
 
-    if not numbered:
+    if not sources:
         report.add_issue(
             doc_name,
             "references",
@@ -577,18 +1014,19 @@ def _check_references(doc_name: str, doc: Document, report) -> None:
         )
         return
 
-    if max_citation > len(numbered):
+    if max_citation > len(sources):
         report.add_issue(
             doc_name,
             "references",
             "warning",
             "Максимальный номер ссылки больше числа найденных источников",
             expected=f"Источников ≥ {max_citation}",
-            actual=f"Найдено источников (эвристика): {len(numbered)}",
+            actual=f"Найдено источников: {len(sources)} (последний номер: {sources[-1]})",
         )
 
 
-def _check_captions(doc_name: str, doc: Document, report) -> None:
+@_rule("captions", needs=("text_model",))
+def _check_captions(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
     """Check basic caption formats for figures and tables (best-effort)."""
 
     figure_re = re.compile(r"^рисунок\s+\d+(?:\.\d+)?\s*[—–-]\s+.+$", re.IGNORECASE)
@@ -597,7 +1035,7 @@ def _check_captions(doc_name: str, doc: Document, report) -> None:
     bad_figures = 0
     bad_tables = 0
 
-    for p in doc.paragraphs:
+    for p in views["text_model"].body_paragraphs():
         line = p.text.strip()
         if not line:
             continue
@@ -631,64 +1069,439 @@ def _check_captions(doc_name: str, doc: Document, report) -> None:
         )
 
 
-def check_it_docx(docx_path: Path, report_dir: Path) -> int:
-    """Run IT short checklist checks and write a markdown report.
+@_rule("table_captions", needs=("text_model", "table_index"))
+def _check_table_captions(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check that every table of the main part has its name ("Таблица N – ...") above it.
 
-    Args:
-        docx_path: Path to a .docx file.
-        report_dir: Directory where a markdown report will be saved.
+    Tables before the first heading (title page, assignment form) are layout
+    tables and are skipped. The grid model (TableIndex) gives each table's
+    preceding body paragraph.
+    """
 
-    Returns:
-        Exit code (0 if no errors, 1 otherwise).
+    from bisect import bisect_right
+
+    model = views["text_model"]
+    headings = model.headings()
+    if not headings:
+        return
+    first_heading = headings[0].ordinal
+
+    body = model.body_paragraphs()
+    ordinals = [p.ordinal for p in body]
+    missing = []
+    for table in views["table_index"].top_level():
+        if table.preceding_paragraph < first_heading:
+            continue
+        position = bisect_right(ordinals, table.preceding_paragraph) - 1
+        while position >= 0 and not body[position].text.strip():
+            position -= 1
+        caption = body[position].text.strip().lower() if position >= 0 else ""
+        if not caption.startswith(("таблица", "продолжение таблицы")):
+            missing.append(table.describe())
+
+    if missing:
+        report.add_issue(
+            doc_name,
+            "tables",
+            "warning",
+            "Таблицы без названия над таблицей",
+            expected="Таблица N – Название (над таблицей)",
+            actual=f"таблиц без названия: {len(missing)}",
+            location=", ".join(missing[:5]),
+        )
+
+
+@_rule("caption_numbering", needs=("field_index",))
+def _check_caption_numbering(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Check that auto-numbered captions (SEQ fields) show consecutive numbers.
+
+    Stale field results (numbers not updated after inserting/removing a
+    figure) show up as gaps or repeats. Sequences restarted by switches
+    (\\r, \\s), repeated (\\c) or hidden (\\h) are skipped.
     """
 
+    from tests.helpers.ooxml_fields import DOCUMENT_PART
+
+    sequences: dict[str, list[str]] = {}
+    seq_fields = views["field_index"].by_code("SEQ", part=DOCUMENT_PART)
+    for field in sorted(seq_fields, key=lambda f: f.paragraph):
+        identifier = field.identifier
+        if not identifier or any(field.has_switch(switch) for switch in ("\\r", "\\s", "\\c", "\\h")):
+            continue
+        sequences.setdefault(identifier, []).append(field.result.strip())
+
+    for identifier, results in sequences.items():
+        expected = [str(n) for n in range(1, len(results) + 1)]
+        if results != expected:
+            report.add_issue(
+                doc_name,
+                "figures" if identifier.lower().startswith("рис") else "tables",
+                "warning",
+                f"Нумерация подписей (SEQ {identifier}) не последовательна — обновите поля",
+                expected=", ".join(expected[:10]),
+                actual=", ".join(results[:10]),
+            )
+
+
+class _MediaLimits:
+    """Thresholds for embedded images (not part of the checklist: file hygiene)."""
+
+    MAX_IMAGE_BYTES = 1024 * 1024
+    MAX_IMAGE_SIDE_PX = 4000
+    REPORT_ITEMS = 5
+
+
+@_rule("media", needs=("media_inventory",))
+def _check_media(doc_name: str, views, report, config: ItNormocontrolConfig) -> None:
+    """Report total image weight and oversized images.
+
+    Uses ZIP metadata and PNG/JPEG header bytes only; media parts are never
+    fully decompressed.
+    """
+
+    from tests.helpers.ooxml_media import format_size
+
+    media = views["media_inventory"]
+    if media.unreferenced:
+        report.add_issue(
+            doc_name,
+            "figures",
+            "info",
+            "Неиспользуемые файлы изображений в архиве (увеличивают размер документа)",
+            actual=", ".join(media.unreferenced[:_MediaLimits.REPORT_ITEMS]),
+        )
+    if not media:
+        return
+
+    report.add_issue(
+        doc_name,
+        "figures",
+        "info",
+        "Изображения в документе",
+        actual=(
+            f"{len(media)} шт., {format_size(media.total_size)} "
+            f"(в архиве {format_size(media.total_compressed_size)})"
+        ),
+    )
+
+    oversized = media.oversized(_MediaLimits.MAX_IMAGE_BYTES, _MediaLimits.MAX_IMAGE_SIDE_PX)
+    if oversized:
+        shown = ", ".join(item.describe() for item in oversized[:_MediaLimits.REPORT_ITEMS])
+        if len(oversized) > _MediaLimits.REPORT_ITEMS:
+            shown += f" (и ещё {len(oversized) - _MediaLimits.REPORT_ITEMS})"
+        report.add_issue(
+            doc_name,
+            "figures",
+            "warning",
+            "Слишком большие изображения (рекомендуется сжать)",
+            expected=(
+                f"не более {format_size(_MediaLimits.MAX_IMAGE_BYTES)} и "
+                f"{_MediaLimits.MAX_IMAGE_SIDE_PX} px по стороне"
+            ),
+            actual=shown,
+        )
+
+
+@dataclass
+class DocumentCheck:
+    """Result of checking one document (picklable: batch workers return it).
+
+    Attributes:
+        report: NormocontrolReport with this single document and its issues.
+        fingerprint: Content fingerprint, if it was computed.
+        cached: The issues were returned from the result cache.
+        reused_rules: Checks whose findings were reused because their input
+            parts did not change (the other checks were run).
+    """
+
+    report: object
+    fingerprint: str | None = None
+    cached: bool = False
+    reused_rules: list[str] = field(default_factory=list)
+
+
+def default_config() -> CompiledConfig:
+    """Compiled checklist of this repository (standars_control_it_short.md)."""
+
+    standards_md = _resolve_repo_root() / "scripts" / "standards_verification" / "standars_control_it_short.md"
+    return compile_config(standards_md)
+
+
+@lru_cache(maxsize=1)
+def checker_version() -> str:
+    """Hash of the checker code: this script, the report model and the IR extractor."""
+
     repo_root = _resolve_repo_root()
     _ensure_tests_helpers_on_syspath(repo_root)
+    from tests.helpers.ooxml_ir import extractor_version
 
-    from tests.helpers.ooxml_utils import get_document_xml
-    from tests.helpers.report import NormocontrolReport
+    hasher = hashlib.sha256(extractor_version().encode("ascii"))
+    for path in (Path(__file__).resolve(), repo_root / "tests" / "helpers" / "report.py"):
+        hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def _rule_key(registry, rule, package, compiled: CompiledConfig, streaming: bool) -> str:
+    """Result cache key of one check: its input parts, the checklist and the checker."""
+
+    from tests.helpers.result_cache import result_key
+
+    return result_key(
+        "rule",
+        registry.signature(rule, package),
+        compiled.hash,
+        checker_version(),
+        "stream" if streaming else "tree",
+    )
+
+
+def _issue_fields(issues) -> list[dict]:
+    """Issues as JSON-serializable dicts without the document name (it is the caller's)."""
+
+    fields = []
+    for issue in issues:
+        values = asdict(issue)
+        del values["document"]
+        fields.append(values)
+    return fields
+
+
+def _store_result(results, key: str, value: dict) -> None:
+    try:
+        results.put(key, value)
+    except OSError as exc:
+        print(f"WARNING: result cache not saved: {exc}", file=sys.stderr)
+
+
+def _result_key(docx_path: Path, compiled: CompiledConfig, streaming: bool,
+                rules: list[str] | None) -> str | None:
+    """Result cache key of a check (None if the file cannot be read)."""
+
+    from tests.helpers.result_cache import file_hash, result_key
+
+    try:
+        document_hash = file_hash(docx_path)
+    except OSError:
+        return None
+    return result_key(
+        document_hash,
+        compiled.hash,
+        checker_version(),
+        ",".join(rules) if rules is not None else "*",
+        "stream" if streaming else "tree",
+    )
+
+
+def check_document(
+    docx_path: Path,
+    compiled: CompiledConfig,
+    doc_name: str | None = None,
+    streaming: bool = False,
+    use_cache: bool = True,
+    rules: list[str] | None = None,
+) -> DocumentCheck:
+    """Run the IT short checklist checks on one document, without writing files.
+
+    Args:
+        docx_path: Path to a .docx file.
+        compiled: Compiled checklist (see `compile_config`, `default_config`).
+        doc_name: Name of the document in the report (file name by default).
+        streaming: Parse document.xml incrementally with bounded memory
+            (for very large explanatory notes).
+        use_cache: Return the stored issues of an unchanged file checked
+            with the same checklist and checker code
+            (tests/helpers/result_cache.py); otherwise reuse the findings
+            of the checks whose input parts did not change and the
+            parsed-document IR (tests/helpers/ooxml_ir.py). All are saved
+            after the run.
+        rules: Names of the checks to run (all registered checks by default).
+            Only the views these checks read are built.
+    """
+
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
 
-    standards_md = repo_root / "scripts" / "standards_verification" / "standars_control_it_short.md"
-    config = load_it_normocontrol_config(standards_md)
+    from tests.helpers.ooxml_ir import IR_KEYS, IRCache
+    from tests.helpers.ooxml_utils import DocxPackage, PackageLimitError
+    from tests.helpers.ooxml_views import DocumentViews
+    from tests.helpers.report import NormocontrolReport
+    from tests.helpers.result_cache import ResultCache
 
+    doc_name = doc_name or docx_path.name
     report = NormocontrolReport()
+    report.add_document(doc_name)
+
+    results = ResultCache() if use_cache else None
+    key = _result_key(docx_path, compiled, streaming, rules) if results is not None else None
+    if key is not None:
+        stored = results.get(key)
+        if stored is not None:
+            for issue in stored.get("issues", []):
+                report.add_issue(doc_name, **issue)
+            return DocumentCheck(report, stored.get("fingerprint"), cached=True)
+
+    registry = _rule_registry()
+    selected = registry.select(rules)
+
     # Pass required sections through the report instance without changing its public API.
     # (This keeps changes localized to this script.)
-    setattr(report, "_required_sections_in_order", config.required_sections_in_order)
-    doc_name = docx_path.name
-    report.add_document(doc_name)
+    setattr(report, "_required_sections_in_order", compiled.config.required_sections_in_order)
+
+    # The archive is read once. A check whose input parts (see
+    # RuleRegistry.signature) are unchanged since an earlier version of the
+    # document was checked reuses its findings; the views the other checks
+    # declare are built from a single walk of document.xml (or restored from
+    # the IR of an unchanged file) and shared by them.
+    # Oversized, damaged or hostile archives are rejected with a report error
+    # before (or as soon as) they would cost unbounded time or memory.
+    fingerprint = None
+    reused: list[str] = []
+    cache = IRCache() if use_cache else None
+    try:
+        with DocxPackage(docx_path) as package:
+            rule_keys: dict[str, str] = {}
+            findings: dict[str, list[dict]] = {}
+            if results is not None:
+                for rule in selected:
+                    rule_keys[rule.name] = _rule_key(registry, rule, package, compiled, streaming)
+                    stored = results.get(rule_keys[rule.name])
+                    if stored is not None:
+                        findings[rule.name] = stored.get("issues", [])
+
+            needs = registry.needs([rule.name for rule in selected if rule.name not in findings])
+            if any(registry.views[name].walk for name in registry.views.closure(needs)):
+                # Almost free during the walk: the IR is keyed by it, and it is printed
+                needs.append("content_fingerprint")
+            ir = cache.load(package) if cache is not None and needs else None
+            views = DocumentViews(package, streaming=streaming, known=ir).build(needs)
+            for rule in selected:
+                if rule.name in findings:
+                    for issue in findings[rule.name]:
+                        report.add_issue(doc_name, **issue)
+                    reused.append(rule.name)
+                    continue
+                start = len(report.issues)
+                rule.run(doc_name, views, report, compiled.config)
+                if rule.name in rule_keys:
+                    _store_result(results, rule_keys[rule.name], {"issues": _issue_fields(report.issues[start:])})
+            fingerprint = views.get("content_fingerprint")
+            if cache is not None and IR_KEYS.intersection(views.built):
+                try:
+                    cache.store(package, paragraph_index=views.get("paragraph_index"))
+                except OSError as exc:
+                    print(f"WARNING: IR cache not saved: {exc}", file=sys.stderr)
+    except PackageLimitError as exc:
+        report.add_issue(
+            doc_name,
+            "package",
+            "error",
+            "Документ не может быть проверен",
+            expected="Корректный .docx в пределах допустимого размера",
+            actual=str(exc),
+        )
+
+    if key is not None:
+        _store_result(results, key, {"fingerprint": fingerprint, "issues": _issue_fields(report.issues)})
 
-    doc_xml = get_document_xml(docx_path)
-    doc = Document(docx_path)
+    return DocumentCheck(report, fingerprint, reused_rules=reused)
 
-    _check_page_setup(doc_name, doc_xml, report, config)
-    _check_paragraph_formatting(doc_name, doc_xml, report, config)
-    _check_fonts(doc_name, doc_xml, report, config)
-    _check_page_numbering(docx_path, doc_name, report)
-    _check_structure(doc_name, doc, report)
-    _check_references(doc_name, doc, report)
-    _check_captions(doc_name, doc, report)
+
+def check_it_docx(
+    docx_path: Path,
+    report_dir: Path,
+    streaming: bool = False,
+    use_cache: bool = True,
+    rules: list[str] | None = None,
+) -> int:
+    """Run IT short checklist checks and write a markdown report.
+
+    Args:
+        docx_path: Path to a .docx file.
+        report_dir: Directory where a markdown report will be saved.
+        streaming, use_cache, rules: See `check_document`.
+
+    Returns:
+        Exit code (0 if no errors, 1 otherwise).
+    """
+
+    result = check_document(
+        docx_path, default_config(), streaming=streaming, use_cache=use_cache, rules=rules
+    )
+    report_path = save_report(result.report, report_dir)
+    print("\n".join(summary_lines(result, report_path)))
+
+    return 1 if result.report.has_errors() else 0
+
+
+def save_report(report, report_dir: Path) -> Path:
+    """Write a markdown report to `report_dir` and return its path."""
 
     report_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = report_dir / f"it_normocontrol_report_{timestamp}.md"
     report.to_markdown(report_path)
+    return report_path
+
 
-    summary = report.generate_summary()
-    print(f"✓ Report: {report_path}")
-    print(f"Checked: {summary['total_documents']} document(s)")
-    print(f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})")
+def summary_lines(result: DocumentCheck, report_path: Path) -> list[str]:
+    """Console summary of a check (the report path, counts and cache use)."""
 
-    return 1 if report.has_errors() else 0
+    summary = result.report.generate_summary()
+    lines = [
+        f"✓ Report: {report_path}",
+        f"Checked: {summary['total_documents']} document(s)",
+        f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})",
+    ]
+    if result.fingerprint:
+        lines.append(f"Content fingerprint: {result.fingerprint}")
+    if result.cached:
+        lines.append("Result: cached (unchanged document, checklist and checker)")
+    elif result.reused_rules:
+        lines.append(f"Reused: {len(result.reused_rules)} check(s) with unchanged input parts "
+                     f"({', '.join(result.reused_rules)})")
+    return lines
 
 
 def main() -> int:
     """CLI entrypoint."""
 
+    import argparse
+
     repo_root = _resolve_repo_root()
     default_docx = repo_root / "tests" / "ПЗ.docx"
 
-    docx_path = Path(sys.argv[1]) if len(sys.argv) >= 2 else default_docx
+    parser = argparse.ArgumentParser(description="IT normocontrol checker for a single .docx file")
+    parser.add_argument("docx", nargs="?", type=Path, default=default_docx, help="Path to .docx (default: tests/ПЗ.docx)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse document.xml incrementally with bounded memory (very large documents)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the result and parsed-document caches ($NORMOCONTROL_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--rules",
+        help="Comma-separated checks to run (default: all; see --list-rules)",
+    )
+    parser.add_argument("--list-rules", action="store_true", help="List the available checks and exit")
+    args = parser.parse_args()
+
+    if args.list_rules:
+        for name, needs, check in _RULES:
+            print(f"{name:22} {', '.join(needs)}")
+        return 0
+
+    rules = None
+    if args.rules:
+        rules = [name.strip() for name in args.rules.split(",") if name.strip()]
+        unknown = sorted(set(rules) - {name for name, _needs, _check in _RULES})
+        if unknown:
+            print(f"ERROR: Unknown rules: {', '.join(unknown)} (see --list-rules)")
+            return 1
+
+    docx_path = args.docx
     report_dir = repo_root / "normocontrol_reports"
 
     if not docx_path.exists():
@@ -699,7 +1512,7 @@ def main() -> int:
         print(f"ERROR: Expected .docx file: {docx_path}")
         return 1
 
-    return check_it_docx(docx_path, report_dir)
+    return check_it_docx(docx_path, report_dir, streaming=args.stream, use_cache=not args.no_cache, rules=rules)
 
 
 if __name__ == "__main__":
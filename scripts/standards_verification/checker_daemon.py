@@ -0,0 +1,414 @@
+"""Warm IT normocontrol checker service on a Unix socket.
+
+Every separate run of `check_it_docx.py` pays for the interpreter start-up,
+the imports (lxml, the OOXML helpers) and the compiled checklist. The
+daemon pays once: it imports everything, compiles the checklist and then
+answers check requests. Each request is served by a forked child of the
+warm process, so concurrent requests (e.g. from the batch checker) run in
+parallel; the result and IR caches on disk are shared with in-process runs.
+
+Protocol: one JSON request line per connection, one JSON response line.
+- `{"op": "check", "path": "/abs/path.docx"}` or `{"op": "check", "data":
+  "<base64 .docx>", "name": "ПЗ.docx"}`; optional `rules` (list), `stream`
+  and `cache` (booleans) and `config` (hash of the client's compiled
+  checklist: the daemon refuses a request for another checklist). Response:
+  `{"ok": true, "document": ..., "issues": [...], "fingerprint": ...,
+  "cached": ..., "reused_rules": [...]}`.
+- `{"op": "ping"}`, `{"op": "shutdown"}`.
+Errors are returned as `{"ok": false, "error": "..."}`.
+
+Clients use `run_check()`: it asks the daemon when it is running and checks
+in-process otherwise. The daemon always checks with the repository
+checklist; it answers with an error (and the client checks in-process) when
+a request names another checklist, or once the checker sources have changed
+since it started (restart it after updating the checker).
+
+Usage:
+- `python scripts/standards_verification/checker_daemon.py` (serve)
+- `python scripts/standards_verification/checker_daemon.py --status`
+- `python scripts/standards_verification/checker_daemon.py --stop`
+
+Socket: `$NORMOCONTROL_DAEMON_SOCKET` or `checker.sock` in the cache
+directory (`$NORMOCONTROL_CACHE_DIR`, by default `~/.cache/normocontrol`).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from check_it_docx import (
+    CompiledConfig,
+    DocumentCheck,
+    _ensure_tests_helpers_on_syspath,
+    _issue_fields,
+    _resolve_repo_root,
+    _rule_registry,
+    check_document,
+    default_config,
+)
+
+
+SOCKET_ENV = "NORMOCONTROL_DAEMON_SOCKET"
+SOCKET_NAME = "checker.sock"
+
+# Seconds a client waits for a check (very large documents take a while)
+CLIENT_TIMEOUT = 600.0
+
+# Modules imported lazily by the checks (imported once by the daemon)
+_WARM_MODULES = (
+    "lxml.etree",
+    "tests.helpers.ooxml_utils",
+    "tests.helpers.ooxml_walker",
+    "tests.helpers.ooxml_styles",
+    "tests.helpers.ooxml_numbering",
+    "tests.helpers.ooxml_text",
+    "tests.helpers.ooxml_index",
+    "tests.helpers.ooxml_columns",
+    "tests.helpers.ooxml_sections",
+    "tests.helpers.ooxml_fields",
+    "tests.helpers.ooxml_media",
+    "tests.helpers.ooxml_fingerprint",
+    "tests.helpers.ooxml_tables",
+    "tests.helpers.ooxml_fonts",
+    "tests.helpers.ooxml_ir",
+    "tests.helpers.ooxml_views",
+    "tests.helpers.result_cache",
+    "tests.helpers.report",
+)
+
+
+def default_socket_path() -> Path:
+    """Socket of the daemon ($NORMOCONTROL_DAEMON_SOCKET or <cache dir>/checker.sock)."""
+
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+    from tests.helpers.ooxml_ir import cache_root
+
+    return cache_root() / SOCKET_NAME
+
+
+def _source_stamp() -> tuple:
+    """(path, mtime, size) of the checker sources, to detect a stale daemon."""
+
+    repo_root = _resolve_repo_root()
+    paths = sorted(Path(__file__).resolve().parent.glob("*.py"))
+    paths += sorted((repo_root / "tests" / "helpers").glob("*.py"))
+    stamp = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamp.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+# Client
+
+def request(payload: dict, socket_path: Path | None = None, timeout: float = CLIENT_TIMEOUT) -> dict:
+    """Send one request to the daemon and return its response.
+
+    Raises:
+        OSError: If the daemon is not running (or the connection failed).
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not supported on this platform")
+    path = socket_path or default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise OSError("The checker daemon closed the connection")
+    return json.loads(line)
+
+
+def daemon_running(socket_path: Path | None = None) -> bool:
+    """True if a daemon answers on the socket."""
+
+    try:
+        return bool(request({"op": "ping"}, socket_path, timeout=5.0).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+def check_with_daemon(
+    docx_path: Path | None = None,
+    data: bytes | None = None,
+    doc_name: str | None = None,
+    streaming: bool = False,
+    use_cache: bool = True,
+    rules: list[str] | None = None,
+    socket_path: Path | None = None,
+    compiled: CompiledConfig | None = None,
+) -> DocumentCheck | None:
+    """Check a document (a path or its bytes) with the daemon.
+
+    Args:
+        compiled: Checklist the result must be computed with; the daemon
+            refuses the request if its own checklist differs (None: the
+            repository checklist, which the daemon uses).
+
+    Returns:
+        The result, or None if the daemon is not running or refused the
+        request (the caller checks in-process then).
+    """
+
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+    from tests.helpers.report import NormocontrolReport
+
+    payload: dict = {"op": "check", "stream": streaming, "cache": use_cache, "rules": rules}
+    if compiled is not None:
+        payload["config"] = compiled.hash
+    if data is not None:
+        payload["data"] = base64.b64encode(data).decode("ascii")
+        payload["name"] = doc_name or "document.docx"
+    else:
+        payload["path"] = str(Path(docx_path).resolve())
+        payload["name"] = doc_name or Path(docx_path).name
+    try:
+        response = request(payload, socket_path)
+    except (OSError, ValueError):
+        return None
+    if not response.get("ok"):
+        print(f"WARNING: checker daemon: {response.get('error')}; checking in-process", file=sys.stderr)
+        return None
+
+    report = NormocontrolReport()
+    report.add_document(response["document"])
+    for issue in response.get("issues", []):
+        report.add_issue(response["document"], **issue)
+    return DocumentCheck(
+        report,
+        response.get("fingerprint"),
+        cached=bool(response.get("cached")),
+        reused_rules=list(response.get("reused_rules") or []),
+    )
+
+
+def run_check(
+    docx_path: Path,
+    doc_name: str | None = None,
+    streaming: bool = False,
+    use_cache: bool = True,
+    rules: list[str] | None = None,
+    compiled: CompiledConfig | None = None,
+    socket_path: Path | None = None,
+) -> DocumentCheck:
+    """Check a document with the daemon if it is running, otherwise in this process.
+
+    Args:
+        compiled: Checklist (`default_config()` by default). The daemon only
+            answers when its checklist has the same hash; any other
+            checklist is checked in this process.
+        docx_path, doc_name, streaming, use_cache, rules: See `check_document`.
+    """
+
+    result = check_with_daemon(docx_path, doc_name=doc_name, streaming=streaming, use_cache=use_cache,
+                               rules=rules, socket_path=socket_path, compiled=compiled)
+    if result is not None:
+        return result
+    return check_document(docx_path, compiled or default_config(), doc_name=doc_name,
+                          streaming=streaming, use_cache=use_cache, rules=rules)
+
+
+# Server
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves one request (in a forked child of the daemon)."""
+
+    def handle(self) -> None:
+        from tests.helpers.ooxml_utils import DEFAULT_LIMITS
+
+        # A base64-encoded document up to the archive size limit, plus the envelope
+        max_bytes = DEFAULT_LIMITS.max_archive_size * 4 // 3 + 64 * 1024
+        line = self.rfile.readline(max_bytes + 1)
+        try:
+            if len(line) > max_bytes:
+                raise ValueError("request too large")
+            response = self.server.dispatch(json.loads(line))
+        except Exception as exc:  # noqa: BLE001 - report every failure to the client
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class CheckerServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server answering check requests from a warm process.
+
+    Requests are served in forked children, so a `shutdown` request cannot
+    stop the serving loop of the daemon directly. Stopping goes through a
+    self-pipe instead (signals are not used: one arriving while the daemon
+    is still forking is easily lost): the child, or a SIGTERM/SIGINT
+    handler, writes to the pipe with `request_stop()`, and a thread of the
+    daemon started by `stop_on_request()` reads it and calls `shutdown()`.
+    """
+
+    max_children = os.cpu_count() or 1
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = socket_path
+        self.daemon_pid = os.getpid()
+        self.stamp = _source_stamp()
+        self._stop_read, self._stop_write = os.pipe()
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def request_stop(self) -> None:
+        """Ask the daemon to stop serving (safe in children and signal handlers)."""
+
+        os.write(self._stop_write, b"x")
+
+    def stop_on_request(self) -> threading.Thread:
+        """Start the thread that stops `serve_forever()` after `request_stop()`."""
+
+        def wait() -> None:
+            os.read(self._stop_read, 1)
+            self.shutdown()
+
+        thread = threading.Thread(target=wait, name="checker-daemon-stop", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self) -> None:
+        super().server_close()
+        for fd in (self._stop_read, self._stop_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": self.daemon_pid}
+        if op == "shutdown":
+            self.request_stop()
+            return {"ok": True}
+        if op != "check":
+            raise ValueError(f"unknown op: {op!r}")
+        if _source_stamp() != self.stamp:
+            raise RuntimeError("checker sources changed since the daemon started (restart it)")
+        return self._check(request)
+
+    def _check(self, request: dict) -> dict:
+        compiled = default_config()
+        if request.get("config") not in (None, compiled.hash):
+            raise ValueError("the request uses another checklist than the daemon")
+        options = {
+            "streaming": bool(request.get("stream")),
+            "use_cache": bool(request.get("cache", True)),
+            "rules": request.get("rules"),
+        }
+        if "data" in request:
+            name = request.get("name") or "document.docx"
+            with tempfile.TemporaryDirectory(prefix="normocontrol-") as directory:
+                docx_path = Path(directory) / "document.docx"
+                docx_path.write_bytes(base64.b64decode(request["data"], validate=True))
+                result = check_document(docx_path, compiled, doc_name=name, **options)
+        else:
+            docx_path = Path(request["path"])
+            if not docx_path.is_file():
+                raise FileNotFoundError(str(docx_path))
+            name = request.get("name") or docx_path.name
+            result = check_document(docx_path, compiled, doc_name=name, **options)
+        return {
+            "ok": True,
+            "document": name,
+            "issues": _issue_fields(result.report.issues),
+            "fingerprint": result.fingerprint,
+            "cached": result.cached,
+            "reused_rules": result.reused_rules,
+        }
+
+
+def _warm_up() -> None:
+    """Import the checker modules and compile the checklist before serving."""
+
+    import importlib
+
+    _ensure_tests_helpers_on_syspath(_resolve_repo_root())
+    for name in _WARM_MODULES:
+        importlib.import_module(name)
+    default_config()
+    _rule_registry()
+
+
+def serve(socket_path: Path) -> int:
+    """Run the daemon until SIGTERM/SIGINT or a shutdown request."""
+
+    if daemon_running(socket_path):
+        print(f"ERROR: A checker daemon is already running on {socket_path}")
+        return 1
+    socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if socket_path.exists():
+        socket_path.unlink()  # left behind by a daemon that did not exit cleanly
+
+    _warm_up()
+
+    with CheckerServer(socket_path) as server:
+
+        def stop(signum, frame):
+            if os.getpid() != server.daemon_pid:
+                os._exit(128 + signum)  # a request child: only it ends
+            server.request_stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        server.stop_on_request()
+        print(f"✓ Checker daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            try:
+                socket_path.unlink()
+            except OSError:
+                pass
+    print("Checker daemon stopped")
+    return 0
+
+
+def main() -> int:
+    """CLI entrypoint."""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm IT normocontrol checker service (Unix socket)")
+    parser.add_argument("--socket", type=Path, help=f"Socket path (default: ${SOCKET_ENV} or <cache dir>/{SOCKET_NAME})")
+    parser.add_argument("--status", action="store_true", help="Report whether the daemon is running and exit")
+    parser.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path()
+    if args.status:
+        running = daemon_running(socket_path)
+        print(f"{'running' if running else 'not running'}: {socket_path}")
+        return 0 if running else 1
+    if args.stop:
+        try:
+            request({"op": "shutdown"}, socket_path, timeout=5.0)
+        except (OSError, ValueError):
+            print(f"not running: {socket_path}")
+            return 1
+        print(f"stopped: {socket_path}")
+        return 0
+    if not hasattr(socket, "AF_UNIX"):
+        print("ERROR: Unix sockets are not supported on this platform")
+        return 1
+    return serve(socket_path)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
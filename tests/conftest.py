@@ -132,3 +132,126 @@ def all_test_docs():
 def any_docx(request):
     """Parametrized fixture that runs test on each document."""
     return TESTS_DIR / request.param
+
+
+# Minimal .docx packages for unit tests of the OOXML helpers and checks
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# A4, margins 30/10/20/20 mm
+DEFAULT_SECT_PR = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1134" w:right="567" w:bottom="1134" w:left="1701" '
+    'w:header="709" w:footer="709" w:gutter="0"/></w:sectPr>'
+)
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '{overrides}</Types>'
+)
+
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+# Content types of the optional parts understood by the helpers
+_PART_CONTENT_TYPES = {
+    "word/styles.xml": "application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml",
+    "word/numbering.xml": "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml",
+}
+
+
+def docx_document_xml(body: str, sect_pr: str = DEFAULT_SECT_PR) -> str:
+    """word/document.xml with `body` (WordprocessingML fragment) and a final w:sectPr."""
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:r="{R_NAMESPACE}">'
+        f'<w:body>{body}{sect_pr}</w:body></w:document>'
+    )
+
+
+def write_docx(path: Path, body: str = "", parts=None, rels: str = "",
+               sect_pr: str = DEFAULT_SECT_PR, compression=None) -> Path:
+    """
+    Write a minimal .docx package.
+
+    Args:
+        path: Target file
+        body: Content of w:body (before the final w:sectPr)
+        parts: Extra parts {name: str or bytes}, e.g. word/styles.xml
+        rels: w:Relationship elements of word/_rels/document.xml.rels
+        sect_pr: Final section properties
+        compression: zipfile compression (ZIP_DEFLATED by default)
+    """
+    import zipfile
+
+    parts = dict(parts or {})
+    overrides = "".join(
+        f'<Override PartName="/{name}" ContentType="{content_type}"/>'
+        for name, content_type in _PART_CONTENT_TYPES.items() if name in parts
+    )
+    document_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{rels}</Relationships>'
+    )
+    entries = {
+        "[Content_Types].xml": _CONTENT_TYPES.format(overrides=overrides),
+        "_rels/.rels": _PACKAGE_RELS,
+        "word/document.xml": docx_document_xml(body, sect_pr),
+        "word/_rels/document.xml.rels": document_rels,
+    }
+    entries.update(parts)
+    with zipfile.ZipFile(path, "w", compression if compression is not None else zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data.encode("utf-8") if isinstance(data, str) else data)
+    return path
+
+
+def paragraph_xml(text: str = "", ppr: str = "", rpr: str = "") -> str:
+    """A w:p with one run of `text` (ppr/rpr: content of w:pPr / w:rPr)."""
+    ppr = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+    rpr = f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
+    run = f'<w:r>{rpr}<w:t xml:space="preserve">{text}</w:t></w:r>' if text else ""
+    return f"<w:p>{ppr}{run}</w:p>"
+
+
+@pytest.fixture
+def make_docx(tmp_path):
+    """Factory writing minimal .docx files into tmp_path (see write_docx)."""
+    counter = iter(range(1_000_000))
+
+    def make(body: str = "", name: str = None, **kwargs) -> Path:
+        return write_docx(tmp_path / (name or f"doc{next(counter)}.docx"), body, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Private $NORMOCONTROL_CACHE_DIR for the test."""
+    from tests.helpers.ooxml_ir import CACHE_DIR_ENV
+
+    directory = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(directory))
+    return directory
+
+
+@pytest.fixture
+def checker(cache_dir, monkeypatch):
+    """The check_it_docx module of scripts/standards_verification (private cache)."""
+    import importlib
+
+    monkeypatch.syspath_prepend(str(TESTS_DIR.parent / "scripts" / "standards_verification"))
+    return importlib.import_module("check_it_docx")
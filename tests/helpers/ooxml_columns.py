@@ -0,0 +1,324 @@
+"""
+Columnar formatting table of a document.
+
+The single document walk (FormattingTableRule) writes the formatting
+attributes used by the checks into compact typed arrays (`array.array`):
+one row per paragraph and one row per run. String attributes (lineRule,
+jc, style ids, font names) are stored as small integer codes of a
+per-table Vocabulary; absent values are stored as MISSING.
+
+Every paragraph, and every run with it, is tagged with its context (body
+text, table cell, caption, heading) during the same walk, so size rules can
+be applied per context over all runs of a document.
+
+Checks then evaluate whole columns at once, in single linear passes
+(Counter, `itertools.compress`, `map` with `operator` functions, plain
+generator scans), instead of parsing attribute strings element by element.
+"""
+import re
+from array import array
+from collections import Counter
+from itertools import compress, islice, repeat
+from operator import eq
+from typing import Dict, Iterable, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import W_T
+from tests.helpers.ooxml_utils import DocxPackage, get_paragraph_properties
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+# Value of an absent numeric attribute or string code
+MISSING = -1
+
+# Values of the `context` columns
+CONTEXT_BODY = 0
+CONTEXT_TABLE = 1
+CONTEXT_CAPTION = 2
+CONTEXT_HEADING = 3
+
+CONTEXT_NAMES = {
+    CONTEXT_BODY: "основной текст",
+    CONTEXT_TABLE: "таблицы",
+    CONTEXT_CAPTION: "подписи рисунков",
+    CONTEXT_HEADING: "заголовки",
+}
+
+# Figure captions: "Рисунок 1 – ...", "Рисунок А.2 – ...", "Рисунок Б1 – ..."
+# (case-sensitive: "Рисунок показывает ..." is body text)
+_CAPTION_RE = re.compile(r"^\s*[Рр]исунок\s+(\d|[А-ЯA-Z](\.|\d))")
+
+# Built-in style names (w:name is not localized)
+CAPTION_STYLE_NAMES = ("caption",)
+
+
+def paragraph_context(in_table: bool, level: Optional[int], text: str,
+                      style_name: Optional[str] = None) -> int:
+    """
+    Classify a paragraph: caption, heading, table cell or body text.
+
+    Args:
+        in_table: Paragraph is inside a table cell
+        level: Heading level (None for non-headings)
+        text: Paragraph text
+        style_name: w:name of the effective paragraph style
+    """
+    if (style_name or "").lower() in CAPTION_STYLE_NAMES or _CAPTION_RE.match(text):
+        return CONTEXT_CAPTION
+    if level is not None:
+        return CONTEXT_HEADING
+    if in_table:
+        return CONTEXT_TABLE
+    return CONTEXT_BODY
+
+
+class Vocabulary:
+    """Bidirectional mapping between strings and dense integer codes."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: Optional[str]) -> int:
+        """Return the code of `value`, adding it if new (MISSING for None/'')."""
+        if not value:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int:
+        """Return the code of `value` without adding it (MISSING if unknown)."""
+        return self._codes.get(value, MISSING)
+
+    def value(self, code: int) -> Optional[str]:
+        """Return the string for a code (None for MISSING)."""
+        return self.values[code] if code != MISSING else None
+
+
+def _int_or_missing(value) -> int:
+    """Parse a twips / half-points attribute value, MISSING if absent or invalid."""
+    if value is None or value == "":
+        return MISSING
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _column() -> array:
+    return array("i")
+
+
+class FormattingTable:
+    """
+    Paragraph and run formatting of a document as typed columns.
+
+    Paragraph columns (direct formatting, as written in w:pPr):
+        paragraph_ordinal, first_line, line, line_rule, jc, style,
+        has_spacing, paragraph_context, paragraph_section
+    Run columns (effective formatting when a StyleResolver is given):
+        run_paragraph, sz, font_ascii, font_hansi, font_cs, run_context,
+        run_chars (length of the run's w:t text)
+
+    Usage:
+        table = FormattingTable.for_package(package)
+        deviating = count_outside(table.first_line, low, high)
+    """
+
+    PARAGRAPH_COLUMNS = (
+        "paragraph_ordinal", "first_line", "line", "line_rule", "jc", "style",
+        "has_spacing", "paragraph_context", "paragraph_section",
+    )
+    RUN_COLUMNS = ("run_paragraph", "sz", "font_ascii", "font_hansi", "font_cs", "run_context", "run_chars")
+
+    def __init__(self):
+        self.vocabulary = Vocabulary()
+        for name in self.PARAGRAPH_COLUMNS + self.RUN_COLUMNS:
+            setattr(self, name, _column())
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.paragraph_ordinal)
+
+    @property
+    def run_count(self) -> int:
+        return len(self.run_paragraph)
+
+    def code(self, value: Optional[str]) -> Optional[int]:
+        """
+        Vocabulary code of a string value, None if it never occurs.
+
+        Never MISSING: a filter on an unseen value must select no rows,
+        not the rows where the attribute is absent.
+        """
+        code = self.vocabulary.lookup(value) if value else MISSING
+        return None if code == MISSING else code
+
+    def add_paragraph(self, ordinal: int, props: Dict, context: int, section: int) -> None:
+        """Append a paragraph row from get_paragraph_properties-style props."""
+        vocabulary = self.vocabulary
+        spacing = props.get('spacing')
+        self.paragraph_ordinal.append(ordinal)
+        self.first_line.append(_int_or_missing((props.get('ind') or {}).get('firstLine')))
+        if spacing is not None:
+            self.has_spacing.append(1)
+            self.line.append(_int_or_missing(spacing.get('line')))
+            self.line_rule.append(vocabulary.code(spacing.get('lineRule')))
+        else:
+            self.has_spacing.append(0)
+            self.line.append(MISSING)
+            self.line_rule.append(MISSING)
+        self.jc.append(vocabulary.code(props.get('jc')))
+        self.style.append(vocabulary.code(props.get('style')))
+        self.paragraph_context.append(context)
+        self.paragraph_section.append(section)
+
+    def add_run(self, paragraph_ordinal: int, props: Dict, context: int, chars: int = 0) -> None:
+        """Append a run row from get_run_properties-style props."""
+        vocabulary = self.vocabulary
+        fonts = props.get('rFonts') or {}
+        self.run_paragraph.append(paragraph_ordinal)
+        self.sz.append(_int_or_missing(props.get('sz')))
+        self.font_ascii.append(vocabulary.code(fonts.get('ascii')))
+        self.font_hansi.append(vocabulary.code(fonts.get('hAnsi')))
+        self.font_cs.append(vocabulary.code(fonts.get('cs')))
+        self.run_context.append(context)
+        self.run_chars.append(chars)
+
+    @classmethod
+    def build(cls, source, styles=None) -> "FormattingTable":
+        """Build a table with a dedicated walk over `source` (package or root)."""
+        rule = FormattingTableRule(styles)
+        walk_document(source, [rule])
+        return rule.table
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "FormattingTable":
+        """Return the table shared by all checks of a package."""
+        from tests.helpers.ooxml_styles import StyleResolver
+
+        return package.derived(
+            "formatting_table",
+            lambda pkg: cls.build(pkg, StyleResolver.for_package(pkg)),
+        )
+
+
+class FormattingTableRule(DocumentRule):
+    """
+    Fills a FormattingTable during the document walk.
+
+    Runs end before their paragraph, so they are first recorded with the
+    table/body context; when the paragraph ends and its context is known
+    (caption, heading), its runs are re-tagged. Each run row is touched at
+    most twice, so classification stays linear.
+
+    Args:
+        styles: StyleResolver for effective run properties and heading
+            detection (direct formatting only when omitted)
+        table: Table to fill (a new one by default)
+        model: TextModel filled by a TextModelRule registered before this
+            rule; its text and heading level are reused
+    """
+
+    def __init__(self, styles=None, table: Optional[FormattingTable] = None, model=None):
+        self.styles = styles
+        self.table = table if table is not None else FormattingTable()
+        self.model = model
+        self._first_run_row: Dict[int, int] = {}
+
+    def _paragraph_info(self, paragraph: etree._Element, ctx: WalkContext):
+        if self.model is not None and self.model.paragraphs:
+            last = self.model.paragraphs[-1]
+            if last.ordinal == ctx.paragraph_index:
+                return last.text, last.level, last.style
+
+        from tests.helpers.ooxml_text import heading_level, paragraph_text
+
+        if self.styles is not None:
+            props = self.styles.paragraph_properties(paragraph)
+        else:
+            props = get_paragraph_properties(paragraph)
+        return paragraph_text(paragraph), heading_level(props), props.get('style')
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        table = self.table
+        ordinal = ctx.paragraph_index
+        text, level, style = self._paragraph_info(paragraph, ctx)
+        style_name = self.styles.style_name(style) if self.styles is not None else None
+        context = paragraph_context(ctx.in_table, level, text, style_name)
+
+        table.add_paragraph(ordinal, get_paragraph_properties(paragraph), context, ctx.section_index)
+
+        first_row = self._first_run_row.pop(ordinal, None)
+        if first_row is not None and context not in (CONTEXT_BODY, CONTEXT_TABLE):
+            run_paragraph = table.run_paragraph
+            run_context = table.run_context
+            for row in range(first_row, len(run_paragraph)):
+                if run_paragraph[row] == ordinal:
+                    run_context[row] = context
+
+    def on_run(self, run: etree._Element, ctx: WalkContext) -> None:
+        if self.styles is not None:
+            props = self.styles.run_properties(run, ctx.paragraph)
+        else:
+            from tests.helpers.ooxml_utils import get_run_properties
+            props = get_run_properties(run)
+        if ctx.paragraph_index not in self._first_run_row:
+            self._first_run_row[ctx.paragraph_index] = self.table.run_count
+        self.table.add_run(
+            ctx.paragraph_index,
+            props,
+            CONTEXT_TABLE if ctx.in_table else CONTEXT_BODY,
+            run_length(run),
+        )
+
+
+def run_length(run: etree._Element) -> int:
+    """Number of text characters (w:t) of a run."""
+    length = 0
+    for child in run:  # plain iteration beats iterchildren(tag) on a few children
+        if child.tag == W_T:
+            text = child.text
+            if text:
+                length += len(text)
+    return length
+
+
+# Column operations
+
+def where_equal(column: Iterable[int], value: int) -> Iterable[int]:
+    """Selector (for itertools.compress) of rows where `column == value`."""
+    return map(eq, column, repeat(value))
+
+
+def select(column: Iterable[int], selectors: Iterable) -> array:
+    """Rows of `column` for which `selectors` is truthy."""
+    return array("i", compress(column, selectors))
+
+
+def count_outside(column: Iterable[int], low: int, high: int) -> int:
+    """Number of present (non-MISSING) values outside [low, high]."""
+    return sum(1 for value in column if value != MISSING and (value < low or value > high))
+
+
+def rows_outside(column: Iterable[int], low: int, high: int, limit: Optional[int] = None) -> List[int]:
+    """Row numbers of present values outside [low, high] (first `limit` only)."""
+    rows = (
+        row for row, value in enumerate(column)
+        if value != MISSING and (value < low or value > high)
+    )
+    return list(islice(rows, limit))
+
+
+def value_counts(column: Iterable[int]) -> Counter:
+    """Histogram of present values of a column."""
+    counts = Counter(column)
+    counts.pop(MISSING, None)
+    return counts
@@ -0,0 +1,233 @@
+"""
+Field codes (PAGE, TOC, SEQ, REF, ...) of a document.
+
+Word stores fields in two forms:
+- simple fields: <w:fldSimple w:instr=" PAGE "> with the result runs inside;
+- complex fields: runs carrying <w:fldChar w:fldCharType="begin"/>, then
+  <w:instrText> pieces, <w:fldChar w:fldCharType="separate"/>, the result
+  runs and <w:fldChar w:fldCharType="end"/>. Complex fields may span
+  several paragraphs (TOC) and nest (PAGEREF inside TOC).
+
+FieldRule collects both forms during a document walk. FieldIndex gathers
+the fields of document.xml and of the header/footer parts referenced by
+document.xml.rels (unreferenced leftovers in the archive are ignored),
+parsing each part once per package.
+"""
+import shlex
+from dataclasses import dataclass, field as dataclass_field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import W_T, w
+from tests.helpers.ooxml_utils import REL_TYPES, DocxPackage
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+W_FLD_SIMPLE = w("fldSimple")
+W_FLD_CHAR = w("fldChar")
+W_INSTR_TEXT = w("instrText")
+W_FLD_CHAR_TYPE = w("fldCharType")
+W_INSTR = w("instr")
+
+DOCUMENT_PART = "word/document.xml"
+
+
+def parse_instruction(instruction: str) -> Tuple[str, List[str]]:
+    """
+    Split a field instruction into its code and arguments.
+
+    ' SEQ Рисунок \\* ARABIC ' -> ('SEQ', ['Рисунок', '\\*', 'ARABIC'])
+    """
+    try:
+        tokens = shlex.split(instruction, posix=False)
+    except ValueError:
+        tokens = instruction.split()
+    if not tokens:
+        return "", []
+    return tokens[0].upper(), [token.strip('"') for token in tokens[1:]]
+
+
+@dataclass
+class Field:
+    """
+    One field occurrence.
+
+    Attributes:
+        part: Archive name of the part containing the field
+        instruction: Full instruction text (' PAGE \\* MERGEFORMAT ')
+        result: Displayed (cached) result text
+        paragraph: Ordinal of the paragraph where the field starts (within `part`)
+        simple: True for w:fldSimple, False for complex fields
+    """
+    part: str
+    instruction: str
+    result: str = ""
+    paragraph: int = -1
+    simple: bool = False
+    code: str = dataclass_field(init=False)
+    args: List[str] = dataclass_field(init=False)
+
+    def __post_init__(self):
+        self.code, self.args = parse_instruction(self.instruction)
+
+    @property
+    def identifier(self) -> Optional[str]:
+        """First non-switch argument (SEQ identifier, REF bookmark), if any."""
+        for arg in self.args:
+            if not arg.startswith("\\"):
+                return arg
+        return None
+
+    def has_switch(self, switch: str) -> bool:
+        """Check for a switch such as '\\h' or '\\r'."""
+        return any(arg.lower() == switch.lower() for arg in self.args)
+
+
+class _OpenField:
+    __slots__ = ("instruction", "result", "paragraph", "in_result")
+
+    def __init__(self, paragraph: int):
+        self.instruction: List[str] = []
+        self.result: List[str] = []
+        self.paragraph = paragraph
+        self.in_result = False
+
+
+class FieldRule(DocumentRule):
+    """
+    Collects the fields of one part during its walk.
+
+    Complex fields are tracked with a stack of open fields, so nesting and
+    fields spanning paragraphs are handled; result text is appended to every
+    open field that has passed its 'separate' mark.
+
+    Args:
+        index: FieldIndex receiving the fields
+        part: Archive name of the walked part
+    """
+
+    def __init__(self, index: "FieldIndex", part: str = DOCUMENT_PART):
+        self.index = index
+        self.part = part
+        self._stack: List[_OpenField] = []
+
+    def on_run(self, run: etree._Element, ctx: WalkContext) -> None:
+        stack = self._stack
+        for child in run:
+            tag = child.tag
+            if tag == W_FLD_CHAR:
+                char_type = child.get(W_FLD_CHAR_TYPE)
+                if char_type == "begin":
+                    stack.append(_OpenField(ctx.paragraph_index))
+                elif char_type == "separate" and stack:
+                    stack[-1].in_result = True
+                elif char_type == "end" and stack:
+                    self._emit(stack.pop())
+            elif tag == W_INSTR_TEXT and stack and not stack[-1].in_result:
+                stack[-1].instruction.append(child.text or "")
+            elif tag == W_T and stack and child.text:
+                for open_field in stack:
+                    if open_field.in_result:
+                        open_field.result.append(child.text)
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        for simple in paragraph.iterchildren(W_FLD_SIMPLE):
+            self.index.add(Field(
+                part=self.part,
+                instruction=simple.get(W_INSTR, ""),
+                result="".join(t.text or "" for t in simple.iter(W_T)),
+                paragraph=ctx.paragraph_index,
+                simple=True,
+            ))
+        # Results spanning paragraphs (TOC) keep their line structure
+        for open_field in self._stack:
+            if open_field.in_result:
+                open_field.result.append("\n")
+
+    def finish(self, ctx: WalkContext) -> None:
+        # Unterminated fields (damaged documents): keep what was collected
+        while self._stack:
+            self._emit(self._stack.pop())
+
+    def _emit(self, open_field: _OpenField) -> None:
+        self.index.add(Field(
+            part=self.part,
+            instruction="".join(open_field.instruction),
+            result="".join(open_field.result),
+            paragraph=open_field.paragraph,
+        ))
+
+
+class FieldIndex:
+    """
+    Fields of document.xml and of the referenced headers and footers.
+
+    Usage:
+        fields = FieldIndex.for_package(package)
+        page_fields = fields.by_code("PAGE")
+    """
+
+    def __init__(self):
+        self.fields: List[Field] = []
+        self.parts: List[str] = []
+
+    def add(self, field: Field) -> None:
+        self.fields.append(field)
+
+    def by_code(self, code: str, part: Optional[str] = None) -> List[Field]:
+        """Fields with the given code (optionally only in one part)."""
+        code = code.upper()
+        return [f for f in self.fields if f.code == code and (part is None or f.part == part)]
+
+    def in_part(self, part: str) -> List[Field]:
+        """All fields of one part."""
+        return [f for f in self.fields if f.part == part]
+
+    def rule(self, part: str = DOCUMENT_PART) -> FieldRule:
+        """Rule collecting the fields of `part` into this index (for a shared walk)."""
+        if part not in self.parts:
+            self.parts.append(part)
+        return FieldRule(self, part)
+
+    def scan_part(self, package: DocxPackage, part: str) -> None:
+        """Parse and collect the fields of a part (once)."""
+        if part in self.parts:
+            return
+        root = package.get_part(part)
+        self.parts.append(part)
+        if root is not None:
+            walk_document(root, [FieldRule(self, part)])
+
+    def scan_headers_footers(self, package: DocxPackage) -> None:
+        """Collect fields of every header/footer referenced by document.xml.rels."""
+        for kind in ("header", "footer"):
+            for part in referenced_parts(package, kind).values():
+                self.scan_part(package, part)
+
+    @classmethod
+    def build(cls, package: DocxPackage) -> "FieldIndex":
+        """Collect fields of document.xml and of the referenced headers/footers."""
+        index = cls()
+        index.scan_part(package, DOCUMENT_PART)
+        index.scan_headers_footers(package)
+        return index
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "FieldIndex":
+        """Return the index shared by all checks of a package."""
+        return package.derived("field_index", cls.build)
+
+
+def referenced_parts(package: DocxPackage, kind: str) -> Dict[str, str]:
+    """
+    Map rId -> part name for the parts of one kind ('header', 'footer')
+    referenced by document.xml.rels and present in the archive (cached
+    on the package).
+    """
+    type_uri = REL_TYPES[kind]
+    return package.derived(f"referenced_parts:{kind}", lambda pkg: {
+        rel_id: rel['target']
+        for rel_id, rel in pkg.relationships(DOCUMENT_PART).items()
+        if rel['type'] == type_uri and rel['mode'] != "External" and pkg.has_part(rel['target'])
+    })
@@ -0,0 +1,296 @@
+"""
+Canonical content fingerprint of a .docx package.
+
+Re-saving a document in Word changes rsid attributes, docProps timestamps,
+proofing marks and the ZIP member order, so byte hashes differ although
+content and formatting did not change. The fingerprint hashes a canonical
+form of the parts that define content and formatting instead:
+
+- word/document.xml (hashed block by block during the document walk,
+  so it costs no extra parse and works in streaming mode);
+- word/styles.xml and word/numbering.xml;
+- headers and footers, through the sectPr references that use them.
+
+Canonical form:
+- attributes are sorted; rsid*, w14:paraId/textId and mc:Ignorable are dropped;
+- w:proofErr, w:lastRenderedPageBreak, bookmarks, w:rsid (styles) and
+  w:nsid/w:tmpl (numbering) are dropped;
+- consecutive plain runs (only w:rPr and w:t) with equal formatting are
+  merged, so runs split by rsid boundaries hash like a single run;
+- whitespace between elements is ignored, text of w:t/w:instrText is kept;
+- relationship ids (r:id, r:embed) are replaced by what they point to:
+  the fingerprint of a header/footer part, the CRC32 and size of other parts
+  (from the ZIP directory, nothing is decompressed), the URL of external
+  targets. Renumbered rIds and renamed parts therefore do not matter.
+"""
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import NS, W_P, W_R, W_RPR, W_T, W_TBL, w
+from tests.helpers.ooxml_utils import REL_TYPES, DocxPackage
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+# Bump when the canonical form changes (fingerprints are used as cache keys)
+FINGERPRINT_VERSION = 1
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+NUMBERING_PART = "word/numbering.xml"
+
+W14 = "http://schemas.microsoft.com/office/word/2010/wordml"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+R = f"{{{NS['r']}}}"
+
+NOISE_ELEMENTS = frozenset({
+    w("proofErr"),
+    w("lastRenderedPageBreak"),
+    w("bookmarkStart"),
+    w("bookmarkEnd"),
+    w("rsid"),
+    w("nsid"),
+    w("tmpl"),
+})
+NOISE_ATTRIBUTES = frozenset({
+    f"{{{W14}}}paraId",
+    f"{{{W14}}}textId",
+    f"{{{MC}}}Ignorable",
+})
+_RSID_PREFIX = w("rsid")
+
+# Elements whose text is content (all other text is indentation whitespace)
+TEXT_ELEMENTS = frozenset({w("t"), w("instrText"), w("delText"), w("delInstrText")})
+
+_HEADER_FOOTER_TYPES = frozenset({REL_TYPES["header"], REL_TYPES["footer"]})
+
+_OPEN = b"\x01"
+_CLOSE = b"\x02"
+_TEXT = b"\x03"
+_NESTED = b"\x04"
+_SEP = b"\x00"
+_RUN_OPEN = _OPEN + W_R.encode("utf-8") + _SEP
+
+
+def _is_noise_attribute(name: str) -> bool:
+    return name in NOISE_ATTRIBUTES or name.startswith(_RSID_PREFIX)
+
+
+class CanonicalSerializer:
+    """
+    Feeds the canonical form of elements of one part into a hash.
+
+    Args:
+        package: Package the part belongs to (for relationship targets)
+        part: Archive name of the part
+        fingerprinter: PackageFingerprint resolving header/footer digests
+    """
+
+    def __init__(self, package: DocxPackage, part: str,
+                 fingerprinter: Optional["PackageFingerprint"] = None):
+        self.package = package
+        self.part = part
+        self.fingerprinter = fingerprinter
+        self._rels = package.relationships(part)
+        self._targets: Dict[str, str] = {}
+        # Canonical start tags by (tag, attributes): formatting repeats a lot
+        self._tags: Dict[Tuple[str, tuple], bytes] = {}
+
+    def update(self, hasher, element: etree._Element, nested: Iterable[str] = ()) -> None:
+        """
+        Feed `element` and its subtree into `hasher`.
+
+        Args:
+            nested: Tags of descendants that are hashed separately (only a
+                marker is written in their place)
+        """
+        out: List[bytes] = []
+        self._write(out, element, frozenset(nested))
+        hasher.update(b"".join(out))
+
+    def _write(self, out: List[bytes], node: etree._Element, nested) -> None:
+        out.append(self._open_tag(node))
+        text = node.text
+        if text and node.tag in TEXT_ELEMENTS:
+            out.append(_TEXT + text.encode("utf-8"))
+
+        run_format: Optional[bytes] = None
+        run_texts: List[str] = []
+        for child in node:
+            tag = child.tag
+            if tag in NOISE_ELEMENTS or not isinstance(tag, str):
+                continue  # editor noise, comments, processing instructions
+            if tag == W_R:
+                plain = self._plain_run(child)
+                if plain is not None:
+                    if plain[0] != run_format:
+                        if run_format is not None:
+                            self._write_run(out, run_format, run_texts)
+                        run_format, run_texts = plain[0], []
+                    run_texts.append(plain[1])
+                    continue
+            if run_format is not None:
+                self._write_run(out, run_format, run_texts)
+                run_format, run_texts = None, []
+            if tag in nested:
+                out.append(_NESTED + tag.encode("utf-8"))
+            else:
+                self._write(out, child, nested)
+        if run_format is not None:
+            self._write_run(out, run_format, run_texts)
+        out.append(_CLOSE)
+
+    @staticmethod
+    def _write_run(out: List[bytes], run_format: bytes, texts: List[str]) -> None:
+        """Write merged plain runs as one run."""
+        out.append(_RUN_OPEN + run_format + _TEXT + "".join(texts).encode("utf-8") + _CLOSE)
+
+    def _plain_run(self, run: etree._Element) -> Optional[Tuple[bytes, str]]:
+        """(canonical rPr, text) for runs holding only w:rPr and w:t, else None."""
+        run_format = b""
+        texts = []
+        for child in run:
+            tag = child.tag
+            if tag == W_T:
+                texts.append(child.text or "")
+            elif tag == W_RPR:
+                serialized: List[bytes] = []
+                self._write(serialized, child, frozenset())
+                run_format = b"".join(serialized)
+            elif isinstance(tag, str) and tag not in NOISE_ELEMENTS:
+                return None
+        return run_format, "".join(texts)
+
+    def _open_tag(self, node: etree._Element) -> bytes:
+        attrib = node.attrib
+        if not attrib:
+            return _OPEN + node.tag.encode("utf-8") + _SEP
+        key = (node.tag, tuple(attrib.items()))
+        cached = self._tags.get(key)
+        if cached is None:
+            parts = [_OPEN + node.tag.encode("utf-8") + _SEP]
+            for name, value in sorted(key[1]):
+                if _is_noise_attribute(name):
+                    continue
+                if name.startswith(R):
+                    value = self._resolve(value)
+                parts.append(f"{name}={value}".encode("utf-8") + _SEP)
+            cached = self._tags[key] = b"".join(parts)
+        return cached
+
+    def _resolve(self, rel_id: str) -> str:
+        """Replace a relationship id by a description of its target."""
+        target = self._targets.get(rel_id)
+        if target is not None:
+            return target
+        rel = self._rels.get(rel_id)
+        if rel is None:
+            target = "missing"
+        elif rel['mode'] == "External":
+            target = "external:" + rel['target']
+        elif not self.package.has_part(rel['target']):
+            target = "missing:" + rel['target']
+        elif rel['type'] in _HEADER_FOOTER_TYPES and self.fingerprinter is not None:
+            target = "part:" + self.fingerprinter.part_digest(rel['target'])
+        else:
+            info = self.package.part_info(rel['target'])
+            target = f"{rel['type'].rsplit('/', 1)[-1]}:{info.CRC:08x}:{info.file_size}"
+        self._targets[rel_id] = target
+        return target
+
+
+class PackageFingerprint:
+    """
+    Computes and caches the digests of the parts of one package.
+
+    Usage:
+        fingerprint = content_fingerprint(package)
+    """
+
+    def __init__(self, package: DocxPackage):
+        self.package = package
+        self._digests: Dict[str, str] = {}
+
+    def serializer(self, part: str) -> CanonicalSerializer:
+        return CanonicalSerializer(self.package, part, self)
+
+    def part_digest(self, part: str) -> str:
+        """Digest of the canonical form of a whole part ('' if absent)."""
+        digest = self._digests.get(part)
+        if digest is None:
+            root = self.package.get_part(part)
+            hasher = hashlib.sha256()
+            if root is not None:
+                self.serializer(part).update(hasher, root)
+                digest = hasher.hexdigest()
+            else:
+                digest = ""
+            self._digests[part] = digest
+        return digest
+
+    def combine(self, document_digest: str) -> str:
+        """Package fingerprint from the document digest and the other parts."""
+        hasher = hashlib.sha256(f"docx-fingerprint:{FINGERPRINT_VERSION}".encode("ascii"))
+        for role, digest in (
+            ("document", document_digest),
+            ("styles", self.part_digest(STYLES_PART)),
+            ("numbering", self.part_digest(NUMBERING_PART)),
+        ):
+            hasher.update(f"{_SEP.decode()}{role}={digest}".encode("ascii"))
+        return hasher.hexdigest()
+
+
+class FingerprintRule(DocumentRule):
+    """
+    Hashes word/document.xml during the document walk.
+
+    Every paragraph and table is hashed when it ends, without the nested
+    paragraphs and tables it contains (those ended earlier and were hashed
+    on their own). This only reads elements while their handler runs, so
+    the digest is identical in walk and streaming mode. Body-level w:sectPr
+    (the last section) is hashed too; paragraph-level ones are part of
+    their paragraph.
+
+    Args:
+        package: Package being walked
+        fingerprinter: Shared PackageFingerprint (a new one by default)
+    """
+
+    def __init__(self, package: DocxPackage, fingerprinter: Optional[PackageFingerprint] = None):
+        self.fingerprinter = fingerprinter if fingerprinter is not None else PackageFingerprint(package)
+        self.serializer = self.fingerprinter.serializer(DOCUMENT_PART)
+        self.hasher = hashlib.sha256()
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        self.serializer.update(self.hasher, paragraph, nested=(W_P, W_TBL))
+
+    def on_table(self, table: etree._Element, ctx: WalkContext) -> None:
+        self.serializer.update(self.hasher, table, nested=(W_P, W_TBL))
+
+    def on_sect_pr(self, sect_pr: etree._Element, ctx: WalkContext) -> None:
+        if ctx.paragraph is None:
+            self.serializer.update(self.hasher, sect_pr)
+
+    def document_digest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def fingerprint(self) -> str:
+        """Package fingerprint (call after the walk)."""
+        return self.fingerprinter.combine(self.document_digest())
+
+
+def content_fingerprint(package: DocxPackage) -> str:
+    """
+    Return the canonical content fingerprint of a package (hex SHA-256).
+
+    Cached on the package; a checker that registers a FingerprintRule in its
+    own walk can store the result under the same key to avoid a second walk.
+    """
+    return package.derived("content_fingerprint", _fingerprint_with_walk)
+
+
+def _fingerprint_with_walk(package: DocxPackage) -> str:
+    rule = FingerprintRule(package)
+    walk_document(package, [rule])
+    return rule.fingerprint()
@@ -0,0 +1,146 @@
+"""
+Font × size × context histogram of a whole document.
+
+Every run of word/document.xml, of the referenced headers and footers and
+of the footnotes/endnotes is counted, weighted by its number of text
+characters, under (part, context, font, size). The counters are folded
+from the run columns of a FormattingTable (one pass, constant work per
+run): document.xml's table is the one filled by the shared document walk,
+the other parts are small and get a table of their own.
+
+The font of a run is its effective w:rFonts/@w:ascii, falling back to
+@w:hAnsi and @w:cs (Word sets them together when a font is chosen).
+Runs without text (field characters, drawings, separators) are skipped.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tests.helpers.ooxml_columns import MISSING, FormattingTable, FormattingTableRule
+from tests.helpers.ooxml_utils import DocxPackage
+from tests.helpers.ooxml_walker import walk_document
+
+
+PART_DOCUMENT = "document"
+PART_HEADERS = "headers"
+PART_NOTES = "notes"
+
+PART_NAMES = {
+    PART_DOCUMENT: "документ",
+    PART_HEADERS: "колонтитулы",
+    PART_NOTES: "сноски",
+}
+
+# (part, context, font, size in half-points or MISSING)
+FontKey = Tuple[str, int, Optional[str], int]
+
+
+class FontHistogram:
+    """
+    Characters and runs per (part, context, font, size).
+
+    Usage:
+        histogram = FontHistogram.build(package, table, styles)
+        chars_by_font = histogram.fonts(part=PART_DOCUMENT)
+    """
+
+    def __init__(self):
+        self.chars: Dict[FontKey, int] = {}
+        self.runs: Dict[FontKey, int] = {}
+        # (part, context, font) -> ordinal of the first paragraph using the font
+        self.first_paragraph: Dict[Tuple[str, int, Optional[str]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def add_table(self, table: FormattingTable, part: str = PART_DOCUMENT) -> None:
+        """Count the runs of a formatting table under `part`."""
+        chars: Dict[Tuple[int, int, int], int] = {}
+        runs: Dict[Tuple[int, int, int], int] = {}
+        first: Dict[Tuple[int, int], int] = {}
+        for paragraph, context, ascii_font, hansi_font, cs_font, size, length in zip(
+            table.run_paragraph, table.run_context, table.font_ascii, table.font_hansi,
+            table.font_cs, table.sz, table.run_chars,
+        ):
+            if not length:
+                continue
+            font = ascii_font if ascii_font != MISSING else hansi_font if hansi_font != MISSING else cs_font
+            key = (context, font, size)
+            if key in chars:
+                chars[key] += length
+                runs[key] += 1
+            else:
+                chars[key] = length
+                runs[key] = 1
+                first.setdefault((context, font), paragraph)
+
+        # Codes are per table: decode once per distinct key
+        value = table.vocabulary.value
+        for (context, font, size), length in chars.items():
+            key = (part, context, value(font), size)
+            self.chars[key] = self.chars.get(key, 0) + length
+            self.runs[key] = self.runs.get(key, 0) + runs[(context, font, size)]
+        for (context, font), paragraph in first.items():
+            self.first_paragraph.setdefault((part, context, value(font)), paragraph)
+
+    def items(self, part: Optional[str] = None,
+              contexts: Optional[Iterable[int]] = None) -> List[Tuple[FontKey, int]]:
+        """(key, characters) pairs, most characters first."""
+        contexts = set(contexts) if contexts is not None else None
+        return sorted(
+            (
+                (key, length) for key, length in self.chars.items()
+                if (part is None or key[0] == part) and (contexts is None or key[1] in contexts)
+            ),
+            key=lambda item: (-item[1], item[0][0], item[0][1], item[0][2] or "", item[0][3]),
+        )
+
+    def fonts(self, part: Optional[str] = None,
+              contexts: Optional[Iterable[int]] = None) -> Dict[Optional[str], int]:
+        """Characters per font (None: font not determined), most first."""
+        totals: Dict[Optional[str], int] = {}
+        for (_part, _context, font, _size), length in self.items(part, contexts):
+            totals[font] = totals.get(font, 0) + length
+        return dict(sorted(totals.items(), key=lambda item: (-item[1], item[0] or "")))
+
+    def first_use(self, font: Optional[str], part: str = PART_DOCUMENT,
+                  contexts: Optional[Iterable[int]] = None) -> int:
+        """Ordinal of the first paragraph of `part` using `font` (-1 if none)."""
+        ordinals = [
+            paragraph for (key_part, context, key_font), paragraph in self.first_paragraph.items()
+            if key_part == part and key_font == font and (contexts is None or context in contexts)
+        ]
+        return min(ordinals) if ordinals else -1
+
+    def scan_part(self, package: DocxPackage, part_name: str, part: str, styles=None) -> None:
+        """Walk a non-document part (header, footer, notes) and count its runs."""
+        root = package.get_part(part_name)
+        if root is None:
+            return
+        rule = FormattingTableRule(styles)
+        walk_document(root, [rule])
+        self.add_table(rule.table, part)
+
+    @classmethod
+    def build(cls, package: DocxPackage, table: FormattingTable, styles=None) -> "FontHistogram":
+        """
+        Histogram of document.xml (from its formatting table) and of the
+        headers, footers and notes parts.
+        """
+        histogram = cls()
+        histogram.add_table(table, PART_DOCUMENT)
+        for part_name, part in audited_parts(package):
+            histogram.scan_part(package, part_name, part, styles)
+        return histogram
+
+
+def audited_parts(package: DocxPackage) -> List[Tuple[str, str]]:
+    """(archive name, histogram part) of the parts besides document.xml."""
+    from tests.helpers.ooxml_fields import referenced_parts
+
+    parts = []
+    for kind in ("header", "footer"):
+        parts.extend((name, PART_HEADERS) for name in referenced_parts(package, kind).values())
+    for kind in ("footnotes", "endnotes"):
+        name = package.related_part(kind)
+        if name is not None and package.has_part(name):
+            parts.append((name, PART_NOTES))
+    return parts
@@ -0,0 +1,176 @@
+"""
+Per-document paragraph index for issue locations.
+
+Built in the single document walk (ParagraphIndexRule), it maps every
+paragraph to its ordinal, the nearest preceding heading, its section and
+its text, so that checks can report "Параграф 412, раздел 'Введение'" at
+constant cost per issue instead of re-running `.//w:p` for every lookup.
+
+Ordinals follow the `.//w:p` numbering used by the other helpers.
+"""
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_text import TextModel, heading_level, paragraph_text
+from tests.helpers.ooxml_utils import DocxPackage, text_preview
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+class ParagraphIndex:
+    """
+    Ordinal, heading, section and text of every paragraph of a document.
+
+    Usage:
+        index = ParagraphIndex.for_package(package)
+        ordinal = index.ordinal(paragraph_element)
+        location = index.location(ordinal)
+    """
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.sections: List[int] = []
+        self.headings: List[int] = []          # ordinal of the governing heading, -1 if none
+        self.heading_levels: Dict[int, int] = {}  # heading ordinal -> level
+        self._ordinals: Dict[etree._Element, int] = {}
+        self._current_heading = -1
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getstate__(self) -> Dict:
+        # Elements belong to one parsed tree; a pickled index (ooxml_ir)
+        # keeps only the values
+        state = self.__dict__.copy()
+        state["_ordinals"] = {}
+        return state
+
+    def add(self, ordinal: int, text: str, level: Optional[int], section: int,
+            paragraph: Optional[etree._Element] = None) -> None:
+        """Record one paragraph (called by ParagraphIndexRule)."""
+        if ordinal >= len(self.texts):
+            missing = ordinal + 1 - len(self.texts)
+            self.texts.extend([""] * missing)
+            self.sections.extend([section] * missing)
+            self.headings.extend([self._current_heading] * missing)
+        if level is not None:
+            self._current_heading = ordinal
+            self.heading_levels[ordinal] = level
+        self.texts[ordinal] = text
+        self.sections[ordinal] = section
+        self.headings[ordinal] = self._current_heading
+        if paragraph is not None:
+            self._ordinals[paragraph] = ordinal
+
+    @classmethod
+    def build(cls, source, styles=None) -> "ParagraphIndex":
+        """Build an index with a dedicated walk over `source` (package or root)."""
+        rule = ParagraphIndexRule(styles)
+        walk_document(source, [rule])
+        return rule.index
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "ParagraphIndex":
+        """Return the index shared by all checks of a package."""
+        from tests.helpers.ooxml_styles import StyleResolver
+
+        return package.derived(
+            "paragraph_index",
+            lambda pkg: cls.build(pkg, StyleResolver.for_package(pkg)),
+        )
+
+    def ordinal(self, paragraph: etree._Element) -> int:
+        """0-based ordinal of a paragraph element, or -1 if unknown."""
+        return self._ordinals.get(paragraph, -1)
+
+    def heading_ordinal(self, ordinal: int) -> int:
+        """Ordinal of the heading governing a paragraph (-1 if none)."""
+        if 0 <= ordinal < len(self.headings):
+            return self.headings[ordinal]
+        return -1
+
+    def heading(self, ordinal: int) -> str:
+        """Text of the heading governing a paragraph ('' if none)."""
+        heading = self.heading_ordinal(ordinal)
+        return self.texts[heading].strip() if heading >= 0 else ""
+
+    def section(self, ordinal: int) -> int:
+        """0-based index of the section (w:sectPr) containing a paragraph."""
+        if 0 <= ordinal < len(self.sections):
+            return self.sections[ordinal]
+        return -1
+
+    def preview(self, ordinal: int, max_length: int = 50) -> str:
+        """Shortened text of a paragraph."""
+        if 0 <= ordinal < len(self.texts):
+            return text_preview(self.texts[ordinal], max_length)
+        return ""
+
+    def location(self, ordinal: int, with_preview: bool = False) -> str:
+        """Human-readable location of a paragraph for issue reports."""
+        parts = [f"Параграф {ordinal + 1}"]
+        heading = self.heading(ordinal)
+        if heading:
+            parts.append(f"раздел '{text_preview(heading, 40)}'")
+        location = ", ".join(parts)
+        if with_preview:
+            location += f": '{self.preview(ordinal, 40)}'"
+        return location
+
+    def locations(self, ordinals: List[int], limit: int = 3, total: Optional[int] = None) -> str:
+        """
+        Locations of the first `limit` paragraphs, with a count of the rest.
+
+        Args:
+            ordinals: Paragraph ordinals (only the first `limit` are used)
+            limit: Number of locations to list
+            total: Number of affected paragraphs (defaults to len(ordinals))
+        """
+        total = len(ordinals) if total is None else total
+        location = "; ".join(self.location(o, with_preview=True) for o in ordinals[:limit])
+        if total > limit:
+            location += f" (и ещё {total - limit})"
+        return location
+
+
+class ParagraphIndexRule(DocumentRule):
+    """
+    Fills a ParagraphIndex during the document walk.
+
+    Args:
+        styles: StyleResolver used to detect heading styles (optional)
+        index: Index to fill (a new one by default)
+        keep_elements: Map elements to ordinals (disable when streaming,
+            where elements are released right after the walk sees them)
+        model: TextModel filled by a TextModelRule registered before this
+            rule; its text and heading level are reused instead of being
+            computed a second time
+    """
+
+    def __init__(self, styles=None, index: Optional[ParagraphIndex] = None,
+                 keep_elements: bool = True, model: Optional[TextModel] = None):
+        self.styles = styles
+        self.index = index if index is not None else ParagraphIndex()
+        self.keep_elements = keep_elements
+        self.model = model
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        element = paragraph if self.keep_elements else None
+        if self.model is not None and self.model.paragraphs:
+            last = self.model.paragraphs[-1]
+            if last.ordinal == ctx.paragraph_index:
+                self.index.add(last.ordinal, last.text, last.level, ctx.section_index, element)
+                return
+
+        if self.styles is not None:
+            props = self.styles.paragraph_properties(paragraph)
+        else:
+            from tests.helpers.ooxml_utils import get_paragraph_properties
+            props = get_paragraph_properties(paragraph)
+        self.index.add(
+            ctx.paragraph_index,
+            paragraph_text(paragraph),
+            heading_level(props),
+            ctx.section_index,
+            element,
+        )
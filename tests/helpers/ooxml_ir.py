@@ -0,0 +1,203 @@
+"""
+Persistent intermediate representation (IR) of checked documents.
+
+The single document walk extracts everything the checks evaluate: the text
+model, the formatting columns (effective fonts and sizes, so the styles are
+represented through their effect), sections, fields (with those of the
+headers and footers), table grids, the paragraph index, the font histogram
+and the media inventory. IRCache pickles these derived views to disk after
+a run and restores them into a fresh DocxPackage on the next run. A
+restored view does not build the views it was derived from (DocumentViews),
+so when every view the checks read comes from the IR, document.xml,
+styles.xml, numbering.xml, the theme and the headers are not parsed at all.
+(With the result cache on, check_document still parses the relationships
+of document.xml: they name the input parts of every check.)
+
+Layout of the cache directory:
+    ir-<extractor version>/<content fingerprint>.ir    pickled views
+    ir-<extractor version>/files/<archive sha256>      fingerprint of a file
+
+The IR is keyed by the content fingerprint (ooxml_fingerprint), so files
+that differ only by editor noise share one entry. The fingerprint itself
+is computed during the walk, so a lookup goes through a small alias file
+keyed by the SHA-256 of the archive bytes; a re-saved document therefore
+misses once, and its walk refreshes the alias.
+
+The extractor version is a hash of the helper modules that build the IR
+(ooxml_*.py), IR_VERSION and FINGERPRINT_VERSION: changing any collector
+invalidates every entry, while editing the rules that only evaluate the
+IR (the checker) keeps it. Files are written atomically (temporary file +
+rename), so concurrent runs never read a partial entry.
+
+The cache holds pickles and must only be shared between trusted users
+(the default directory is private to the current user).
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tests.helpers.ooxml_fingerprint import FINGERPRINT_VERSION
+from tests.helpers.ooxml_utils import DocxPackage
+
+
+# Bump when the layout of the stored views changes in a way the source
+# hash does not capture (e.g. pickling hooks of a third-party type)
+IR_VERSION = 1
+
+CACHE_DIR_ENV = "NORMOCONTROL_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "normocontrol"
+
+_MAGIC = b"normocontrol-ir\x00"
+
+# Derived views (DocxPackage.derived keys) restored as shared views
+SHARED_KEYS = (
+    "content_fingerprint",
+    "text_model",
+    "formatting_table",
+    "sections",
+    "field_index",
+    "header_fields",
+    "headers",
+    "table_index",
+    "media_inventory",
+    "font_histogram",
+    "referenced_parts:header",
+    "referenced_parts:footer",
+)
+# Everything an entry can hold (the shared views and the paragraph index)
+IR_KEYS = frozenset(SHARED_KEYS + ("paragraph_index",))
+
+_LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                IndexError, TypeError, ValueError)
+
+
+@lru_cache(maxsize=1)
+def extractor_version() -> str:
+    """Hash of the code that produces the IR (helper modules and versions)."""
+    hasher = hashlib.sha256(f"ir:{IR_VERSION}:fp:{FINGERPRINT_VERSION}".encode("ascii"))
+    for path in sorted(Path(__file__).parent.glob("ooxml_*.py")):
+        hasher.update(path.name.encode("utf-8") + b"\x00")
+        hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+class IRCache:
+    """
+    On-disk cache of the derived views of checked documents.
+
+    Usage:
+        cache = IRCache()
+        with DocxPackage(path) as package:
+            ir = cache.load(package)
+            if ir is None:
+                ...  # walk the document, run the checks
+                cache.store(package, paragraph_index=index)
+
+    Args:
+        directory: Cache root (default: $NORMOCONTROL_CACHE_DIR or
+            ~/.cache/normocontrol)
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.root = Path(directory) if directory is not None else cache_root()
+        self.directory = self.root / f"ir-{extractor_version()[:16]}"
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.ir"
+
+    def _alias_path(self, content_hash: str) -> Path:
+        return self.directory / "files" / content_hash
+
+    def lookup(self, package: DocxPackage) -> Optional[str]:
+        """Content fingerprint recorded for the archive bytes of `package` (None if unknown)."""
+        try:
+            fingerprint = self._alias_path(package.content_hash).read_text(encoding="ascii").strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return fingerprint or None
+
+    def load(self, package: DocxPackage) -> Optional[Dict[str, Any]]:
+        """
+        Restore the IR of `package` (None on a miss or an unreadable entry).
+
+        An entry holds the views of the runs that stored it (a run of a few
+        checks stores only what it built). The shared views are seeded into
+        the package (`package.derived`), so TextModel.for_package() and
+        friends return them without a walk. The paragraph index is only
+        returned: a restored index has no element lookups
+        (ParagraphIndex.ordinal), like one built in streaming mode.
+        """
+        fingerprint = self.lookup(package)
+        if fingerprint is None:
+            return None
+        try:
+            data = self._entry_path(fingerprint).read_bytes()
+            if not data.startswith(_MAGIC):
+                return None
+            ir = pickle.loads(data[len(_MAGIC):])
+        except _LOAD_ERRORS:
+            return None
+        if not isinstance(ir, dict) or ir.get("content_fingerprint") != fingerprint:
+            return None
+        for key in SHARED_KEYS:
+            if key in ir:
+                package.derived(key, lambda _package, value=ir[key]: value)
+        return ir
+
+    def store(self, package: DocxPackage, **views: Any) -> bool:
+        """
+        Save the derived views of `package` (call after the checks ran).
+
+        Views restored by `load` are seeded into the package and therefore
+        stored again, so entries grow as runs build more views.
+
+        Args:
+            views: Additional views that are not shared through
+                `package.derived` (paragraph_index); None
+                values are skipped
+
+        Returns:
+            False if the package has no content fingerprint yet (nothing stored)
+        """
+        fingerprint = package.get_derived("content_fingerprint")
+        if fingerprint is None:
+            return False
+        ir: Dict[str, Any] = {}
+        for key in SHARED_KEYS:
+            value = package.get_derived(key)
+            if value is not None:
+                ir[key] = value
+        for key, value in views.items():
+            if value is None:
+                continue
+            ir[key] = value
+
+        atomic_write(self._entry_path(fingerprint),
+                     _MAGIC + pickle.dumps(ir, protocol=pickle.HIGHEST_PROTOCOL))
+        atomic_write(self._alias_path(package.content_hash), fingerprint.encode("ascii"))
+        return True
+
+
+def cache_root() -> Path:
+    """Root of the normocontrol caches ($NORMOCONTROL_CACHE_DIR or ~/.cache/normocontrol)."""
+    return Path(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` atomically (readers see the old or the new file, never a part)."""
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,331 @@
+"""
+Relationship graph and media inventory of a .docx package.
+
+Both are built from ZIP metadata only: the graph follows the .rels parts
+(small XML) starting from word/document.xml, and part sizes come from the
+ZIP central directory (`ZipInfo.file_size` / `compress_size`), so no media
+part is decompressed. Pixel dimensions of PNG and JPEG images are read
+from their header bytes (the IHDR chunk, the first SOFn marker); other
+formats (EMF, WMF, SVG, ...) have no dimensions.
+"""
+import io
+import posixpath
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from tests.helpers.ooxml_utils import REL_TYPES, DocxPackage
+
+
+DOCUMENT_PART = "word/document.xml"
+MEDIA_FOLDER = "word/media/"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+
+# JPEG start-of-frame markers (SOF0..SOF15 without DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+# Stop looking for SOFn after this many bytes (EXIF thumbnails come first)
+JPEG_SCAN_LIMIT = 256 * 1024
+
+_REL_KINDS = {uri: kind for kind, uri in REL_TYPES.items()}
+
+
+def format_size(size: int) -> str:
+    """Human-readable size: "850 КБ", "2.4 МБ"."""
+    if size < 1024 * 1024:
+        return f"{max(size // 1024, 1)} КБ"
+    return f"{size / (1024 * 1024):.1f} МБ"
+
+
+def _read_exact(stream, size: int) -> Optional[bytes]:
+    data = stream.read(size)
+    return data if len(data) == size else None
+
+
+def _jpeg_dimensions(stream) -> Optional[Tuple[int, int]]:
+    """Width and height from the first SOFn segment (stream is past FFD8)."""
+    scanned = 2
+    while scanned < JPEG_SCAN_LIMIT:
+        byte = _read_exact(stream, 1)
+        if byte is None:
+            return None
+        scanned += 1
+        if byte != b"\xff":
+            continue
+        marker = _read_exact(stream, 1)
+        if marker is None:
+            return None
+        scanned += 1
+        code = marker[0]
+        if code == 0xFF or code in _JPEG_STANDALONE_MARKERS or code == 0x00:
+            continue
+        length_bytes = _read_exact(stream, 2)
+        if length_bytes is None:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if length < 2:
+            return None
+        if code in _JPEG_SOF_MARKERS:
+            frame = _read_exact(stream, 5)
+            if frame is None:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+        # Skip the segment (the ZIP stream can only skip by reading)
+        if _read_exact(stream, length - 2) is None:
+            return None
+        scanned += length
+    return None
+
+
+def image_dimensions(stream) -> Optional[Tuple[int, int]]:
+    """
+    Return (width, height) in pixels of a PNG or JPEG image, or None.
+
+    Only the header bytes are read from `stream` (a binary file object,
+    e.g. `DocxPackage.open_part`).
+    """
+    head = stream.read(8)
+    if head == PNG_SIGNATURE:
+        ihdr = _read_exact(stream, 16)
+        if ihdr is None or ihdr[4:8] != b"IHDR":
+            return None
+        return struct.unpack(">II", ihdr[8:16])
+    if head[:2] == JPEG_SIGNATURE:
+        # The first 8 bytes already contain the first marker; re-scan them
+        return _jpeg_dimensions(_ChainedStream(io.BytesIO(head[2:]), stream))
+    return None
+
+
+class _ChainedStream:
+    """Read from `first`, then from `second` (minimal file-like object)."""
+
+    def __init__(self, first, second):
+        self._streams = [first, second]
+
+    def read(self, size: int) -> bytes:
+        data = b""
+        while self._streams and len(data) < size:
+            chunk = self._streams[0].read(size - len(data))
+            if not chunk:
+                self._streams.pop(0)
+                continue
+            data += chunk
+        return data
+
+
+@dataclass
+class Relationship:
+    """
+    One edge of the relationship graph.
+
+    Attributes:
+        source: Part owning the relationship (e.g. 'word/document.xml')
+        rel_id: Relationship id ('rId5')
+        type: Full relationship type URI
+        target: Archive part name (raw URL for external targets)
+        external: True for TargetMode="External" (hyperlinks, linked images)
+        size: Uncompressed size of the target part (0 if external or missing)
+        compressed_size: Size of the target part inside the archive
+    """
+    source: str
+    rel_id: str
+    type: str
+    target: str
+    external: bool = False
+    size: int = 0
+    compressed_size: int = 0
+
+    @property
+    def kind(self) -> str:
+        """Short type name ('image', 'header', ...) for the known types."""
+        return _REL_KINDS.get(self.type, self.type.rsplit("/", 1)[-1])
+
+
+class RelationshipGraph:
+    """
+    Parts reachable from word/document.xml through relationships.
+
+    Usage:
+        graph = RelationshipGraph.for_package(package)
+        for rel in graph.by_kind("image"):
+            print(rel.target, rel.size)
+    """
+
+    def __init__(self):
+        self.edges: Dict[str, List[Relationship]] = {}
+
+    @property
+    def parts(self) -> List[str]:
+        """Internal parts reachable from the root, in discovery order."""
+        seen = {}
+        for source, rels in self.edges.items():
+            seen.setdefault(source, None)
+            for rel in rels:
+                if not rel.external:
+                    seen.setdefault(rel.target, None)
+        return list(seen)
+
+    def relationships(self, source: str = DOCUMENT_PART) -> Dict[str, Relationship]:
+        """Relationships of one part, keyed by rId."""
+        return {rel.rel_id: rel for rel in self.edges.get(source, [])}
+
+    def by_kind(self, kind: str) -> List[Relationship]:
+        """All internal relationships of a kind ('image', 'header', ...)."""
+        return [
+            rel for rels in self.edges.values() for rel in rels
+            if rel.kind == kind and not rel.external
+        ]
+
+    def unreferenced(self, package: DocxPackage, folder: str = MEDIA_FOLDER) -> List[str]:
+        """Parts under `folder` that no relationship points to."""
+        reachable = set(self.parts)
+        return [
+            name for name in package.namelist()
+            if name.startswith(folder) and not name.endswith("/") and name not in reachable
+        ]
+
+    @classmethod
+    def build(cls, package: DocxPackage, root: str = DOCUMENT_PART) -> "RelationshipGraph":
+        """Follow relationships breadth-first from `root` (reads only .rels parts)."""
+        graph = cls()
+        queue = [root]
+        visited = {root}
+        while queue:
+            source = queue.pop(0)
+            edges = graph.edges[source] = []
+            for rel_id, rel in package.relationships(source).items():
+                external = rel['mode'] == "External"
+                edge = Relationship(source, rel_id, rel['type'], rel['target'], external)
+                if not external and package.has_part(rel['target']):
+                    info = package.part_info(rel['target'])
+                    edge.size = info.file_size
+                    edge.compressed_size = info.compress_size
+                    if edge.target not in visited and _has_relationships(package, edge.target):
+                        visited.add(edge.target)
+                        queue.append(edge.target)
+                edges.append(edge)
+        return graph
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "RelationshipGraph":
+        """Return the graph shared by all checks of a package."""
+        return package.derived("relationship_graph", cls.build)
+
+
+def _has_relationships(package: DocxPackage, part_name: str) -> bool:
+    folder, base = posixpath.split(part_name)
+    return package.has_part(posixpath.join(folder, "_rels", base + ".rels"))
+
+
+@dataclass
+class MediaItem:
+    """
+    One image part of the package.
+
+    Attributes:
+        part: Archive part name ('word/media/image1.png')
+        size: Uncompressed size in bytes
+        compressed_size: Size inside the archive
+        width: Pixel width (None if unknown or not PNG/JPEG)
+        height: Pixel height
+        references: (source part, rId) pairs pointing to the image
+    """
+    part: str
+    size: int
+    compressed_size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    references: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def format(self) -> str:
+        """Lower-case file extension ('png', 'jpeg', 'emf', ...)."""
+        return posixpath.splitext(self.part)[1].lstrip(".").lower()
+
+    @property
+    def pixels(self) -> int:
+        return (self.width or 0) * (self.height or 0)
+
+    def describe(self) -> str:
+        """Short human-readable description: "image3.png (2.4 МБ, 4000×3000)"."""
+        details = [format_size(self.size)]
+        if self.width and self.height:
+            details.append(f"{self.width}×{self.height}")
+        return f"{posixpath.basename(self.part)} ({', '.join(details)})"
+
+
+class MediaInventory:
+    """
+    Images referenced by the document, its headers, footers and notes.
+
+    Usage:
+        media = MediaInventory.for_package(package)
+        heavy = media.oversized(max_bytes=1024 * 1024)
+    """
+
+    def __init__(self):
+        self.items: Dict[str, MediaItem] = {}
+        self.unreferenced: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def total_size(self) -> int:
+        """Uncompressed size of all referenced images."""
+        return sum(item.size for item in self.items.values())
+
+    @property
+    def total_compressed_size(self) -> int:
+        """Archive size of all referenced images."""
+        return sum(item.compressed_size for item in self.items.values())
+
+    def oversized(self, max_bytes: Optional[int] = None,
+                  max_side: Optional[int] = None) -> List[MediaItem]:
+        """Images larger than `max_bytes` or wider/taller than `max_side` pixels, largest first."""
+        items = [
+            item for item in self.items.values()
+            if (max_bytes is not None and item.size > max_bytes)
+            or (max_side is not None and max(item.width or 0, item.height or 0) > max_side)
+        ]
+        return sorted(items, key=lambda item: item.size, reverse=True)
+
+    @classmethod
+    def build(cls, package: DocxPackage, graph: Optional[RelationshipGraph] = None,
+              dimensions: bool = True) -> "MediaInventory":
+        """
+        Collect image parts from the relationship graph.
+
+        Args:
+            package: Source package
+            graph: Relationship graph (the package's shared one by default)
+            dimensions: Read PNG/JPEG header bytes for pixel dimensions
+        """
+        if graph is None:
+            graph = RelationshipGraph.for_package(package)
+        inventory = cls()
+        for rel in graph.by_kind("image"):
+            if not package.has_part(rel.target):
+                continue
+            item = inventory.items.get(rel.target)
+            if item is None:
+                item = inventory.items[rel.target] = MediaItem(
+                    rel.target, rel.size, rel.compressed_size,
+                )
+                if dimensions and item.format in ("png", "jpg", "jpeg"):
+                    with package.open_part(rel.target) as stream:
+                        size = image_dimensions(stream)
+                    if size is not None:
+                        item.width, item.height = size
+            item.references.append((rel.source, rel.rel_id))
+        inventory.unreferenced = graph.unreferenced(package)
+        return inventory
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "MediaInventory":
+        """Return the inventory shared by all checks of a package."""
+        return package.derived("media_inventory", cls.build)
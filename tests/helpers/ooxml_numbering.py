@@ -0,0 +1,291 @@
+"""
+List numbering resolution (word/numbering.xml).
+
+Auto-numbered paragraphs carry no digits in their text: the number comes
+from w:numPr (direct or inherited from the paragraph style), which points
+to a w:num instance, which in turn points to a w:abstractNum with one
+w:lvl definition (start value, number format, label template) per level.
+
+NumberingResolver computes the number and label Word would display for
+each list paragraph, in document order. Level definitions are resolved
+once per numId and cached; counters are kept per abstractNum, so lists
+that share a definition continue each other unless a w:startOverride
+restarts them.
+
+Not supported: w:isLgl, legacy numbering, picture bullets.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import (
+    W_ABSTRACT_NUM,
+    W_ABSTRACT_NUM_ID,
+    W_ILVL,
+    W_LVL,
+    W_LVL_OVERRIDE,
+    W_LVL_TEXT,
+    W_NUM,
+    W_NUM_FMT,
+    W_NUM_ID,
+    W_NUM_STYLE_LINK,
+    W_START,
+    W_START_OVERRIDE,
+    W_VAL,
+)
+from tests.helpers.ooxml_utils import DocxPackage
+
+
+# Letters used by Word for russianLower/russianUpper (no ё, й, ъ, ь)
+_RUSSIAN_LETTERS = "абвгдежзиклмнопрстуфхцчшщыэюя"
+
+_ROMAN = (
+    (1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+    (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i"),
+)
+
+# Formats without a counter value in the label
+NON_NUMERIC_FORMATS = ("bullet", "none")
+
+
+def _to_roman(value: int) -> str:
+    parts = []
+    for arabic, roman in _ROMAN:
+        count, value = divmod(value, arabic)
+        parts.append(roman * count)
+    return "".join(parts)
+
+
+def _to_letters(value: int, alphabet: str) -> str:
+    # Word repeats the letter after the alphabet is exhausted: a..z, aa..zz, ...
+    if value <= 0:
+        return str(value)
+    repeat, index = divmod(value - 1, len(alphabet))
+    return alphabet[index] * (repeat + 1)
+
+
+def format_number(value: int, num_fmt: str) -> str:
+    """Format a counter value in a w:numFmt format (decimal for unknown ones)."""
+    if num_fmt in NON_NUMERIC_FORMATS:
+        return ""
+    if num_fmt == "lowerLetter":
+        return _to_letters(value, "abcdefghijklmnopqrstuvwxyz")
+    if num_fmt == "upperLetter":
+        return _to_letters(value, "abcdefghijklmnopqrstuvwxyz").upper()
+    if num_fmt == "russianLower":
+        return _to_letters(value, _RUSSIAN_LETTERS)
+    if num_fmt == "russianUpper":
+        return _to_letters(value, _RUSSIAN_LETTERS).upper()
+    if num_fmt == "lowerRoman":
+        return _to_roman(value)
+    if num_fmt == "upperRoman":
+        return _to_roman(value).upper()
+    if num_fmt == "decimalZero":
+        return f"{value:02d}"
+    return str(value)
+
+
+@dataclass(frozen=True)
+class ListLevel:
+    """Definition of one list level (w:lvl)."""
+    start: int = 1
+    num_fmt: str = "decimal"
+    lvl_text: str = ""
+
+    @property
+    def is_bullet(self) -> bool:
+        return self.num_fmt in NON_NUMERIC_FORMATS
+
+
+@dataclass(frozen=True)
+class ListItem:
+    """
+    Computed numbering of one list paragraph.
+
+    Attributes:
+        num_id: w:numId of the list instance
+        level: 0-based list level (w:ilvl)
+        number: Counter value at this level
+        label: Label as displayed by Word ("1.", "2.3", "А", "•")
+        is_bullet: True for bulleted (non-numbered) levels
+    """
+    num_id: str
+    level: int
+    number: int
+    label: str
+    is_bullet: bool
+
+
+def _int_val(element: Optional[etree._Element], default: int) -> int:
+    if element is None:
+        return default
+    try:
+        return int(element.get(W_VAL))
+    except (TypeError, ValueError):
+        return default
+
+
+def _int_val_attr(element: etree._Element, attr: str) -> int:
+    try:
+        return int(element.get(attr, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_level(lvl: etree._Element) -> ListLevel:
+    num_fmt = lvl.find(W_NUM_FMT)
+    lvl_text = lvl.find(W_LVL_TEXT)
+    return ListLevel(
+        start=_int_val(lvl.find(W_START), 1),
+        num_fmt=(num_fmt.get(W_VAL) if num_fmt is not None else None) or "decimal",
+        lvl_text=(lvl_text.get(W_VAL) if lvl_text is not None else None) or "",
+    )
+
+
+def _parse_levels(parent: etree._Element) -> Dict[int, ListLevel]:
+    return {
+        _int_val_attr(lvl, W_ILVL): _parse_level(lvl)
+        for lvl in parent.iterchildren(W_LVL)
+    }
+
+
+class NumberingResolver:
+    """
+    Assigns numbers and labels to list paragraphs in document order.
+
+    Usage:
+        numbering = NumberingResolver.from_package(package)
+        item = numbering.next_item(props['numPr']['numId'], 0)
+
+    The resolver is stateful: call `next_item` once per list paragraph, in
+    document order (use `reset()` to start over). For the same reason it is
+    not shared through `package.derived()`; the computed items are, as part
+    of the TextModel.
+    """
+
+    def __init__(self, numbering_xml: Optional[etree._Element], styles=None):
+        self.styles = styles
+        self._abstract: Dict[str, etree._Element] = {}
+        self._nums: Dict[str, etree._Element] = {}
+        self._definitions: Dict[str, Optional[Tuple[str, Dict[int, ListLevel], Dict[int, int]]]] = {}
+        self._counters: Dict[str, Dict[int, int]] = {}
+        self._started: set = set()
+
+        if numbering_xml is not None:
+            for abstract in numbering_xml.iterchildren(W_ABSTRACT_NUM):
+                self._abstract[abstract.get(W_ABSTRACT_NUM_ID)] = abstract
+            for num in numbering_xml.iterchildren(W_NUM):
+                self._nums[num.get(W_NUM_ID)] = num
+
+    @classmethod
+    def from_package(cls, package: DocxPackage) -> "NumberingResolver":
+        """Build a resolver from numbering.xml (and styles, for numStyleLink)."""
+        from tests.helpers.ooxml_styles import StyleResolver
+
+        return cls(package.numbering_xml, StyleResolver.for_package(package))
+
+    def reset(self) -> None:
+        """Forget all counters (start numbering from the beginning)."""
+        self._counters.clear()
+        self._started.clear()
+
+    def _abstract_for(self, abstract_id: Optional[str], depth: int = 0) -> Optional[etree._Element]:
+        abstract = self._abstract.get(abstract_id)
+        if abstract is None:
+            return None
+        link = abstract.find(W_NUM_STYLE_LINK)
+        if link is None or self.styles is None or depth > 4:
+            return abstract
+        # Definition lives in the numbering style: follow its numPr
+        style_num_pr = self.styles.paragraph_style(link.get(W_VAL))[0].get('numPr') or {}
+        num = self._nums.get(style_num_pr.get('numId'))
+        if num is None:
+            return abstract
+        linked = self._abstract_for(_abstract_id_of(num), depth + 1)
+        return linked if linked is not None else abstract
+
+    def definition(self, num_id: str) -> Optional[Tuple[str, Dict[int, ListLevel], Dict[int, int]]]:
+        """
+        Resolve a numId once: (abstractNum id, levels, start overrides).
+
+        Returns None for unknown ids.
+        """
+        if num_id in self._definitions:
+            return self._definitions[num_id]
+
+        definition = None
+        num = self._nums.get(num_id)
+        abstract = self._abstract_for(_abstract_id_of(num)) if num is not None else None
+        if abstract is not None:
+            levels = _parse_levels(abstract)
+            overrides: Dict[int, int] = {}
+            for override in num.iterchildren(W_LVL_OVERRIDE):
+                ilvl = _int_val_attr(override, W_ILVL)
+                start = override.find(W_START_OVERRIDE)
+                if start is not None:
+                    overrides[ilvl] = _int_val(start, 1)
+                lvl = override.find(W_LVL)
+                if lvl is not None:
+                    levels[ilvl] = _parse_level(lvl)
+            definition = (abstract.get(W_ABSTRACT_NUM_ID), levels, overrides)
+
+        self._definitions[num_id] = definition
+        return definition
+
+    def next_item(self, num_id: Optional[str], ilvl: int = 0) -> Optional[ListItem]:
+        """
+        Advance the list counter of a paragraph and return its numbering.
+
+        Args:
+            num_id: w:numId of the paragraph ("0"/None = not a list)
+            ilvl: 0-based list level
+
+        Returns:
+            ListItem, or None if the paragraph is not numbered
+        """
+        if not num_id or num_id == "0":
+            return None
+        definition = self.definition(num_id)
+        if definition is None:
+            return None
+        abstract_id, levels, overrides = definition
+
+        counters = self._counters.setdefault(abstract_id, {})
+        if num_id not in self._started:
+            self._started.add(num_id)
+            for level_index, start in overrides.items():
+                counters[level_index] = start - 1
+
+        level = levels.get(ilvl, ListLevel())
+        number = counters[ilvl] + 1 if ilvl in counters else level.start
+        counters[ilvl] = number
+        for deeper in [k for k in counters if k > ilvl]:
+            del counters[deeper]
+
+        label = level.lvl_text
+        for index in range(ilvl + 1):
+            placeholder = f"%{index + 1}"
+            if placeholder not in label:
+                continue
+            level_def = levels.get(index, ListLevel())
+            value = counters.get(index, level_def.start)
+            label = label.replace(placeholder, format_number(value, level_def.num_fmt))
+
+        return ListItem(num_id, ilvl, number, label, level.is_bullet)
+
+    def item_for(self, props: Dict) -> Optional[ListItem]:
+        """next_item() for effective paragraph properties (uses props['numPr'])."""
+        num_pr = props.get('numPr')
+        if not num_pr:
+            return None
+        try:
+            ilvl = int(num_pr.get('ilvl') or 0)
+        except ValueError:
+            ilvl = 0
+        return self.next_item(num_pr.get('numId'), ilvl)
+
+
+def _abstract_id_of(num: etree._Element) -> Optional[str]:
+    abstract_ref = num.find(W_ABSTRACT_NUM_ID)
+    return abstract_ref.get(W_VAL) if abstract_ref is not None else None
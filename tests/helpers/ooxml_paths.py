@@ -0,0 +1,131 @@
+"""
+Precompiled OOXML queries shared by all helpers and checkers.
+
+Holds:
+- the namespace map (NS)
+- Clark-notation names ("{namespace}local") for every element and attribute
+  the checkers read, computed once at import time
+- precompiled `etree.XPath` objects for the document-wide queries
+
+Per-paragraph and per-run helpers should use `element.find(W_PPR)` and
+`element.get(W_VAL)` with these constants instead of building
+`f"{{{NS['w']}}}val"` strings and passing a namespaces dict on every call.
+"""
+from lxml import etree
+
+
+# OOXML namespaces
+NS = {
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+}
+
+W = f"{{{NS['w']}}}"
+
+
+def w(local_name: str) -> str:
+    """Clark name of a WordprocessingML element or attribute."""
+    return W + local_name
+
+
+# Elements: body structure
+W_BODY = w("body")
+W_P = w("p")
+W_R = w("r")
+W_T = w("t")
+W_TBL = w("tbl")
+W_TR = w("tr")
+W_TC = w("tc")
+W_SECT_PR = w("sectPr")
+W_SECT_PR_CHANGE = w("sectPrChange")
+
+# Elements: paragraph properties
+W_PPR = w("pPr")
+W_PSTYLE = w("pStyle")
+W_SPACING = w("spacing")
+W_IND = w("ind")
+W_JC = w("jc")
+W_OUTLINE_LVL = w("outlineLvl")
+W_NUM_PR = w("numPr")
+W_NUM_ID = w("numId")
+W_ILVL = w("ilvl")
+
+# Elements: run properties
+W_RPR = w("rPr")
+W_RSTYLE = w("rStyle")
+W_SZ = w("sz")
+W_RFONTS = w("rFonts")
+W_B = w("b")
+W_I = w("i")
+
+# Elements: section properties
+W_PGMAR = w("pgMar")
+W_PGSZ = w("pgSz")
+
+# Elements: styles.xml
+W_STYLE = w("style")
+W_BASED_ON = w("basedOn")
+W_NAME = w("name")
+
+# Elements: numbering.xml
+W_ABSTRACT_NUM = w("abstractNum")
+W_ABSTRACT_NUM_ID = w("abstractNumId")
+W_NUM = w("num")
+W_LVL = w("lvl")
+W_START = w("start")
+W_NUM_FMT = w("numFmt")
+W_LVL_TEXT = w("lvlText")
+W_LVL_OVERRIDE = w("lvlOverride")
+W_START_OVERRIDE = w("startOverride")
+W_NUM_STYLE_LINK = w("numStyleLink")
+W_STYLE_LINK = w("styleLink")
+
+# Attributes
+W_VAL = w("val")
+W_TYPE = w("type")
+W_DEFAULT = w("default")
+W_STYLE_ID = w("styleId")
+W_ORIENT = w("orient")
+W_W = w("w")
+W_H = w("h")
+
+SPACING_ATTRS = tuple((name, w(name)) for name in ("line", "lineRule", "before", "after"))
+IND_ATTRS = tuple((name, w(name)) for name in ("left", "right", "firstLine", "hanging"))
+MARGIN_ATTRS = tuple(
+    (name, w(name)) for name in ("top", "bottom", "left", "right", "header", "footer", "gutter")
+)
+RFONTS_ATTRS = tuple((name, w(name)) for name in ("ascii", "hAnsi", "cs"))
+# rFonts attribute -> attribute holding the theme font reference for it
+RFONTS_THEME_ATTRS = {
+    "ascii": w("asciiTheme"),
+    "hAnsi": w("hAnsiTheme"),
+    "cs": w("cstheme"),
+}
+
+
+def property_child(element: etree._Element, tag: str):
+    """
+    Return the w:pPr / w:rPr / w:tblPr ... child of an element, or None.
+
+    The schema requires property elements to be the first child, so only the
+    leading children are inspected (comments are skipped). This avoids a
+    full ElementPath `find()` for every paragraph and run.
+    """
+    for child in element:
+        if child.tag == tag:
+            return child
+        if isinstance(child.tag, str):
+            return None
+    return None
+
+
+# Document-wide queries
+XP_PARAGRAPHS = etree.XPath(".//w:p", namespaces=NS)
+XP_RUNS = etree.XPath(".//w:r", namespaces=NS)
+XP_SECT_PRS = etree.XPath(".//w:sectPr", namespaces=NS)
+XP_PARAGRAPHS_WITH_SPACING = etree.XPath(".//w:p[w:pPr/w:spacing]", namespaces=NS)
+XP_TEXT = etree.XPath(".//w:t/text()", namespaces=NS)
+XP_DOC_DEFAULT_RPR = etree.XPath("w:docDefaults/w:rPrDefault/w:rPr", namespaces=NS)
+XP_DOC_DEFAULT_PPR = etree.XPath("w:docDefaults/w:pPrDefault/w:pPr", namespaces=NS)
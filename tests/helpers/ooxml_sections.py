@@ -0,0 +1,140 @@
+"""
+Per-section page setup of a document.
+
+A document has one w:sectPr per section: one inside the w:pPr of the last
+paragraph of every section but the last, and one as the last child of
+w:body for the final section. `get_section_properties` only returns the
+last of them; SectionRule collects all of them during the single document
+walk, together with the range of paragraphs each section covers, so that
+title pages and landscape appendices can be checked separately.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import NS, W_TYPE, W_VAL, w
+from tests.helpers.ooxml_utils import (
+    DocxPackage,
+    get_sect_pr_margins,
+    get_sect_pr_page_size,
+)
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+W_HEADER_REFERENCE = w("headerReference")
+W_FOOTER_REFERENCE = w("footerReference")
+W_TITLE_PG = w("titlePg")
+R_ID = f"{{{NS['r']}}}id"
+
+
+@dataclass
+class SectionSetup:
+    """
+    Page setup of one section.
+
+    Attributes:
+        index: 0-based section index
+        first_paragraph: Ordinal of the first paragraph of the section
+        last_paragraph: Ordinal of the last paragraph (-1 for an empty section)
+        margins: As returned by get_sect_pr_margins (None if w:pgMar is absent)
+        page_size: As returned by get_sect_pr_page_size (None if w:pgSz is absent)
+        start_type: w:type of the section break ('nextPage', 'continuous', ...)
+        title_page: True if the first page has its own header/footer (w:titlePg)
+        header_refs: Header relationship ids by type ('default', 'first', 'even')
+        footer_refs: Footer relationship ids by type
+    """
+    index: int
+    first_paragraph: int
+    last_paragraph: int
+    margins: Optional[Dict[str, int]] = None
+    page_size: Optional[Dict[str, Any]] = None
+    start_type: str = "nextPage"
+    title_page: bool = False
+    header_refs: Dict[str, str] = field(default_factory=dict)
+    footer_refs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def landscape(self) -> bool:
+        """True for landscape pages (by w:orient or by width > height)."""
+        if not self.page_size:
+            return False
+        return (
+            self.page_size.get('orient') == 'landscape'
+            or self.page_size.get('width', 0) > self.page_size.get('height', 0)
+        )
+
+    @property
+    def paragraph_count(self) -> int:
+        return max(self.last_paragraph - self.first_paragraph + 1, 0)
+
+    def describe(self) -> str:
+        """Short human-readable reference: "Раздел 2 (параграфы 40–55)"."""
+        if self.paragraph_count:
+            return f"Раздел {self.index + 1} (параграфы {self.first_paragraph + 1}–{self.last_paragraph + 1})"
+        return f"Раздел {self.index + 1}"
+
+
+def section_from_sect_pr(sect_pr: etree._Element, index: int,
+                         first_paragraph: int, last_paragraph: int) -> SectionSetup:
+    """Copy everything the checks need out of a w:sectPr element."""
+    section = SectionSetup(
+        index=index,
+        first_paragraph=first_paragraph,
+        last_paragraph=last_paragraph,
+        margins=get_sect_pr_margins(sect_pr),
+        page_size=get_sect_pr_page_size(sect_pr),
+    )
+    for child in sect_pr:
+        tag = child.tag
+        if tag == W_HEADER_REFERENCE:
+            section.header_refs[child.get(W_TYPE, "default")] = child.get(R_ID)
+        elif tag == W_FOOTER_REFERENCE:
+            section.footer_refs[child.get(W_TYPE, "default")] = child.get(R_ID)
+        elif tag == W_TITLE_PG:
+            section.title_page = child.get(W_VAL) not in ("0", "false", "off")
+        elif tag == W_TYPE:
+            section.start_type = child.get(W_VAL, "nextPage")
+    return section
+
+
+class SectionRule(DocumentRule):
+    """
+    Collects a SectionSetup for every w:sectPr during the document walk.
+
+    Values are copied in `on_sect_pr`, so the rule also works in streaming
+    mode.
+    """
+
+    def __init__(self):
+        self.sections: List[SectionSetup] = []
+        self._next_first_paragraph = 0
+
+    def on_sect_pr(self, sect_pr: etree._Element, ctx: WalkContext) -> None:
+        if ctx.paragraph is not None:
+            # Paragraph-level sectPr: the enclosing paragraph ends the section
+            last_paragraph = ctx.paragraph_index
+        else:
+            last_paragraph = ctx.paragraph_count - 1
+        self.sections.append(section_from_sect_pr(
+            sect_pr, ctx.section_index, self._next_first_paragraph, last_paragraph,
+        ))
+        self._next_first_paragraph = last_paragraph + 1
+
+
+def get_sections(source) -> List[SectionSetup]:
+    """
+    Return the page setup of every section, in document order.
+
+    Args:
+        source: DocxPackage (result is cached on it) or parsed document.xml root
+    """
+    if isinstance(source, DocxPackage):
+        return source.derived("sections", _collect_sections)
+    return _collect_sections(source)
+
+
+def _collect_sections(source) -> List[SectionSetup]:
+    rule = SectionRule()
+    walk_document(source, [rule])
+    return rule.sections
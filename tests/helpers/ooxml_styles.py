@@ -0,0 +1,287 @@
+"""
+Effective style resolution for WordprocessingML (styles.xml).
+
+Formatting visible in Word is the result of several layers, applied in order:
+1. docDefaults (w:rPrDefault / w:pPrDefault)
+2. paragraph style, including its w:basedOn chain
+3. character style of the run, including its w:basedOn chain
+4. direct formatting (w:pPr / w:rPr on the element itself)
+
+Table styles and numbering-level formatting are not taken into account.
+
+Every style chain is resolved once and cached per style id (and per
+paragraph/character style pair for runs), so resolving a run without
+direct formatting costs a single dictionary lookup.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import (
+    NS,
+    W_BASED_ON,
+    W_DEFAULT,
+    W_NAME,
+    W_P,
+    W_PPR,
+    W_PSTYLE,
+    W_RPR,
+    W_RSTYLE,
+    W_STYLE,
+    W_STYLE_ID,
+    W_TYPE,
+    W_VAL,
+    XP_DOC_DEFAULT_PPR,
+    XP_DOC_DEFAULT_RPR,
+    property_child,
+)
+from tests.helpers.ooxml_utils import (
+    DocxPackage,
+    get_styles_xml,
+    paragraph_properties_from_ppr,
+    run_properties_from_rpr,
+)
+
+# Maximum basedOn chain length (guards against cyclic definitions)
+MAX_STYLE_DEPTH = 32
+
+
+def merge_properties(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overlay formatting properties (as returned by get_paragraph_properties /
+    get_run_properties) on top of `base`.
+
+    Nested dicts ('spacing', 'ind', 'rFonts') are merged attribute by
+    attribute; None values never override inherited ones.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict):
+            nested = dict(merged.get(key) or {})
+            nested.update((k, v) for k, v in value.items() if v is not None)
+            merged[key] = nested
+        elif value is not None:
+            merged[key] = value
+    return merged
+
+
+def load_theme_fonts(package: DocxPackage) -> Dict[str, str]:
+    """
+    Map theme font references ('minorHAnsi', 'majorBidi', ...) to typefaces
+    defined in the document theme. Returns an empty dict without a theme.
+    """
+    theme_part = package.related_part("theme")
+    theme = package.get_part(theme_part) if theme_part else None
+    if theme is None:
+        return {}
+
+    fonts = {}
+    for prefix in ("major", "minor"):
+        font = theme.find(f".//a:fontScheme/a:{prefix}Font", namespaces=NS)
+        if font is None:
+            continue
+        for tag, refs in (("latin", ("Ascii", "HAnsi")), ("ea", ("EastAsia",)), ("cs", ("Bidi",))):
+            face = font.find(f"a:{tag}", namespaces=NS)
+            typeface = face.get("typeface") if face is not None else None
+            if typeface:
+                for ref in refs:
+                    fonts[prefix + ref] = typeface
+    return fonts
+
+
+class StyleResolver:
+    """
+    Computes effective paragraph and run properties of a document.
+
+    Usage:
+        resolver = StyleResolver.for_package(package)
+        run_props = resolver.run_properties(run, paragraph)
+        size_half_points = run_props.get('sz')
+    """
+
+    def __init__(self, styles_xml: Optional[etree._Element],
+                 theme_fonts: Optional[Dict[str, str]] = None):
+        self.theme_fonts = theme_fonts or {}
+        self._styles: Dict[str, etree._Element] = {}
+        self._default_style: Dict[str, str] = {}
+        self._default_ppr: Dict[str, Any] = {}
+        self._default_rpr: Dict[str, Any] = {}
+
+        self._paragraph_cache: Dict[Optional[str], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._character_cache: Dict[Optional[str], Dict[str, Any]] = {}
+        self._run_cache: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]] = {}
+
+        # One-entry memo: runs of the same paragraph arrive consecutively
+        self._last_paragraph: Optional[etree._Element] = None
+        self._last_paragraph_style: Optional[str] = None
+
+        if styles_xml is not None:
+            self._load(styles_xml)
+
+    @classmethod
+    def from_package(cls, package: DocxPackage) -> "StyleResolver":
+        """Build a resolver from styles.xml and the theme of a package."""
+        return cls(get_styles_xml(package), load_theme_fonts(package))
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "StyleResolver":
+        """Return the resolver shared by all checks of a package."""
+        return package.derived("style_resolver", cls.from_package)
+
+    def _load(self, styles_xml: etree._Element) -> None:
+        for r_pr in XP_DOC_DEFAULT_RPR(styles_xml):
+            self._default_rpr = run_properties_from_rpr(r_pr, self.theme_fonts)
+        for p_pr in XP_DOC_DEFAULT_PPR(styles_xml):
+            self._default_ppr = paragraph_properties_from_ppr(p_pr)
+
+        for style in styles_xml.iterchildren(W_STYLE):
+            style_id = style.get(W_STYLE_ID)
+            if not style_id:
+                continue
+            self._styles[style_id] = style
+            style_type = style.get(W_TYPE, "paragraph")
+            if style.get(W_DEFAULT) in ("1", "true", "on") and style_type not in self._default_style:
+                self._default_style[style_type] = style_id
+
+    def _chain(self, style_id: Optional[str]):
+        """Yield style elements from the root of the basedOn chain down to `style_id`."""
+        chain = []
+        seen = set()
+        while style_id and style_id in self._styles and style_id not in seen and len(chain) < MAX_STYLE_DEPTH:
+            seen.add(style_id)
+            style = self._styles[style_id]
+            chain.append(style)
+            based_on = style.find(W_BASED_ON)
+            style_id = based_on.get(W_VAL) if based_on is not None else None
+        return reversed(chain)
+
+    def style_name(self, style_id: Optional[str]) -> Optional[str]:
+        """Return the w:name of a style ('caption', 'heading 1', ...), or None."""
+        style = self._styles.get(style_id) if style_id else None
+        if style is None:
+            return None
+        name = style.find(W_NAME)
+        return name.get(W_VAL) if name is not None else None
+
+    def paragraph_style(self, style_id: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Resolve a paragraph style (docDefaults + basedOn chain).
+
+        Args:
+            style_id: w:pStyle value, or None for the default paragraph style
+
+        Returns:
+            (paragraph properties, run properties) contributed by the style
+        """
+        cached = self._paragraph_cache.get(style_id)
+        if cached is not None:
+            return cached
+
+        effective_id = style_id or self._default_style.get("paragraph")
+        p_props = dict(self._default_ppr)
+        r_props = dict(self._default_rpr)
+        for style in self._chain(effective_id):
+            p_pr = style.find(W_PPR)
+            if p_pr is not None:
+                p_props = merge_properties(p_props, paragraph_properties_from_ppr(p_pr))
+            r_pr = style.find(W_RPR)
+            if r_pr is not None:
+                r_props = merge_properties(r_props, run_properties_from_rpr(r_pr, self.theme_fonts))
+        if effective_id:
+            p_props['style'] = effective_id
+
+        self._paragraph_cache[style_id] = (p_props, r_props)
+        return p_props, r_props
+
+    def character_style(self, style_id: Optional[str]) -> Dict[str, Any]:
+        """Resolve run properties contributed by a character style chain."""
+        cached = self._character_cache.get(style_id)
+        if cached is not None:
+            return cached
+
+        effective_id = style_id or self._default_style.get("character")
+        r_props: Dict[str, Any] = {}
+        for style in self._chain(effective_id):
+            r_pr = style.find(W_RPR)
+            if r_pr is not None:
+                r_props = merge_properties(r_props, run_properties_from_rpr(r_pr, self.theme_fonts))
+        r_props.pop('style', None)
+
+        self._character_cache[style_id] = r_props
+        return r_props
+
+    def run_style(self, paragraph_style_id: Optional[str], character_style_id: Optional[str]) -> Dict[str, Any]:
+        """Effective run properties for a style pair, before direct formatting."""
+        key = (paragraph_style_id, character_style_id)
+        cached = self._run_cache.get(key)
+        if cached is None:
+            cached = merge_properties(
+                self.paragraph_style(paragraph_style_id)[1],
+                self.character_style(character_style_id),
+            )
+            if character_style_id:
+                cached['style'] = character_style_id
+            self._run_cache[key] = cached
+        return cached
+
+    def paragraph_style_id(self, paragraph: Optional[etree._Element]) -> Optional[str]:
+        """Return the w:pStyle of a paragraph (memoized for the last paragraph)."""
+        if paragraph is None:
+            return None
+        if paragraph is self._last_paragraph:
+            return self._last_paragraph_style
+        style_id = None
+        p_pr = property_child(paragraph, W_PPR)
+        if p_pr is not None:
+            p_style = property_child(p_pr, W_PSTYLE)
+            if p_style is not None:
+                style_id = p_style.get(W_VAL)
+        self._last_paragraph = paragraph
+        self._last_paragraph_style = style_id
+        return style_id
+
+    def paragraph_properties(self, paragraph: etree._Element) -> Dict[str, Any]:
+        """
+        Effective properties of a paragraph (same keys as
+        get_paragraph_properties, with 'style' always set when known).
+        """
+        style_props = self.paragraph_style(self.paragraph_style_id(paragraph))[0]
+        p_pr = property_child(paragraph, W_PPR)
+        if p_pr is None:
+            return style_props
+        direct = paragraph_properties_from_ppr(p_pr)
+        direct.pop('style', None)
+        if not direct:
+            return style_props
+        return merge_properties(style_props, direct)
+
+    def run_properties(self, run: etree._Element,
+                       paragraph: Optional[etree._Element] = None) -> Dict[str, Any]:
+        """
+        Effective properties of a run (same keys as get_run_properties).
+
+        Args:
+            run: w:r element
+            paragraph: Enclosing paragraph (defaults to the run's parent)
+
+        The returned dict may be shared between runs; do not modify it.
+        """
+        if paragraph is None:
+            paragraph = run.getparent()
+            while paragraph is not None and paragraph.tag != W_P:
+                paragraph = paragraph.getparent()
+        paragraph_style_id = self.paragraph_style_id(paragraph)
+
+        r_pr = property_child(run, W_RPR)
+        if r_pr is None:
+            return self.run_style(paragraph_style_id, None)
+
+        r_style = property_child(r_pr, W_RSTYLE)
+        character_style_id = r_style.get(W_VAL) if r_style is not None else None
+        base = self.run_style(paragraph_style_id, character_style_id)
+
+        direct = run_properties_from_rpr(r_pr, self.theme_fonts)
+        direct.pop('style', None)
+        if not direct:
+            return base
+        return merge_properties(base, direct)
@@ -0,0 +1,324 @@
+"""
+Table grid model built straight from the lxml tree.
+
+A w:tbl stores cells row by row; merged cells are encoded per cell:
+w:gridSpan (horizontal span in grid columns), w:vMerge ("restart" starts a
+vertical merge, an empty/"continue" value continues the cell above) and
+the legacy w:hMerge. python-docx resolves these through `row.cells`,
+which re-scans previous rows for every vertical merge and becomes
+quadratic on tables with many merged cells.
+
+TableGrid expands a table into a row × grid-column matrix in one pass:
+every position points to its GridCell (the same object for all positions
+a merged cell covers), and a vertical merge is continued through a
+per-column dict of open cells, so the cost is linear in the number of grid
+positions.
+
+TableGridRule collects the grids of a document during the single document
+walk, together with the paragraphs of every cell and the body paragraph
+preceding each table (where its caption "Таблица N – ..." belongs).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import W_BODY, W_P, W_TBL, W_TC, W_TR, W_VAL, w
+from tests.helpers.ooxml_utils import DocxPackage
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+W_TC_PR = w("tcPr")
+W_TR_PR = w("trPr")
+W_GRID_SPAN = w("gridSpan")
+W_GRID_BEFORE = w("gridBefore")
+W_V_MERGE = w("vMerge")
+W_H_MERGE = w("hMerge")
+W_SDT = w("sdt")
+W_SDT_CONTENT = w("sdtContent")
+W_CUSTOM_XML = w("customXml")
+
+# Containers that may wrap rows or cells (content controls, custom XML)
+_WRAPPERS = (W_SDT, W_SDT_CONTENT, W_CUSTOM_XML)
+
+
+def _int_val(element: Optional[etree._Element], default: int) -> int:
+    if element is None:
+        return default
+    try:
+        return max(int(element.get(W_VAL, default)), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def _children(parent: etree._Element, tag: str) -> Iterator[etree._Element]:
+    """Children with `tag`, looking through sdt/customXml wrappers."""
+    for child in parent:
+        if child.tag == tag:
+            yield child
+        elif child.tag in _WRAPPERS:
+            yield from _children(child, tag)
+
+
+@dataclass
+class GridCell:
+    """
+    One (possibly merged) cell of a table.
+
+    Attributes:
+        row: First grid row covered by the cell
+        col: First grid column covered by the cell
+        row_span: Number of rows (vMerge)
+        col_span: Number of grid columns (gridSpan / hMerge)
+        element: The w:tc starting the cell (None when elements are not kept)
+        paragraphs: Ordinals of the paragraphs of the cell (filled by
+            TableGridRule; the cells of continued vMerge rows included)
+    """
+    row: int
+    col: int
+    row_span: int = 1
+    col_span: int = 1
+    element: Optional[etree._Element] = None
+    paragraphs: List[int] = field(default_factory=list)
+
+    def __getstate__(self) -> Dict:
+        # w:tc elements are not picklable (see ooxml_ir): keep the positions only
+        state = self.__dict__.copy()
+        state["element"] = None
+        return state
+
+    @property
+    def text(self) -> str:
+        """Text of the cell (python-docx `_Cell.text`: direct paragraphs joined by newlines)."""
+        if self.element is None:
+            return ""
+        from tests.helpers.ooxml_text import paragraph_text
+
+        return "\n".join(paragraph_text(p) for p in _children(self.element, W_P))
+
+    def describe(self) -> str:
+        """Short human-readable position: "строка 2, столбец 3"."""
+        return f"строка {self.row + 1}, столбец {self.col + 1}"
+
+
+class TableGrid:
+    """
+    Row × grid-column matrix of a table.
+
+    Usage:
+        grid = TableGrid.from_element(tbl)
+        cell = grid.cell_at(2, 0)
+        right = grid.right_of(cell)
+    """
+
+    def __init__(self):
+        self.rows: List[List[Optional[GridCell]]] = []
+        self.cells: List[GridCell] = []
+        self.column_count = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def cell_at(self, row: int, col: int) -> Optional[GridCell]:
+        """Cell covering a grid position (None outside the table or in gaps)."""
+        if 0 <= row < len(self.rows) and 0 <= col < len(self.rows[row]):
+            return self.rows[row][col]
+        return None
+
+    def right_of(self, cell: GridCell, row: Optional[int] = None) -> Optional[GridCell]:
+        """First cell after `cell` in the same row (past its horizontal span)."""
+        return self.cell_at(cell.row if row is None else row, cell.col + cell.col_span)
+
+    def find(self, needle: str) -> List[GridCell]:
+        """Cells whose text contains `needle` (case-insensitive), each merged cell once."""
+        needle = needle.lower()
+        return [cell for cell in self.cells if needle in cell.text.lower()]
+
+    @classmethod
+    def from_element(cls, table: etree._Element, keep_elements: bool = True,
+                     paragraphs: Optional[Dict[etree._Element, List[int]]] = None) -> "TableGrid":
+        """
+        Build the grid of a w:tbl in one pass over its cells.
+
+        Args:
+            table: w:tbl element
+            keep_elements: Keep the w:tc elements in GridCell.element
+            paragraphs: w:tc -> paragraph ordinals (consumed: entries of the
+                table's cells are removed)
+        """
+        grid = cls()
+        open_vertical: Dict[int, GridCell] = {}  # grid column -> cell open for vMerge
+        for row_index, tr in enumerate(_children(table, W_TR)):
+            tr_pr = tr.find(W_TR_PR)
+            col = _int_val(tr_pr.find(W_GRID_BEFORE), 0) if tr_pr is not None else 0
+            positions: List[Optional[GridCell]] = [None] * col
+            previous: Optional[GridCell] = None
+            for tc in _children(tr, W_TC):
+                tc_pr = tc.find(W_TC_PR)
+                span = 1
+                v_merge = h_merge = None
+                if tc_pr is not None:
+                    span = _int_val(tc_pr.find(W_GRID_SPAN), 1)
+                    v_merge = tc_pr.find(W_V_MERGE)
+                    h_merge = tc_pr.find(W_H_MERGE)
+
+                cell = None
+                if h_merge is not None and h_merge.get(W_VAL, "continue") == "continue" and previous is not None:
+                    cell = previous
+                    cell.col_span += span
+                elif v_merge is not None and v_merge.get(W_VAL, "continue") == "continue":
+                    cell = open_vertical.get(col)
+                    if cell is not None and cell.col_span == span:
+                        cell.row_span = row_index - cell.row + 1
+                    else:
+                        cell = None
+                if cell is None:
+                    cell = GridCell(row_index, col, col_span=span,
+                                    element=tc if keep_elements else None)
+                    grid.cells.append(cell)
+                    if v_merge is not None:
+                        open_vertical[col] = cell
+                    else:
+                        open_vertical.pop(col, None)
+
+                if paragraphs is not None:
+                    cell.paragraphs.extend(paragraphs.pop(tc, ()))
+                positions.extend([cell] * span)
+                col += span
+                previous = cell
+            grid.rows.append(positions)
+            grid.column_count = max(grid.column_count, len(positions))
+        return grid
+
+
+@dataclass
+class TableInfo:
+    """
+    A table of the document with its position.
+
+    Attributes:
+        number: 1-based number among body-level tables (0 for nested tables)
+        grid: Grid model of the table
+        depth: Nesting depth (1 for tables in the body)
+        preceding_paragraph: Ordinal of the last body paragraph before the
+            table (-1 if the table opens the document or is nested)
+    """
+    number: int
+    grid: TableGrid
+    depth: int = 1
+    preceding_paragraph: int = -1
+
+    def describe(self, cell: Optional[GridCell] = None) -> str:
+        """Short human-readable reference: "Таблица 2, строка 3, столбец 1"."""
+        name = f"Таблица {self.number}" if self.number else "Вложенная таблица"
+        return f"{name}, {cell.describe()}" if cell is not None else name
+
+
+class TableIndex:
+    """
+    Grids of all tables of a document in document order.
+
+    Usage:
+        tables = TableIndex.for_package(package)
+        for table in tables.top_level():
+            print(table.number, len(table.grid))
+    """
+
+    def __init__(self):
+        self.tables: List[TableInfo] = []
+        self._cells_by_paragraph: Optional[Dict[int, Tuple[TableInfo, GridCell]]] = None
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def add(self, table: TableInfo) -> None:
+        self.tables.append(table)
+        self._cells_by_paragraph = None
+
+    def top_level(self) -> List[TableInfo]:
+        """Body-level (not nested) tables, in document order."""
+        return sorted((t for t in self.tables if t.number), key=lambda t: t.number)
+
+    def cell_for_paragraph(self, ordinal: int) -> Optional[Tuple[TableInfo, GridCell]]:
+        """Innermost table and cell containing a paragraph (None outside tables)."""
+        if self._cells_by_paragraph is None:
+            mapping: Dict[int, Tuple[TableInfo, GridCell]] = {}
+            # Nested tables end (and are added) before their parent: first wins
+            for table in self.tables:
+                for cell in table.grid.cells:
+                    for paragraph in cell.paragraphs:
+                        mapping.setdefault(paragraph, (table, cell))
+            self._cells_by_paragraph = mapping
+        return self._cells_by_paragraph.get(ordinal)
+
+    @classmethod
+    def build(cls, source, keep_elements: bool = True) -> "TableIndex":
+        """Build the index with a dedicated walk over `source` (package or root)."""
+        rule = TableGridRule(keep_elements=keep_elements)
+        walk_document(source, [rule])
+        return rule.index
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "TableIndex":
+        """Return the index shared by all checks of a package."""
+        return package.derived("table_index", cls.build)
+
+
+class TableGridRule(DocumentRule):
+    """
+    Fills a TableIndex during the document walk.
+
+    Paragraph ordinals are attached to their w:tc as the paragraphs end;
+    the table itself ends after all of them, when its grid is built. Only
+    values are read inside the handlers, so the rule works in streaming
+    mode (with keep_elements=False).
+
+    Args:
+        index: Index to fill (a new one by default)
+        keep_elements: Keep w:tc elements in the grid cells (disable when
+            streaming, where elements are cleared after the walk)
+    """
+
+    def __init__(self, index: Optional[TableIndex] = None, keep_elements: bool = True):
+        self.index = index if index is not None else TableIndex()
+        self.keep_elements = keep_elements
+        self._cell_paragraphs: Dict[etree._Element, List[int]] = {}
+        self._last_body_paragraph = -1
+        self._top_level_count = 0
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        container = _container(paragraph)
+        if container is None:
+            return
+        if container.tag == W_TC:
+            self._cell_paragraphs.setdefault(container, []).append(ctx.paragraph_index)
+        elif container.tag == W_BODY:
+            self._last_body_paragraph = ctx.paragraph_index
+
+    def on_table(self, table: etree._Element, ctx: WalkContext) -> None:
+        grid = TableGrid.from_element(table, self.keep_elements, self._cell_paragraphs)
+        top_level = ctx.table_depth == 1
+        if top_level:
+            self._top_level_count += 1
+        self.index.add(TableInfo(
+            number=self._top_level_count if top_level else 0,
+            grid=grid,
+            depth=ctx.table_depth,
+            preceding_paragraph=self._last_body_paragraph if top_level else -1,
+        ))
+
+
+def _container(element: etree._Element) -> Optional[etree._Element]:
+    """Nearest ancestor that is not an sdt/customXml wrapper."""
+    parent = element.getparent()
+    while parent is not None and parent.tag in _WRAPPERS:
+        parent = parent.getparent()
+    return parent
+
+
+def table_grids(root: etree._Element) -> List[TableGrid]:
+    """Grids of the tables directly in w:body (python-docx `Document.tables` order)."""
+    body = root if root.tag == W_BODY else root.find(W_BODY)
+    if body is None:
+        return []
+    return [TableGrid.from_element(tbl) for tbl in _children(body, W_TBL)]
@@ -0,0 +1,242 @@
+"""
+Lightweight paragraph text model built from the lxml document tree.
+
+Provides what the high-level (structure, references, captions) checks used
+to read from python-docx: paragraph text, style id, heading level and table
+membership. It is filled by TextModelRule during the single document walk,
+so building it costs no extra parse of document.xml and no python-docx
+import. List paragraphs also get their computed number and label
+(ooxml_numbering.NumberingResolver), which never appear in the text.
+
+Paragraph text follows python-docx `Paragraph.text`: runs directly in the
+paragraph or in w:hyperlink, with w:tab/w:ptab as "\\t", text-wrapping
+w:br and w:cr as "\\n" and w:noBreakHyphen as "-".
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_numbering import ListItem
+from tests.helpers.ooxml_paths import W_BODY, W_R, W_T, w
+from tests.helpers.ooxml_utils import DocxPackage
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, walk_document
+
+
+# Outline levels 0..8 are headings; 9 (or absent) is body text
+BODY_OUTLINE_LEVEL = 9
+
+# Fallback when styles.xml is not available: built-in heading style ids
+_HEADING_STYLE_RE = re.compile(r"^(?:heading|заголовок)\s*(\d)$", re.IGNORECASE)
+
+W_HYPERLINK = w("hyperlink")
+W_BR = w("br")
+
+# Run content element -> text equivalent (w:t and w:br are handled separately)
+_RUN_CONTENT_TEXT = {
+    w("tab"): "\t",
+    w("ptab"): "\t",
+    w("cr"): "\n",
+    w("noBreakHyphen"): "-",
+}
+
+
+def heading_level(props: Dict) -> Optional[int]:
+    """
+    Return the 0-based heading level of a paragraph, or None for body text.
+
+    Args:
+        props: Effective (or direct) paragraph properties
+    """
+    level = props.get('outlineLvl')
+    if level is not None:
+        return level if level < BODY_OUTLINE_LEVEL else None
+    match = _HEADING_STYLE_RE.match(props.get('style') or "")
+    if match:
+        return int(match.group(1)) - 1
+    return None
+
+
+def run_text(run: etree._Element) -> str:
+    """Text of a w:r element (python-docx `Run.text` equivalent)."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(w("type"), "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            text = _RUN_CONTENT_TEXT.get(tag)
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+
+def paragraph_text(paragraph: etree._Element) -> str:
+    """Text of a w:p element (python-docx `Paragraph.text` equivalent)."""
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+@dataclass
+class TextParagraph:
+    """
+    One paragraph of the text model.
+
+    Attributes:
+        ordinal: 0-based ordinal (`.//w:p` numbering)
+        text: Paragraph text
+        style: Effective paragraph style id (None if unknown)
+        level: 0-based heading level, None for body text
+        in_table: True for paragraphs inside table cells
+        top_level: True for direct children of w:body (python-docx
+            `Document.paragraphs`)
+        list_item: Computed list numbering (None if not a list paragraph)
+    """
+    ordinal: int
+    text: str
+    style: Optional[str]
+    level: Optional[int]
+    in_table: bool
+    top_level: bool
+    list_item: Optional[ListItem] = None
+
+    @property
+    def is_heading(self) -> bool:
+        return self.level is not None
+
+    @property
+    def is_numbered(self) -> bool:
+        """True for paragraphs of a numbered (not bulleted) list."""
+        return self.list_item is not None and not self.list_item.is_bullet
+
+    @property
+    def labeled_text(self) -> str:
+        """Text as displayed, with the list label ("1.", "А") prepended."""
+        if self.list_item is not None and self.list_item.label:
+            return f"{self.list_item.label} {self.text}"
+        return self.text
+
+
+class TextModel:
+    """
+    Paragraphs of a document in document order.
+
+    Usage:
+        model = TextModel.for_package(package)
+        for paragraph in model.body_paragraphs():
+            print(paragraph.text)
+    """
+
+    def __init__(self):
+        self.paragraphs: List[TextParagraph] = []
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self.paragraphs)
+
+    def add(self, paragraph: TextParagraph) -> None:
+        """Record one paragraph (called by TextModelRule)."""
+        if self.paragraphs and paragraph.ordinal < self.paragraphs[-1].ordinal:
+            # Paragraphs nested in text boxes end before their container
+            self._sorted = False
+        self.paragraphs.append(paragraph)
+
+    def _ensure_sorted(self) -> None:
+        if not self._sorted:
+            self.paragraphs.sort(key=lambda p: p.ordinal)
+            self._sorted = True
+
+    def get(self, ordinal: int) -> Optional[TextParagraph]:
+        """Paragraph by ordinal (None if unknown)."""
+        self._ensure_sorted()
+        if 0 <= ordinal < len(self.paragraphs) and self.paragraphs[ordinal].ordinal == ordinal:
+            return self.paragraphs[ordinal]
+        for paragraph in self.paragraphs:
+            if paragraph.ordinal == ordinal:
+                return paragraph
+        return None
+
+    def body_paragraphs(self) -> List[TextParagraph]:
+        """Paragraphs that are direct children of w:body (no tables, text boxes)."""
+        self._ensure_sorted()
+        return [p for p in self.paragraphs if p.top_level]
+
+    def headings(self) -> List[TextParagraph]:
+        """Heading paragraphs in document order."""
+        self._ensure_sorted()
+        return [p for p in self.paragraphs if p.level is not None]
+
+    def text(self, labels: bool = False) -> str:
+        """
+        Joined text of body paragraphs (python-docx `_extract_all_text` equivalent).
+
+        Args:
+            labels: Prepend list labels, as Word displays them
+        """
+        if labels:
+            return "\n".join(p.labeled_text for p in self.body_paragraphs())
+        return "\n".join(p.text for p in self.body_paragraphs())
+
+    @classmethod
+    def build(cls, source, styles=None, numbering=None) -> "TextModel":
+        """Build a model with a dedicated walk over `source` (package or root)."""
+        rule = TextModelRule(styles, numbering=numbering)
+        walk_document(source, [rule])
+        return rule.model
+
+    @classmethod
+    def for_package(cls, package: DocxPackage) -> "TextModel":
+        """Return the model shared by all checks of a package."""
+        from tests.helpers.ooxml_numbering import NumberingResolver
+        from tests.helpers.ooxml_styles import StyleResolver
+
+        return package.derived(
+            "text_model",
+            lambda pkg: cls.build(
+                pkg, StyleResolver.for_package(pkg), NumberingResolver.from_package(pkg)
+            ),
+        )
+
+
+class TextModelRule(DocumentRule):
+    """
+    Fills a TextModel during the document walk.
+
+    Args:
+        styles: StyleResolver used for style ids and heading levels
+            (direct formatting only when omitted)
+        model: Model to fill (a new one by default)
+        numbering: NumberingResolver for list numbers (requires `styles`,
+            since numbering is usually inherited from the paragraph style)
+    """
+
+    def __init__(self, styles=None, model: Optional[TextModel] = None, numbering=None):
+        self.styles = styles
+        self.model = model if model is not None else TextModel()
+        self.numbering = numbering
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        if self.styles is not None:
+            props = self.styles.paragraph_properties(paragraph)
+        else:
+            from tests.helpers.ooxml_utils import get_paragraph_properties
+            props = get_paragraph_properties(paragraph)
+        parent = paragraph.getparent()
+        self.model.add(TextParagraph(
+            ordinal=ctx.paragraph_index,
+            text=paragraph_text(paragraph),
+            style=props.get('style'),
+            level=heading_level(props),
+            in_table=ctx.in_table,
+            top_level=parent is not None and parent.tag == W_BODY,
+            list_item=self.numbering.item_for(props) if self.numbering is not None else None,
+        ))
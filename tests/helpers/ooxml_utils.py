@@ -2,22 +2,59 @@
 Utilities for working with OOXML (Office Open XML) documents.
 
 Provides functions for:
-- Loading XML from .docx files
+- Opening a .docx once and parsing its XML parts lazily (DocxPackage)
+- Guarding against hostile archives (zip bombs, oversized parts, entities)
 - Converting units (twips ↔ mm, pt ↔ half-points)
 - Extracting formatting properties (margins, spacing, indents)
 """
+import hashlib
+import io
+import os
+import posixpath
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List, Union
 from lxml import etree
 
 
-# OOXML namespaces
-NS = {
-    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-    "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
-}
+# OOXML namespaces and precompiled queries live in ooxml_paths;
+# NS is re-exported here for existing imports.
+from tests.helpers.ooxml_paths import (
+    NS,
+    W_B,
+    W_I,
+    W_IND,
+    W_JC,
+    W_ILVL,
+    W_NUM_ID,
+    W_NUM_PR,
+    W_OUTLINE_LVL,
+    W_ORIENT,
+    W_PGMAR,
+    W_PGSZ,
+    W_PPR,
+    W_PSTYLE,
+    W_RFONTS,
+    W_RPR,
+    W_RSTYLE,
+    W_SPACING,
+    W_SZ,
+    W_H,
+    W_VAL,
+    W_W,
+    IND_ATTRS,
+    MARGIN_ATTRS,
+    RFONTS_ATTRS,
+    RFONTS_THEME_ATTRS,
+    SPACING_ATTRS,
+    XP_PARAGRAPHS,
+    XP_SECT_PRS,
+    XP_TEXT,
+    property_child,
+)
 
 
 # Unit conversions
@@ -60,70 +97,508 @@ def half_points_to_pt(half_points: int) -> float:
     return half_points / 2
 
 
-def load_xml(docx_path: Path, xml_path: str) -> etree._Element:
+# Relationship type URIs used to locate related parts
+REL_TYPES = {
+    "header": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header",
+    "footer": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer",
+    "styles": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles",
+    "numbering": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering",
+    "image": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image",
+    "theme": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme",
+    "footnotes": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/footnotes",
+    "endnotes": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/endnotes",
+}
+
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+class PackageLimitError(ValueError):
+    """The archive exceeds PackageLimits (zip bomb, oversized or damaged document)."""
+
+
+@dataclass(frozen=True)
+class PackageLimits:
+    """
+    Resource limits for untrusted .docx uploads.
+
+    Sizes are checked against the ZIP central directory before anything is
+    decompressed; `zipfile` never inflates a member beyond its declared
+    size, so the declared sizes bound the real work.
+
+    Attributes:
+        max_archive_size: Size of the .docx file on disk
+        max_part_size: Uncompressed size of a single part
+        max_total_size: Uncompressed size of all parts together
+        max_ratio: Compression ratio of a single part (file_size / compress_size)
+        ratio_min_size: Parts smaller than this are exempt from the ratio check
+        max_parts: Number of archive members
+    """
+    max_archive_size: int = 200 * 1024 * 1024
+    max_part_size: int = 256 * 1024 * 1024
+    max_total_size: int = 512 * 1024 * 1024
+    max_ratio: float = 200.0
+    ratio_min_size: int = 1024 * 1024
+    max_parts: int = 10000
+
+
+DEFAULT_LIMITS = PackageLimits()
+
+
+def check_archive(archive: zipfile.ZipFile, limits: PackageLimits = DEFAULT_LIMITS) -> None:
+    """
+    Validate the central directory of an archive against `limits`.
+
+    Raises:
+        PackageLimitError: With a message suitable for the normocontrol report
+    """
+    infos = archive.infolist()
+    if len(infos) > limits.max_parts:
+        raise PackageLimitError(
+            f"Архив содержит слишком много файлов: {len(infos)} (допустимо {limits.max_parts})"
+        )
+    total = 0
+    for info in infos:
+        if info.file_size > limits.max_part_size:
+            raise PackageLimitError(
+                f"Слишком большой файл в архиве: {info.filename} "
+                f"({info.file_size // (1024 * 1024)} МБ после распаковки, "
+                f"допустимо {limits.max_part_size // (1024 * 1024)} МБ)"
+            )
+        if (
+            info.file_size >= limits.ratio_min_size
+            and info.file_size > limits.max_ratio * max(info.compress_size, 1)
+        ):
+            raise PackageLimitError(
+                f"Подозрительная степень сжатия файла {info.filename}: "
+                f"{info.file_size / max(info.compress_size, 1):.0f}:1 "
+                f"(допустимо {limits.max_ratio:.0f}:1)"
+            )
+        total += info.file_size
+    if total > limits.max_total_size:
+        raise PackageLimitError(
+            f"Слишком большой объём после распаковки: {total // (1024 * 1024)} МБ "
+            f"(допустимо {limits.max_total_size // (1024 * 1024)} МБ)"
+        )
+
+
+# Parser options for untrusted parts: no DTD loading, no entity expansion,
+# no network access; huge_tree=False keeps libxml2's limits on tree depth
+# and text node size.
+XML_PARSER_OPTIONS = dict(
+    resolve_entities=False,
+    load_dtd=False,
+    no_network=True,
+    huge_tree=False,
+)
+
+_parser_local = threading.local()
+
+
+def xml_parser() -> etree.XMLParser:
+    """
+    Return the hardened XML parser of the calling thread.
+
+    lxml parser objects must not be shared between threads, so each thread
+    gets its own instance configured with XML_PARSER_OPTIONS.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(**XML_PARSER_OPTIONS)
+    return parser
+
+
+def parse_xml(data: bytes) -> etree._Element:
+    """Parse untrusted XML bytes with the hardened parser."""
+    return etree.fromstring(data, parser=xml_parser())
+
+
+# Threads used by DocxPackage.preload (parts of one document are few;
+# on a single CPU parts are parsed sequentially)
+PRELOAD_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class DocxPackage:
+    """
+    A .docx archive that is opened once and parsed lazily.
+
+    The file is read from disk a single time. Each XML part is parsed on
+    first access and kept in memory, so every helper and check working
+    with the same package shares one parsed tree per part.
+
+    Usage:
+        with DocxPackage(docx_path) as package:
+            margins = get_page_margins(package)
     """
-    Load and parse an XML file from a .docx archive.
+
+    def __init__(self, docx_path: Path, limits: PackageLimits = DEFAULT_LIMITS):
+        self.path = Path(docx_path)
+        self.limits = limits
+        size = self.path.stat().st_size
+        if size > limits.max_archive_size:
+            raise PackageLimitError(
+                f"Слишком большой файл документа: {size // (1024 * 1024)} МБ "
+                f"(допустимо {limits.max_archive_size // (1024 * 1024)} МБ)"
+            )
+        self._data = self.path.read_bytes()
+        try:
+            self._zip = zipfile.ZipFile(io.BytesIO(self._data), 'r')
+        except zipfile.BadZipFile as exc:
+            raise PackageLimitError(f"Файл не является корректным .docx (ZIP): {exc}") from exc
+        check_archive(self._zip, limits)
+        self._names = set(self._zip.namelist())
+        self._parts: Dict[str, etree._Element] = {}
+        self._rels: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._derived: Dict[str, Any] = {}
+        self._python_docx = None
+        self._content_hash: Optional[str] = None
+        self._part_hashes: Dict[str, str] = {}
+
+    def __enter__(self) -> "DocxPackage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the archive and all cached parts."""
+        self._zip.close()
+        self._parts.clear()
+        self._rels.clear()
+        self._derived.clear()
+        self._part_hashes.clear()
+        self._python_docx = None
+
+    @property
+    def name(self) -> str:
+        """File name of the document (used as the report key)."""
+        return self.path.name
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the archive bytes (hex), computed once."""
+        if self._content_hash is None:
+            self._content_hash = hashlib.sha256(self._data).hexdigest()
+        return self._content_hash
+
+    def namelist(self) -> List[str]:
+        """Names of all parts stored in the archive."""
+        return self._zip.namelist()
+
+    def has_part(self, part_name: str) -> bool:
+        """Check whether a part exists in the archive."""
+        return part_name in self._names
+
+    def part_info(self, part_name: str) -> zipfile.ZipInfo:
+        """
+        Return the ZIP directory entry of a part (sizes, CRC) without
+        decompressing anything.
+
+        Raises:
+            KeyError: If the part does not exist
+        """
+        return self._zip.getinfo(part_name)
+
+    def part_hash(self, part_name: str) -> str:
+        """
+        SHA-256 (hex) of the content of a part, computed once ("-" if the
+        part does not exist).
+
+        XML parts are identified by their decompressed bytes only, so
+        re-zipping the archive keeps their hashes; they are hashed in chunks
+        from `open_part`, never held in memory whole. Binary parts (images)
+        are identified by their ZIP directory entry (CRC-32, size and the
+        stored size, which the checks report) without decompressing them.
+        """
+        digest = self._part_hashes.get(part_name)
+        if digest is None:
+            if part_name not in self._names:
+                digest = "-"
+            elif part_name.endswith((".xml", ".rels")):
+                with self.open_part(part_name) as stream:
+                    digest = hashlib.file_digest(stream, "sha256").hexdigest()
+            else:
+                info = self.part_info(part_name)
+                entry = f"binary:{info.CRC:08x}:{info.file_size}:{info.compress_size}"
+                digest = hashlib.sha256(entry.encode("ascii")).hexdigest()
+            self._part_hashes[part_name] = digest
+        return digest
+
+    def read_bytes(self, part_name: str) -> bytes:
+        """
+        Return raw (decompressed) bytes of a part.
+
+        Raises:
+            KeyError: If the part does not exist
+        """
+        return self._zip.read(part_name)
+
+    def open_part(self, part_name: str):
+        """
+        Open a part as a binary stream that decompresses on the fly.
+
+        Use this instead of `part()` when the part should be parsed
+        incrementally (e.g. with `etree.iterparse`) and never fully loaded.
+
+        Raises:
+            KeyError: If the part does not exist
+        """
+        return self._zip.open(part_name, 'r')
+
+    def part(self, part_name: str) -> etree._Element:
+        """
+        Return the parsed root element of a part, parsing it on first use.
+
+        Raises:
+            KeyError: If the part does not exist
+            PackageLimitError: If the part is not well-formed or exceeds the
+                parser limits (nesting depth, text node size)
+        """
+        root = self._parts.get(part_name)
+        if root is None:
+            root = self._parts[part_name] = self._parse_part(part_name)
+        return root
+
+    def _parse_part(self, part_name: str) -> etree._Element:
+        """Decompress and parse a part (thread-safe, does not touch the cache)."""
+        try:
+            return parse_xml(self.read_bytes(part_name))
+        except etree.XMLSyntaxError as exc:
+            raise PackageLimitError(f"Не удалось разобрать {part_name}: {exc}") from exc
+
+    def preload(self, part_names: Iterable[str], max_workers: int = PRELOAD_WORKERS) -> None:
+        """
+        Decompress and parse several independent parts concurrently.
+
+        zlib and lxml release the GIL while inflating and parsing, so parts
+        such as document.xml, styles.xml, numbering.xml and the headers are
+        loaded on a small thread pool in roughly the time of the largest
+        one. Missing and already parsed parts are skipped; afterwards the
+        parts are served from the cache as usual.
+
+        Raises:
+            PackageLimitError: If any of the parts cannot be parsed
+        """
+        pending = [
+            name for name in dict.fromkeys(part_names)
+            if name in self._names and name not in self._parts
+        ]
+        if len(pending) < 2 or max_workers < 2:
+            for name in pending:
+                self.part(name)
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            for name, root in zip(pending, pool.map(self._parse_part, pending)):
+                self._parts[name] = root
+
+    def get_part(self, part_name: str) -> Optional[etree._Element]:
+        """Return the parsed part, or None if the archive does not contain it."""
+        if part_name not in self._names:
+            return None
+        return self.part(part_name)
+
+    @property
+    def document_xml(self) -> etree._Element:
+        """Root of word/document.xml."""
+        return self.part("word/document.xml")
+
+    @property
+    def styles_xml(self) -> Optional[etree._Element]:
+        """Root of word/styles.xml (None if absent)."""
+        return self.get_part("word/styles.xml")
+
+    @property
+    def numbering_xml(self) -> Optional[etree._Element]:
+        """Root of word/numbering.xml (None if absent)."""
+        return self.get_part("word/numbering.xml")
+
+    def relationships(self, part_name: str = "word/document.xml") -> Dict[str, Dict[str, str]]:
+        """
+        Return relationships of a part, keyed by rId.
+
+        Each value has keys 'type', 'target' (archive part name, or the raw
+        URL for external targets) and 'mode' ('Internal' or 'External').
+        """
+        rels = self._rels.get(part_name)
+        if rels is not None:
+            return rels
+
+        folder, base = posixpath.split(part_name)
+        rels_name = posixpath.join(folder, "_rels", base + ".rels")
+        rels = {}
+        root = self.get_part(rels_name)
+        if root is not None:
+            for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+                mode = rel.get("TargetMode", "Internal")
+                target = rel.get("Target", "")
+                if mode != "External":
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join(folder, target))
+                rels[rel.get("Id")] = {
+                    'type': rel.get("Type", ""),
+                    'target': target,
+                    'mode': mode,
+                }
+        self._rels[part_name] = rels
+        return rels
+
+    def related_part(self, rel_type: str, part_name: str = "word/document.xml") -> Optional[str]:
+        """
+        Return the archive name of the first part related to `part_name` by
+        `rel_type` (a key of REL_TYPES or a full relationship type URI).
+        """
+        type_uri = REL_TYPES.get(rel_type, rel_type)
+        for rel in self.relationships(part_name).values():
+            if rel['type'] == type_uri and rel['mode'] != "External":
+                return rel['target']
+        return None
+
+    def derived(self, key: str, factory: Callable[["DocxPackage"], Any]) -> Any:
+        """
+        Return a view derived from this package, building it on first use.
+
+        Lets helpers share expensive derived structures (style resolver,
+        indexes, ...) between all checks of one document.
+        """
+        if key not in self._derived:
+            self._derived[key] = factory(self)
+        return self._derived[key]
+
+    def get_derived(self, key: str, default: Any = None) -> Any:
+        """Return a derived view if it has been built already, else `default`."""
+        return self._derived.get(key, default)
+
+    def header_parts(self) -> List[str]:
+        """Names of header parts (word/header*.xml) in archive order."""
+        return [
+            name for name in self.namelist()
+            if name.startswith("word/header") and name.endswith(".xml")
+        ]
+
+    def python_docx(self):
+        """
+        Return a python-docx Document built from the already loaded bytes.
+
+        The document is created once per package and does not touch the disk.
+        """
+        if self._python_docx is None:
+            from docx import Document
+            self._python_docx = Document(io.BytesIO(self._data))
+        return self._python_docx
+
+
+PackageSource = Union[DocxPackage, Path, str]
+
+
+def open_package(source: PackageSource) -> DocxPackage:
+    """Return `source` if it already is a DocxPackage, otherwise open it."""
+    if isinstance(source, DocxPackage):
+        return source
+    return DocxPackage(Path(source))
+
+
+def load_xml(source: PackageSource, xml_path: str) -> etree._Element:
+    """
+    Load and parse an XML part from a .docx archive.
     
     Args:
-        docx_path: Path to the .docx file
+        source: Opened DocxPackage (preferred) or path to the .docx file
         xml_path: Internal path to XML file (e.g., "word/document.xml")
     
     Returns:
-        Parsed XML element tree
+        Parsed XML element tree (cached when a DocxPackage is passed)
     """
-    with zipfile.ZipFile(docx_path, 'r') as z:
-        xml_content = z.read(xml_path)
-    return etree.fromstring(xml_content)
+    if isinstance(source, DocxPackage):
+        return source.part(xml_path)
+    with open_package(source) as package:
+        return package.part(xml_path)
 
 
-def get_document_xml(docx_path: Path) -> etree._Element:
+def get_document_xml(source: PackageSource) -> etree._Element:
     """Load the main document XML."""
-    return load_xml(docx_path, "word/document.xml")
+    return load_xml(source, "word/document.xml")
 
 
-def get_styles_xml(docx_path: Path) -> Optional[etree._Element]:
+def get_styles_xml(source: PackageSource) -> Optional[etree._Element]:
     """Load the styles XML (if it exists)."""
     try:
-        return load_xml(docx_path, "word/styles.xml")
+        return load_xml(source, "word/styles.xml")
     except KeyError:
         return None
 
 
-def get_section_properties(doc_xml: etree._Element) -> Optional[etree._Element]:
+def _document_root(source: Union[DocxPackage, etree._Element]) -> etree._Element:
+    """Accept either a DocxPackage or an already parsed document root."""
+    if isinstance(source, DocxPackage):
+        return source.document_xml
+    return source
+
+
+def get_section_properties(doc_xml: Union[DocxPackage, etree._Element]) -> Optional[etree._Element]:
     """
     Get the last section properties (w:sectPr) from document.
     The last sectPr typically contains the main page setup.
     """
-    sect_prs = doc_xml.xpath(".//w:sectPr", namespaces=NS)
+    sect_prs = XP_SECT_PRS(_document_root(doc_xml))
     return sect_prs[-1] if sect_prs else None
 
 
-def get_page_margins(doc_xml: etree._Element) -> Optional[Dict[str, int]]:
+def get_sect_pr_margins(sect_pr: etree._Element) -> Optional[Dict[str, int]]:
     """
-    Get page margins from document in twips.
+    Get page margins (in twips) of a single w:sectPr element.
     
     Returns:
         Dict with keys: 'top', 'bottom', 'left', 'right', 'header', 'footer', 'gutter'
-        Values are in twips. Returns None if not found.
+        Values are in twips. Returns None if w:pgMar is absent.
     """
-    sect_pr = get_section_properties(doc_xml)
-    if sect_pr is None:
-        return None
-    
-    pg_mar = sect_pr.find("w:pgMar", namespaces=NS)
+    pg_mar = sect_pr.find(W_PGMAR)
     if pg_mar is None:
         return None
     
     margins = {}
-    for attr in ['top', 'bottom', 'left', 'right', 'header', 'footer', 'gutter']:
-        value = pg_mar.get(f"{{{NS['w']}}}{attr}")
+    for attr, clark_name in MARGIN_ATTRS:
+        value = pg_mar.get(clark_name)
         if value:
             margins[attr] = int(value)
     
     return margins
 
 
-def get_page_size(doc_xml: etree._Element) -> Optional[Dict[str, Any]]:
+def get_sect_pr_page_size(sect_pr: etree._Element) -> Optional[Dict[str, Any]]:
+    """
+    Get page size of a single w:sectPr element.
+    
+    Returns:
+        Dict with keys: 'width', 'height' (in twips), 'orient' (portrait/landscape),
+        or None if w:pgSz is absent.
+    """
+    pg_sz = sect_pr.find(W_PGSZ)
+    if pg_sz is None:
+        return None
+    
+    return {
+        'width': int(pg_sz.get(W_W, 0)),
+        'height': int(pg_sz.get(W_H, 0)),
+        'orient': pg_sz.get(W_ORIENT, 'portrait'),
+    }
+
+
+def get_page_margins(doc_xml: Union[DocxPackage, etree._Element]) -> Optional[Dict[str, int]]:
+    """
+    Get page margins from document in twips.
+    
+    Returns:
+        Dict with keys: 'top', 'bottom', 'left', 'right', 'header', 'footer', 'gutter'
+        Values are in twips. Returns None if not found.
+    """
+    sect_pr = get_section_properties(doc_xml)
+    if sect_pr is None:
+        return None
+    return get_sect_pr_margins(sect_pr)
+
+
+def get_page_size(doc_xml: Union[DocxPackage, etree._Element]) -> Optional[Dict[str, Any]]:
     """
     Get page size from document.
     
@@ -133,16 +608,40 @@ def get_page_size(doc_xml: etree._Element) -> Optional[Dict[str, Any]]:
     sect_pr = get_section_properties(doc_xml)
     if sect_pr is None:
         return None
+    return get_sect_pr_page_size(sect_pr)
+
+
+def paragraph_properties_from_ppr(p_pr: etree._Element) -> Dict[str, Any]:
+    """
+    Extract formatting properties from a w:pPr element.
     
-    pg_sz = sect_pr.find("w:pgSz", namespaces=NS)
-    if pg_sz is None:
-        return None
+    Shared by direct paragraph formatting and style definitions
+    (see get_paragraph_properties for the returned keys).
+    """
+    props = {}
     
-    return {
-        'width': int(pg_sz.get(f"{{{NS['w']}}}w", 0)),
-        'height': int(pg_sz.get(f"{{{NS['w']}}}h", 0)),
-        'orient': pg_sz.get(f"{{{NS['w']}}}orient", 'portrait'),
-    }
+    # A single pass over the children instead of one find() per property
+    for child in p_pr:
+        tag = child.tag
+        if tag == W_SPACING:
+            props['spacing'] = {attr: child.get(clark_name) for attr, clark_name in SPACING_ATTRS}
+        elif tag == W_IND:
+            props['ind'] = {attr: child.get(clark_name) for attr, clark_name in IND_ATTRS}
+        elif tag == W_JC:
+            props['jc'] = child.get(W_VAL)
+        elif tag == W_PSTYLE:
+            props['style'] = child.get(W_VAL)
+        elif tag == W_OUTLINE_LVL:
+            props['outlineLvl'] = int(child.get(W_VAL, 9))
+        elif tag == W_NUM_PR:
+            num_id = child.find(W_NUM_ID)
+            ilvl = child.find(W_ILVL)
+            props['numPr'] = {
+                'numId': num_id.get(W_VAL) if num_id is not None else None,
+                'ilvl': ilvl.get(W_VAL) if ilvl is not None else None,
+            }
+    
+    return props
 
 
 def get_paragraph_properties(paragraph: etree._Element) -> Dict[str, Any]:
@@ -154,42 +653,57 @@ def get_paragraph_properties(paragraph: etree._Element) -> Dict[str, Any]:
     - 'ind': indentation info
     - 'jc': justification/alignment
     - 'style': style name
+    - 'outlineLvl': outline level (0 = top-level heading)
+    - 'numPr': list numbering reference {'numId', 'ilvl'} (strings)
     """
-    props = {}
-    
-    p_pr = paragraph.find("w:pPr", namespaces=NS)
+    p_pr = property_child(paragraph, W_PPR)
     if p_pr is None:
-        return props
-    
-    # Spacing
-    spacing = p_pr.find("w:spacing", namespaces=NS)
-    if spacing is not None:
-        props['spacing'] = {
-            'line': spacing.get(f"{{{NS['w']}}}line"),
-            'lineRule': spacing.get(f"{{{NS['w']}}}lineRule"),
-            'before': spacing.get(f"{{{NS['w']}}}before"),
-            'after': spacing.get(f"{{{NS['w']}}}after"),
-        }
+        return {}
+    return paragraph_properties_from_ppr(p_pr)
+
+
+def _is_on(element: etree._Element) -> bool:
+    """Evaluate an OOXML on/off property (<w:b/>, <w:b w:val="0"/>, ...)."""
+    return element.get(W_VAL, "true") not in ("0", "false", "off")
+
+
+def run_properties_from_rpr(r_pr: etree._Element,
+                            theme_fonts: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Extract formatting properties from a w:rPr element.
     
-    # Indentation
-    ind = p_pr.find("w:ind", namespaces=NS)
-    if ind is not None:
-        props['ind'] = {
-            'left': ind.get(f"{{{NS['w']}}}left"),
-            'right': ind.get(f"{{{NS['w']}}}right"),
-            'firstLine': ind.get(f"{{{NS['w']}}}firstLine"),
-            'hanging': ind.get(f"{{{NS['w']}}}hanging"),
-        }
+    Shared by direct run formatting and style definitions
+    (see get_run_properties for the returned keys).
     
-    # Justification/Alignment
-    jc = p_pr.find("w:jc", namespaces=NS)
-    if jc is not None:
-        props['jc'] = jc.get(f"{{{NS['w']}}}val")
+    Args:
+        r_pr: w:rPr element
+        theme_fonts: Optional mapping of theme font references
+            (e.g. 'minorHAnsi') to typefaces; when given, theme references in
+            w:rFonts are resolved to real font names.
+    """
+    props = {}
     
-    # Style
-    style = p_pr.find("w:pStyle", namespaces=NS)
-    if style is not None:
-        props['style'] = style.get(f"{{{NS['w']}}}val")
+    # A single pass over the children instead of one find() per property
+    for child in r_pr:
+        tag = child.tag
+        if tag == W_SZ:
+            props['sz'] = int(child.get(W_VAL))
+        elif tag == W_RFONTS:
+            fonts = {}
+            for key, clark_name in RFONTS_ATTRS:
+                name = child.get(clark_name)
+                if theme_fonts:
+                    theme_ref = child.get(RFONTS_THEME_ATTRS[key])
+                    if theme_ref and theme_ref in theme_fonts:
+                        name = theme_fonts[theme_ref]
+                fonts[key] = name
+            props['rFonts'] = fonts
+        elif tag == W_B:
+            props['b'] = _is_on(child)
+        elif tag == W_I:
+            props['i'] = _is_on(child)
+        elif tag == W_RSTYLE:
+            props['style'] = child.get(W_VAL)
     
     return props
 
@@ -203,41 +717,18 @@ def get_run_properties(run: etree._Element) -> Dict[str, Any]:
     - 'rFonts': font names
     - 'b': bold
     - 'i': italic
-    """
-    props = {}
+    - 'style': character style id
     
-    r_pr = run.find("w:rPr", namespaces=NS)
+    Only direct formatting is returned; use tests.helpers.ooxml_styles
+    for effective (style-inherited) properties.
+    """
+    r_pr = property_child(run, W_RPR)
     if r_pr is None:
-        return props
-    
-    # Font size
-    sz = r_pr.find("w:sz", namespaces=NS)
-    if sz is not None:
-        props['sz'] = int(sz.get(f"{{{NS['w']}}}val"))
-    
-    # Font names
-    r_fonts = r_pr.find("w:rFonts", namespaces=NS)
-    if r_fonts is not None:
-        props['rFonts'] = {
-            'ascii': r_fonts.get(f"{{{NS['w']}}}ascii"),
-            'hAnsi': r_fonts.get(f"{{{NS['w']}}}hAnsi"),
-            'cs': r_fonts.get(f"{{{NS['w']}}}cs"),
-        }
-    
-    # Bold
-    b = r_pr.find("w:b", namespaces=NS)
-    if b is not None:
-        props['b'] = True
-    
-    # Italic
-    i = r_pr.find("w:i", namespaces=NS)
-    if i is not None:
-        props['i'] = True
-    
-    return props
+        return {}
+    return run_properties_from_rpr(r_pr)
 
 
-def check_margins(doc_xml: etree._Element, 
+def check_margins(doc_xml: Union[DocxPackage, etree._Element],
                  left_mm: float = 30,
                  right_mm: float = 10,
                  top_mm: float = 20,
@@ -247,7 +738,7 @@ def check_margins(doc_xml: etree._Element,
     Check if document margins match expected values (within tolerance).
     
     Args:
-        doc_xml: Document XML element
+        doc_xml: DocxPackage or document XML element
         left_mm, right_mm, top_mm, bottom_mm: Expected margins in mm
         tolerance_mm: Allowed deviation in mm
     
@@ -276,38 +767,52 @@ def check_margins(doc_xml: etree._Element,
     return True
 
 
-def find_paragraph_index(doc_xml: etree._Element, paragraph: etree._Element) -> int:
+def find_paragraph_index(doc_xml: Union[DocxPackage, etree._Element], paragraph: etree._Element) -> int:
     """
     Find the index of a paragraph in the document.
     
     Args:
-        doc_xml: Document XML root
+        doc_xml: DocxPackage or document XML root
         paragraph: Paragraph element to find
         
     Returns:
         0-based index, or -1 if not found
+    
+    With a DocxPackage the lookup uses the shared ParagraphIndex (built once
+    per document, O(1) per call afterwards).
     """
-    all_paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
+    if isinstance(doc_xml, DocxPackage):
+        from tests.helpers.ooxml_index import ParagraphIndex
+        return ParagraphIndex.for_package(doc_xml).ordinal(paragraph)
+    
+    all_paragraphs = XP_PARAGRAPHS(doc_xml)
     try:
         return all_paragraphs.index(paragraph)
     except ValueError:
         return -1
 
 
-def find_nearby_heading(doc_xml: etree._Element, paragraph_index: int) -> str:
+def find_nearby_heading(doc_xml: Union[DocxPackage, etree._Element], paragraph_index: int) -> str:
     """
     Find the nearest heading before the given paragraph.
     
     Args:
-        doc_xml: Document XML root
+        doc_xml: DocxPackage or document XML root
         paragraph_index: Index of the paragraph
         
     Returns:
         Heading text or empty string
+    
+    Headings are detected by outline level (heading styles resolved through
+    styles.xml when a DocxPackage is passed).
     """
-    from docx import Document
-    # This is a simplified version - would need document path
-    return ""
+    from tests.helpers.ooxml_index import ParagraphIndex
+    
+    if isinstance(doc_xml, DocxPackage):
+        index = ParagraphIndex.for_package(doc_xml)
+    else:
+        index = ParagraphIndex.build(doc_xml)
+    return index.heading(paragraph_index)
 
 
 def get_paragraph_text_preview(paragraph: etree._Element, max_length: int = 50) -> str:
@@ -321,8 +826,12 @@ def get_paragraph_text_preview(paragraph: etree._Element, max_length: int = 50)
     Returns:
         Text preview
     """
-    text_nodes = paragraph.xpath(".//w:t/text()", namespaces=NS)
-    text = "".join(text_nodes).strip()
+    return text_preview("".join(XP_TEXT(paragraph)), max_length)
+
+
+def text_preview(text: str, max_length: int = 50) -> str:
+    """Shorten paragraph text for issue locations."""
+    text = text.strip()
     if len(text) > max_length:
         return text[:max_length] + "..."
     return text if text else "(пустой параграф)"
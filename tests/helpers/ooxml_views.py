@@ -0,0 +1,495 @@
+"""
+Declared data dependencies of document checks.
+
+A check should not parse XML or walk the document itself: it declares the
+derived views it reads ("text_model", "sections", "formatting_table", ...)
+and DocumentViews builds exactly those views, once per document:
+
+- views collected from document.xml share ONE walk (their collectors are
+  DocumentRules registered in dependency order);
+- views computed from other parts (styles, numbering, headers, media)
+  are built without a walk, and only the parts they need are preloaded;
+- views already known (restored from the IR cache, or built by an earlier
+  check of the same package) are not built again, and neither are the
+  views they need (the styles and numbering behind a restored text model).
+
+RuleRegistry keeps named checks with their declared views; a profile that
+enables some checks only pays for the views those checks need. The views
+also declare the package parts they read, so every check has an input
+signature (`RuleRegistry.signature`: hashes of those parts) and its
+findings can be reused for a new version of a document in which none of
+its parts changed.
+
+Usage:
+    rules = RuleRegistry()
+
+    @rules.register("captions", needs=("text_model",))
+    def check_captions(views, report):
+        for paragraph in views["text_model"].body_paragraphs():
+            ...
+
+    views = DocumentViews(package).build(rules.needs(enabled))
+    for rule in rules.select(enabled):
+        rule.run(views, report)
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from tests.helpers.ooxml_utils import DocxPackage
+from tests.helpers.ooxml_walker import DocumentRule, WalkContext, stream_document, walk_document
+
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+
+
+@dataclass(frozen=True)
+class ViewSpec:
+    """
+    How to build one derived view.
+
+    Attributes:
+        name: View name (the DocxPackage.derived key for shared views)
+        build: Non-walk views: `build(views) -> value`. Walk views:
+            `build(views) -> (collector, result)`, where `collector` is a
+            DocumentRule for the shared walk and `result(ctx) -> value` is
+            called after the walk
+        walk: True if the view is collected from the document walk
+        needs: Views that must be built first (available as views[name])
+        uses: Views reused when they are built in the same run (ordering
+            only; `views.collector(name)` returns their collector)
+        parts: Parts to preload for the view: `parts(package) -> names`
+        reads: Other parts the view reads, not worth preloading
+            (relationships, theme, media): `reads(package) -> names`.
+            Walk views read word/document.xml implicitly
+        shared: Seed the value into `package.derived(name)`, so the
+            for_package() helpers return it
+    """
+    name: str
+    build: Callable
+    walk: bool = False
+    needs: Tuple[str, ...] = ()
+    uses: Tuple[str, ...] = ()
+    parts: Optional[Callable[[DocxPackage], Iterable[str]]] = None
+    reads: Optional[Callable[[DocxPackage], Iterable[str]]] = None
+    shared: bool = True
+
+
+class ViewRegistry:
+    """Named ViewSpecs (VIEWS holds the standard ones)."""
+
+    def __init__(self, specs: Iterable[ViewSpec] = ()):
+        self.specs: Dict[str, ViewSpec] = {}
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec: ViewSpec) -> ViewSpec:
+        self.specs[spec.name] = spec
+        return spec
+
+    def __getitem__(self, name: str) -> ViewSpec:
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown view: {name!r}") from None
+
+    def closure(self, names: Iterable[str], known: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """
+        `names` with all their `needs`, dependencies first.
+
+        Args:
+            known: Predicate of views whose value is available: their
+                `needs` are not followed
+        """
+        selected = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                if known is None or not known(name):
+                    stack.extend(self[name].needs)
+
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Cyclic view dependency: {name!r}")
+            visiting.add(name)
+            spec = self[name]
+            # Soft `uses` (and the needs of known views) only order views that are built anyway
+            for dependency in spec.needs + spec.uses:
+                if dependency in selected:
+                    visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in sorted(selected, key=list(self.specs).index):
+            visit(name)
+        return order
+
+    def inputs(self, names: Iterable[str], package: DocxPackage) -> List[str]:
+        """Parts read by the views in `names` and their dependencies, sorted."""
+        parts = set()
+        for name in self.closure(names):
+            spec = self[name]
+            if spec.walk:
+                parts.add(DOCUMENT_PART)
+            for source in (spec.parts, spec.reads):
+                if source is not None:
+                    parts.update(source(package))
+        return sorted(parts)
+
+
+class DocumentViews:
+    """
+    The views of one package, built on demand.
+
+    Args:
+        package: Package being checked
+        streaming: Collect walk views with bounded memory (stream_document)
+        registry: View specs (the standard VIEWS by default)
+        known: Values known in advance (e.g. restored from the IR cache)
+    """
+
+    def __init__(self, package: DocxPackage, streaming: bool = False,
+                 registry: Optional[ViewRegistry] = None, known: Optional[Dict[str, Any]] = None):
+        self.package = package
+        self.streaming = streaming
+        self.registry = registry if registry is not None else VIEWS
+        self.values: Dict[str, Any] = dict(known or {})
+        self.built: List[str] = []
+        self.walks = 0
+        self._collectors: Dict[str, DocumentRule] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self.values[name]
+        except KeyError:
+            raise KeyError(f"View {name!r} was not built (is it declared in `needs`?)") from None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def collector(self, name: str) -> Optional[DocumentRule]:
+        """Collector of a walk view registered in the pending walk (None otherwise)."""
+        return self._collectors.get(name)
+
+    def _known(self, name: str) -> bool:
+        if name in self.values:
+            return True
+        spec = self.registry[name]
+        if spec.shared:
+            value = self.package.get_derived(name)
+            if value is not None:
+                self.values[name] = value
+                return True
+        return False
+
+    def build(self, names: Iterable[str]) -> "DocumentViews":
+        """Build the views in `names` (and their dependencies) that are not known yet."""
+        pending = [name for name in self.registry.closure(names, known=self._known) if not self._known(name)]
+        if not pending:
+            return self
+        self._preload(pending)
+
+        # Non-walk views that read collected data wait for the walk; all
+        # collectors share it (a second walk only if a collector needs such
+        # a view, which the standard views never do)
+        results: List[Tuple[str, Callable]] = []
+        deferred: List[str] = []
+        for name in pending:
+            spec = self.registry[name]
+            waiting = any(d in self._collectors or d in deferred for d in spec.needs)
+            if spec.walk and waiting:
+                self._walk(results)
+                results = []
+                for view in deferred:
+                    self._set(view, self.registry[view].build(self))
+                deferred = []
+            if spec.walk:
+                collector, result = spec.build(self)
+                self._collectors[name] = collector
+                results.append((name, result))
+            elif waiting:
+                deferred.append(name)
+            else:
+                self._set(name, spec.build(self))
+        if results:
+            self._walk(results)
+        for name in deferred:
+            self._set(name, self.registry[name].build(self))
+        return self
+
+    def _walk(self, results: List[Tuple[str, Callable]]) -> None:
+        collectors = list(self._collectors.values())
+        if not collectors:
+            return
+        run = stream_document if self.streaming else walk_document
+        context = run(self.package, collectors)
+        self.walks += 1
+        self._collectors = {}
+        for name, result in results:
+            self._set(name, result(context))
+
+    def _set(self, name: str, value: Any) -> None:
+        self.values[name] = value
+        self.built.append(name)
+        if self.registry[name].shared:
+            self.package.derived(name, lambda _package: value)
+
+    def _preload(self, pending: List[str]) -> None:
+        parts: List[str] = []
+        for name in pending:
+            spec = self.registry[name]
+            if spec.walk and not self.streaming:
+                parts.append(DOCUMENT_PART)
+            if spec.parts is not None:
+                parts.extend(spec.parts(self.package))
+        if parts:
+            self.package.preload(parts)
+
+
+# Standard views
+
+def _styles_parts(package: DocxPackage) -> List[str]:
+    return ["word/styles.xml"]
+
+
+def _document_rels(package: DocxPackage) -> List[str]:
+    return [DOCUMENT_RELS]
+
+
+def _theme_parts(package: DocxPackage) -> List[str]:
+    # Theme fonts (minorHAnsi, ...) are resolved through the document's relationships
+    theme = package.related_part("theme")
+    return [DOCUMENT_RELS] + ([theme] if theme else [])
+
+
+def _media_reads(package: DocxPackage) -> List[str]:
+    # The relationship graph, and the images it reaches or leaves unreferenced
+    return [name for name in package.namelist()
+            if name.endswith(".rels") or not name.endswith(".xml")]
+
+
+def _numbering_parts(package: DocxPackage) -> List[str]:
+    return ["word/styles.xml", "word/numbering.xml"]
+
+
+def _header_footer_parts(package: DocxPackage) -> List[str]:
+    from tests.helpers.ooxml_fields import referenced_parts
+
+    return [part for kind in ("header", "footer") for part in referenced_parts(package, kind).values()]
+
+
+def _font_parts(package: DocxPackage) -> List[str]:
+    from tests.helpers.ooxml_fonts import audited_parts
+
+    return [name for name, _part in audited_parts(package)]
+
+
+def _fingerprint_parts(package: DocxPackage) -> List[str]:
+    return _numbering_parts(package) + _header_footer_parts(package)
+
+
+def _styles(views: DocumentViews):
+    from tests.helpers.ooxml_styles import StyleResolver
+
+    return StyleResolver.for_package(views.package)
+
+
+def _numbering(views: DocumentViews):
+    from tests.helpers.ooxml_numbering import NumberingResolver
+
+    return NumberingResolver.from_package(views.package)
+
+
+def _text_model(views: DocumentViews):
+    from tests.helpers.ooxml_text import TextModel, TextModelRule
+
+    model = TextModel()
+    return TextModelRule(views["styles"], model, views["numbering"]), lambda ctx: model
+
+
+def _paragraph_index(views: DocumentViews):
+    from tests.helpers.ooxml_index import ParagraphIndex, ParagraphIndexRule
+
+    index = ParagraphIndex()
+    text = views.collector("text_model")
+    rule = ParagraphIndexRule(views["styles"], index, keep_elements=not views.streaming,
+                              model=text.model if text is not None else None)
+
+    def result(ctx: WalkContext) -> ParagraphIndex:
+        if not views.streaming:
+            # Share the element-keyed index with later checks of this package
+            views.package.derived("paragraph_index", lambda _package: index)
+        return index
+
+    return rule, result
+
+
+def _formatting_table(views: DocumentViews):
+    from tests.helpers.ooxml_columns import FormattingTable, FormattingTableRule
+
+    table = FormattingTable()
+    text = views.collector("text_model")
+    rule = FormattingTableRule(views["styles"], table, text.model if text is not None else None)
+    return rule, lambda ctx: table
+
+
+def _sections(views: DocumentViews):
+    from tests.helpers.ooxml_sections import SectionRule
+
+    rule = SectionRule()
+    return rule, lambda ctx: rule.sections
+
+
+def _field_index(views: DocumentViews):
+    from tests.helpers.ooxml_fields import FieldIndex
+
+    fields = FieldIndex()
+    return fields.rule(), lambda ctx: fields
+
+
+def _header_fields(views: DocumentViews):
+    fields = views["field_index"]
+    fields.scan_headers_footers(views.package)
+    return fields
+
+
+def _headers(views: DocumentViews) -> Dict[str, Dict[str, str]]:
+    from tests.helpers.ooxml_fields import referenced_parts
+
+    return {kind: referenced_parts(views.package, kind) for kind in ("header", "footer")}
+
+
+def _content_fingerprint(views: DocumentViews):
+    from tests.helpers.ooxml_fingerprint import FingerprintRule
+
+    rule = FingerprintRule(views.package)
+    return rule, lambda ctx: rule.fingerprint()
+
+
+def _table_index(views: DocumentViews):
+    from tests.helpers.ooxml_tables import TableGridRule
+
+    rule = TableGridRule(keep_elements=not views.streaming)
+    return rule, lambda ctx: rule.index
+
+
+def _font_histogram(views: DocumentViews):
+    from tests.helpers.ooxml_fonts import FontHistogram
+
+    return FontHistogram.build(views.package, views["formatting_table"], views["styles"])
+
+
+def _media_inventory(views: DocumentViews):
+    from tests.helpers.ooxml_media import MediaInventory
+
+    return MediaInventory.for_package(views.package)
+
+
+VIEWS = ViewRegistry([
+    ViewSpec("styles", _styles, parts=_styles_parts, reads=_theme_parts,
+             shared=False),  # cached as "style_resolver"
+    ViewSpec("numbering", _numbering, needs=("styles",), parts=_numbering_parts, shared=False),
+    ViewSpec("text_model", _text_model, walk=True, needs=("styles", "numbering")),
+    ViewSpec("paragraph_index", _paragraph_index, walk=True, needs=("styles",),
+             uses=("text_model",), shared=False),
+    ViewSpec("formatting_table", _formatting_table, walk=True, needs=("styles",), uses=("text_model",)),
+    ViewSpec("sections", _sections, walk=True),
+    ViewSpec("field_index", _field_index, walk=True),
+    ViewSpec("header_fields", _header_fields, needs=("field_index",),
+             parts=_header_footer_parts, reads=_document_rels),
+    ViewSpec("headers", _headers, reads=_document_rels),
+    ViewSpec("content_fingerprint", _content_fingerprint, walk=True, parts=_fingerprint_parts,
+             reads=_document_rels),
+    ViewSpec("table_index", _table_index, walk=True),
+    ViewSpec("font_histogram", _font_histogram, needs=("formatting_table", "styles"), parts=_font_parts,
+             reads=_document_rels),
+    ViewSpec("media_inventory", _media_inventory, reads=_media_reads),
+])
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """
+    A registered check.
+
+    Attributes:
+        name: Rule name (used in profiles and on the command line)
+        run: The check (its signature is up to the registry owner)
+        needs: Views the check reads
+    """
+    name: str
+    run: Callable
+    needs: Tuple[str, ...] = ()
+
+
+class RuleRegistry:
+    """
+    Named checks with their declared views, in registration (report) order.
+
+    Args:
+        views: View specs the declared names refer to (VIEWS by default)
+    """
+
+    def __init__(self, views: Optional[ViewRegistry] = None):
+        self.views = views if views is not None else VIEWS
+        self.rules: Dict[str, RuleSpec] = {}
+
+    def register(self, name: str, needs: Iterable[str] = ()) -> Callable:
+        """Decorator registering a check function under `name`."""
+        needs = tuple(needs)
+        for view in needs:
+            self.views[view]  # unknown view names fail at registration
+
+        def decorator(func: Callable) -> Callable:
+            if name in self.rules:
+                raise ValueError(f"Rule already registered: {name!r}")
+            self.rules[name] = RuleSpec(name, func, needs)
+            return func
+
+        return decorator
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.rules)
+
+    def select(self, enabled: Optional[Iterable[str]] = None) -> List[RuleSpec]:
+        """Enabled rules in registration order (all rules for None)."""
+        if enabled is None:
+            return list(self.rules.values())
+        enabled = set(enabled)
+        unknown = enabled - set(self.rules)
+        if unknown:
+            raise KeyError(f"Unknown rules: {', '.join(sorted(unknown))}")
+        return [rule for rule in self.rules.values() if rule.name in enabled]
+
+    def inputs(self, rule: RuleSpec, package: DocxPackage) -> List[str]:
+        """Parts the rule reads (through its views), sorted."""
+        return self.views.inputs(rule.needs, package)
+
+    def signature(self, rule: RuleSpec, package: DocxPackage) -> str:
+        """
+        Hash of the rule's input parts: it is unchanged between two versions
+        of a document if the rule would see the same data in both.
+        """
+        hasher = hashlib.sha256(rule.name.encode("utf-8"))
+        for part in self.inputs(rule, package):
+            hasher.update(b"\x00" + part.encode("utf-8") + b"=" + package.part_hash(part).encode("ascii"))
+        return hasher.hexdigest()
+
+    def needs(self, enabled: Optional[Iterable[str]] = None) -> List[str]:
+        """Views needed by the enabled rules (each once)."""
+        names: Dict[str, None] = {}
+        for rule in self.select(enabled):
+            names.update(dict.fromkeys(rule.needs))
+        return list(names)
@@ -0,0 +1,270 @@
+"""
+Single-traversal rule engine for word/document.xml.
+
+The document tree is walked once; every paragraph, run, table and
+section-properties (w:sectPr) element is dispatched to all registered rules.
+Checker time therefore grows with the document size only, not with
+document size times the number of checks.
+
+Event order follows document order of element *ends*: runs of a paragraph
+are delivered before the paragraph itself, and a table is delivered after
+all of its paragraphs. This keeps the engine usable with streaming parsers,
+where an element is only complete at its end tag.
+
+Two drivers are available:
+- `walk_document()` walks an already parsed tree (DocxPackage.document_xml);
+- `stream_document()` feeds `ZipFile.open()` straight into `iterparse` and
+  clears every paragraph and top-level block once rules have seen it, so
+  memory stays roughly flat regardless of document size.
+
+In streaming mode an element is only valid while its handler runs: rules
+must copy the values they need instead of keeping element references.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_paths import W_P, W_R, W_SECT_PR, W_SECT_PR_CHANGE, W_TBL
+from tests.helpers.ooxml_utils import (
+    XML_PARSER_OPTIONS,
+    DocxPackage,
+    PackageLimitError,
+    PackageSource,
+    open_package,
+)
+
+
+WALK_TAGS = (W_P, W_R, W_TBL, W_SECT_PR)
+
+_HANDLERS = ("on_paragraph", "on_run", "on_table", "on_sect_pr", "finish")
+
+
+@dataclass
+class WalkContext:
+    """
+    Position of the walker inside the document.
+
+    Attributes:
+        paragraph_index: 0-based ordinal of the current paragraph (document order
+            of paragraph start tags, same numbering as `.//w:p`)
+        run_index: 0-based ordinal of the current run (same numbering as `.//w:r`)
+        table_depth: Number of enclosing tables (0 = body text)
+        section_index: 0-based index of the section the current element belongs to
+        paragraph: Paragraph enclosing the current run (None outside paragraphs)
+        paragraph_count: Number of paragraphs started so far
+        run_count: Number of runs started so far
+    """
+    paragraph_index: int = -1
+    run_index: int = -1
+    table_depth: int = 0
+    section_index: int = 0
+    paragraph: Optional[etree._Element] = None
+    paragraph_count: int = 0
+    run_count: int = 0
+
+    @property
+    def in_table(self) -> bool:
+        """True if the current element is inside a table cell."""
+        return self.table_depth > 0
+
+
+class DocumentRule:
+    """
+    Base class for checks driven by a DocumentWalker.
+
+    Subclasses override only the events they need; the walker never calls
+    handlers that are not overridden. Subclassing is optional: any object
+    providing some of these methods can be registered.
+    """
+
+    def on_paragraph(self, paragraph: etree._Element, ctx: WalkContext) -> None:
+        """Called once per complete w:p element."""
+
+    def on_run(self, run: etree._Element, ctx: WalkContext) -> None:
+        """Called once per complete w:r element."""
+
+    def on_table(self, table: etree._Element, ctx: WalkContext) -> None:
+        """Called once per complete w:tbl element (ctx.table_depth includes it)."""
+
+    def on_sect_pr(self, sect_pr: etree._Element, ctx: WalkContext) -> None:
+        """Called once per w:sectPr; ctx.section_index is the section it closes."""
+
+    def finish(self, ctx: WalkContext) -> None:
+        """Called after the whole document has been walked."""
+
+
+def _overrides(rule: DocumentRule, handler: str) -> bool:
+    """Check whether a rule implements a handler (other than the no-op default)."""
+    impl = getattr(type(rule), handler, None)
+    return impl is not None and impl is not getattr(DocumentRule, handler)
+
+
+class DocumentWalker:
+    """
+    Dispatches traversal events of one document to registered rules.
+
+    Usage:
+        walker = DocumentWalker([rule_a, rule_b])
+        walker.walk(package)
+    """
+
+    def __init__(self, rules: Iterable[DocumentRule] = ()):
+        self.rules: List[DocumentRule] = []
+        self.context = WalkContext()
+        # (element, ordinal) of open paragraphs / ordinals of open runs;
+        # paragraphs nest through text boxes, so ends do not follow starts.
+        self._paragraph_stack: List[Tuple[etree._Element, int]] = []
+        self._run_stack: List[int] = []
+        self._section_break_pending = False
+        self._handlers = {name: [] for name in _HANDLERS}
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule) -> DocumentRule:
+        """Add a rule; returns it for convenience."""
+        self.rules.append(rule)
+        for name in _HANDLERS:
+            if _overrides(rule, name):
+                self._handlers[name].append(getattr(rule, name))
+        return rule
+
+    def feed(self, event: str, element: etree._Element) -> None:
+        """
+        Process one ("start" | "end", element) event for a WALK_TAGS element.
+
+        Exposed so that other event sources (e.g. iterparse) can drive the
+        same rules.
+        """
+        tag = element.tag
+        ctx = self.context
+
+        if event == "start":
+            if tag == W_P:
+                ctx.paragraph_index = ctx.paragraph_count
+                ctx.paragraph_count += 1
+                self._paragraph_stack.append((element, ctx.paragraph_index))
+                ctx.paragraph = element
+            elif tag == W_R:
+                ctx.run_index = ctx.run_count
+                ctx.run_count += 1
+                self._run_stack.append(ctx.run_index)
+            elif tag == W_TBL:
+                ctx.table_depth += 1
+            return
+
+        if tag == W_R:
+            ctx.run_index = self._run_stack.pop()
+            for handler in self._handlers["on_run"]:
+                handler(element, ctx)
+        elif tag == W_P:
+            ctx.paragraph, ctx.paragraph_index = self._paragraph_stack.pop()
+            for handler in self._handlers["on_paragraph"]:
+                handler(element, ctx)
+            if self._paragraph_stack:
+                ctx.paragraph, ctx.paragraph_index = self._paragraph_stack[-1]
+            else:
+                ctx.paragraph = None
+            if self._section_break_pending and not self._paragraph_stack:
+                # A paragraph-level sectPr closes its section after the paragraph
+                self._section_break_pending = False
+                ctx.section_index += 1
+        elif tag == W_TBL:
+            for handler in self._handlers["on_table"]:
+                handler(element, ctx)
+            ctx.table_depth -= 1
+        elif tag == W_SECT_PR:
+            parent = element.getparent()
+            if parent is not None and parent.tag == W_SECT_PR_CHANGE:
+                return  # previous (tracked) properties, not a real section
+            for handler in self._handlers["on_sect_pr"]:
+                handler(element, ctx)
+            if self._paragraph_stack:
+                self._section_break_pending = True
+            else:
+                ctx.section_index += 1
+
+    def finish(self) -> WalkContext:
+        """Notify rules that the document is complete."""
+        for handler in self._handlers["finish"]:
+            handler(self.context)
+        return self.context
+
+    def _release(self, element: etree._Element) -> None:
+        """
+        Free a delivered element while streaming.
+
+        Paragraphs are emptied as soon as rules have seen them. Once a
+        top-level block (outside any paragraph or table) is complete, it
+        and all already processed preceding siblings are removed as well.
+        """
+        tag = element.tag
+        if tag == W_P or (tag == W_TBL and not self.context.table_depth):
+            element.clear(keep_tail=True)
+        if self._paragraph_stack or self.context.table_depth:
+            return
+        if tag not in (W_P, W_TBL):
+            return
+        parent = element.getparent()
+        if parent is None:
+            return
+        while element.getprevious() is not None:
+            del parent[0]
+
+    def walk(self, source) -> WalkContext:
+        """
+        Walk a parsed document once and dispatch all events.
+
+        Args:
+            source: DocxPackage or parsed document.xml root
+
+        Returns:
+            Final walk context (counts of paragraphs, runs, sections)
+        """
+        root = source.document_xml if isinstance(source, DocxPackage) else source
+        for event, element in etree.iterwalk(root, events=("start", "end"), tag=WALK_TAGS):
+            self.feed(event, element)
+        return self.finish()
+
+    def stream(self, source: PackageSource) -> WalkContext:
+        """
+        Parse word/document.xml incrementally and dispatch all events.
+
+        The part is decompressed on the fly (ZipFile.open) and parsed with
+        `etree.iterparse` (XML_PARSER_OPTIONS); delivered elements are
+        cleared right away, so the full XML bytes and the full tree are
+        never held in memory.
+
+        Args:
+            source: DocxPackage or path to a .docx file
+
+        Returns:
+            Final walk context (counts of paragraphs, runs, sections)
+        """
+        package = open_package(source)
+        try:
+            with package.open_part("word/document.xml") as stream:
+                events = etree.iterparse(
+                    stream, events=("start", "end"), tag=WALK_TAGS, **XML_PARSER_OPTIONS,
+                )
+                try:
+                    for event, element in events:
+                        self.feed(event, element)
+                        if event == "end":
+                            self._release(element)
+                except etree.XMLSyntaxError as exc:
+                    raise PackageLimitError(f"Не удалось разобрать word/document.xml: {exc}") from exc
+        finally:
+            if package is not source:
+                package.close()
+        return self.finish()
+
+
+def walk_document(source, rules: Iterable[DocumentRule]) -> WalkContext:
+    """Run all `rules` over a single traversal of `source`."""
+    return DocumentWalker(rules).walk(source)
+
+
+def stream_document(source: PackageSource, rules: Iterable[DocumentRule]) -> WalkContext:
+    """Run all `rules` over a bounded-memory streaming parse of `source`."""
+    return DocumentWalker(rules).stream(source)
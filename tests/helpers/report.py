@@ -48,6 +48,12 @@ class NormocontrolReport:
         if document not in self.documents_checked:
             self.documents_checked.append(document)
     
+    def merge(self, other: 'NormocontrolReport'):
+        """Append the documents and issues of another report (e.g. of a batch worker)."""
+        for document in other.documents_checked:
+            self.add_document(document)
+        self.issues.extend(other.issues)
+    
     def get_issues_by_document(self, document: str) -> List[Issue]:
         """Get all issues for a specific document."""
         return [i for i in self.issues if i.document == document]
@@ -0,0 +1,172 @@
+"""
+Content-addressed cache of check results.
+
+A check is a pure function of the document bytes, the checklist config and
+the checker code, so its findings are stored under a key built from these
+(see `result_key`): an unchanged document is answered from the cache
+without opening the archive, whatever else changed in the PR. Editing the
+checklist or any checker module changes the key, so stale results are
+never returned (they age out of the cache instead).
+
+Layout of the cache directory:
+    results-v<RESULT_CACHE_VERSION>/<key[:2]>/<key>.json
+
+Entries are small JSON documents (the issues, not pickles). The cache is
+bounded by `max_bytes` with LRU eviction: a hit touches the entry's mtime,
+and a store that takes the cache over the bound removes the least recently
+used entries down to `LOW_WATER` of it. The running size of the entries is
+kept in a small index file (`SIZE_INDEX`), so a store only reads and
+rewrites that file; the directory is scanned only to initialize the index
+and to evict. All writes are atomic (temporary file + rename) and a
+concurrently removed entry is simply a miss, so batch workers can share one
+cache directory without locks. Concurrent stores may lose each other's
+index updates; the total is then underestimated until the next scan, which
+writes the exact total again.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tests.helpers.ooxml_ir import atomic_write, cache_root
+
+
+# Bump when the layout of an entry changes
+RESULT_CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Eviction frees space down to this share of max_bytes (not on every store)
+LOW_WATER = 0.8
+# Running total size of the entries (bytes, decimal)
+SIZE_INDEX = "size"
+
+
+def result_key(*parts: str) -> str:
+    """SHA-256 of the key components (document hash, config hash, checker version, ...)."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode("utf-8") + b"\x00")
+    return hasher.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes (equals DocxPackage.content_hash), read in chunks."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of check results, keyed by `result_key`.
+
+    Usage:
+        cache = ResultCache()
+        key = result_key(file_hash(path), config_hash, checker_version)
+        result = cache.get(key)
+        if result is None:
+            result = {"issues": [...]}  # run the checks
+            cache.put(key, result)
+
+    Args:
+        directory: Cache root (default: $NORMOCONTROL_CACHE_DIR or
+            ~/.cache/normocontrol)
+        max_bytes: Size bound of the stored entries
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        root = Path(directory) if directory is not None else cache_root()
+        self.directory = root / f"results-v{RESULT_CACHE_VERSION}"
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result (None on a miss or an unreadable entry); marks it recently used."""
+        path = self._entry_path(key)
+        try:
+            result = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(result, dict):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a JSON-serializable result, evicting old entries beyond `max_bytes`."""
+        path = self._entry_path(key)
+        data = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        atomic_write(path, data)
+
+        total = self._read_size()
+        if total is None:
+            total = self._scan_size()
+        else:
+            total += len(data) - replaced
+        if total > self.max_bytes:
+            total = self._evict(self._entries(), int(self.max_bytes * LOW_WATER))
+        self._write_size(total)
+
+    def _read_size(self) -> Optional[int]:
+        """Total size from the index (None if missing or unreadable)."""
+        try:
+            return max(0, int((self.directory / SIZE_INDEX).read_text(encoding="ascii")))
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, total: int) -> None:
+        atomic_write(self.directory / SIZE_INDEX, str(total).encode("ascii"))
+
+    def _scan_size(self) -> int:
+        """Exact total size of the stored entries (scans the directory)."""
+        return sum(size for _mtime, size, _path in self._entries())
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of the stored entries."""
+        entries = []
+        try:
+            shards = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue  # removed by a concurrent eviction
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+        return entries
+
+    @staticmethod
+    def _evict(entries: List[Tuple[float, int, str]], target: int) -> int:
+        """
+        Remove the least recently used entries until at most `target` bytes
+        remain; returns the size of the remaining entries.
+        """
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # already removed by another worker
+            total -= size
+        return total
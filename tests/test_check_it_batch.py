@@ -0,0 +1,72 @@
+"""
+Tests for the batch checker (scripts/standards_verification/check_it_batch.py).
+"""
+import concurrent.futures
+import importlib
+
+import pytest
+
+from tests.conftest import paragraph_xml
+
+
+@pytest.fixture
+def batch(checker):
+    return importlib.import_module("check_it_batch")
+
+
+@pytest.fixture
+def documents(tmp_path, make_docx):
+    """Three documents with different findings, in a nested directory."""
+    (tmp_path / "group" / "b").mkdir(parents=True)
+    bodies = {
+        "group/c.docx": paragraph_xml("Текст [1]."),
+        "group/a.docx": paragraph_xml("Текст", ppr='<w:ind w:firstLine="100"/>'),
+        "group/b/b.docx": paragraph_xml("Рисунок 1. Схема."),
+    }
+    for name, body in bodies.items():
+        make_docx(body, name=name)
+    make_docx("", name="group/~$a.docx")  # Word lock file
+    return tmp_path / "group"
+
+
+def report_rows(report):
+    return report.documents_checked, [(i.document, i.category, i.description) for i in report.issues]
+
+
+class TestCollectDocuments:
+
+    def test_directories_globs_and_duplicates(self, batch, documents):
+        found, unmatched = batch.collect_documents(
+            [str(documents), str(documents / "*.docx"), str(documents / "missing" / "*.docx")],
+            base=documents,
+        )
+        assert [name for name, _path in found] == ["a.docx", "b/b.docx", "c.docx"]
+        assert unmatched == [str(documents / "missing" / "*.docx")]
+
+
+class TestMergedReport:
+
+    def test_order_does_not_depend_on_completion(self, batch, documents, monkeypatch):
+        found, _unmatched = batch.collect_documents([str(documents)], base=documents)
+        compiled = batch.default_config()
+        sequential = batch.check_batch(found, compiled, jobs=1, use_cache=False, use_daemon=False)
+
+        def reversed_completion(futures):
+            return reversed(list(concurrent.futures.as_completed(futures)))
+
+        monkeypatch.setattr(batch, "as_completed", reversed_completion)
+        parallel = batch.check_batch(found, compiled, jobs=2, use_cache=False, use_daemon=False)
+
+        assert report_rows(parallel) == report_rows(sequential)
+        assert parallel.documents_checked == ["a.docx", "b/b.docx", "c.docx"]
+        documents_of_issues = [issue.document for issue in parallel.issues]
+        assert set(documents_of_issues) == set(parallel.documents_checked)
+        assert documents_of_issues == sorted(documents_of_issues)
+
+    def test_broken_document_does_not_stop_the_batch(self, batch, documents):
+        (documents / "broken.docx").write_bytes(b"not a zip archive")
+        found, _unmatched = batch.collect_documents([str(documents)], base=documents)
+        report = batch.check_batch(found, batch.default_config(), jobs=1, use_cache=False, use_daemon=False)
+        assert report.documents_checked == ["a.docx", "b/b.docx", "broken.docx", "c.docx"]
+        broken = report.get_issues_by_document("broken.docx")
+        assert [(issue.category, issue.severity) for issue in broken] == [("package", "error")]
@@ -0,0 +1,109 @@
+"""
+Tests for the compiled checklist (compile_config in
+scripts/standards_verification/check_it_docx.py).
+"""
+import json
+import shutil
+
+import pytest
+
+from tests.conftest import TESTS_DIR
+
+
+CHECKLIST = TESTS_DIR.parent / "scripts" / "standards_verification" / "standars_control_it_short.md"
+
+
+@pytest.fixture
+def checklist(tmp_path):
+    path = tmp_path / "checklist.md"
+    shutil.copyfile(CHECKLIST, path)
+    return path
+
+
+@pytest.fixture
+def compile_fresh(checker, monkeypatch):
+    """compile_config without the in-process memo (as in a new process)."""
+
+    def compile_config(path):
+        monkeypatch.setattr(checker, "_COMPILED", {})
+        return checker.compile_config(path)
+
+    return compile_config
+
+
+@pytest.fixture
+def parses(checker, monkeypatch):
+    """Records the markdown texts parsed by compile_config."""
+    parsed = []
+    parse = checker.parse_it_normocontrol_config
+
+    def recording_parse(text):
+        parsed.append(text)
+        return parse(text)
+
+    monkeypatch.setattr(checker, "parse_it_normocontrol_config", recording_parse)
+    return parsed
+
+
+def artifact(checker, checklist) -> dict:
+    return json.loads(checker._config_artifact_path(checklist.resolve()).read_text(encoding="utf-8"))
+
+
+class TestCompileConfig:
+
+    def test_artifact_is_reused(self, checker, checklist, compile_fresh, parses):
+        first = compile_fresh(checklist)
+        stored = artifact(checker, checklist)
+        assert stored["hash"] == first.hash == checker.config_hash(first.config)
+        assert stored["checker"] == checker.checker_version()
+
+        second = compile_fresh(checklist)
+        assert second == first
+        assert len(parses) == 1
+
+    def test_memo_within_a_process(self, checker, checklist, parses):
+        assert checker.compile_config(checklist) is checker.compile_config(checklist)
+        assert len(parses) == 1
+
+    def test_stale_checker_version_is_rejected(self, checker, checklist, compile_fresh, parses, monkeypatch):
+        first = compile_fresh(checklist)
+        monkeypatch.setattr(checker, "checker_version", lambda: "0" * 64)
+
+        assert checker._read_config_artifact(checker._config_artifact_path(checklist.resolve())) is None
+        second = compile_fresh(checklist)
+        assert second.hash == first.hash
+        assert len(parses) == 2
+        assert artifact(checker, checklist)["checker"] == "0" * 64
+
+    def test_stale_config_version_is_rejected(self, checker, checklist, compile_fresh, parses, monkeypatch):
+        compile_fresh(checklist)
+        monkeypatch.setattr(checker, "CONFIG_VERSION", checker.CONFIG_VERSION + 1)
+        compile_fresh(checklist)
+        assert len(parses) == 2
+
+    def test_tampered_artifact_is_rejected(self, checker, checklist, compile_fresh, parses):
+        compile_fresh(checklist)
+        path = checker._config_artifact_path(checklist.resolve())
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["config"]["margins_left_mm"] = 40.0
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+        compiled = compile_fresh(checklist)
+        assert compiled.config.margins_left_mm != 40.0
+        assert len(parses) == 2
+
+    def test_changed_checklist_is_recompiled(self, checklist, compile_fresh):
+        first = compile_fresh(checklist)
+        text = checklist.read_text(encoding="utf-8")
+        checklist.write_text(text.replace("левое 23", "левое 30"), encoding="utf-8")
+
+        second = compile_fresh(checklist)
+        assert second.config.margins_left_mm == 30.0
+        assert second.hash != first.hash
+
+    def test_implausible_values_are_rejected(self, checker, checklist, compile_fresh):
+        text = checklist.read_text(encoding="utf-8")
+        checklist.write_text(text.replace("левое 23", "левое 205"), encoding="utf-8")
+        with pytest.raises(ValueError, match="левое и правое поля"):
+            compile_fresh(checklist)
+        assert not checker._config_artifact_path(checklist.resolve()).exists()
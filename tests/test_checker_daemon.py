@@ -0,0 +1,152 @@
+"""
+Tests for the warm checker daemon (scripts/standards_verification/checker_daemon.py).
+"""
+import dataclasses
+import importlib
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import TESTS_DIR, paragraph_xml
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are required")
+
+DAEMON_SCRIPT = TESTS_DIR.parent / "scripts" / "standards_verification" / "checker_daemon.py"
+
+
+@pytest.fixture
+def daemon_module(checker):
+    return importlib.import_module("checker_daemon")
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters: not below tmp_path
+    with tempfile.TemporaryDirectory(prefix="nc-", dir="/tmp") as directory:
+        yield Path(directory) / "checker.sock"
+
+
+@pytest.fixture
+def daemon(daemon_module, socket_path):
+    """A daemon process serving on `socket_path` (stopped after the test)."""
+    process = subprocess.Popen(
+        [sys.executable, str(DAEMON_SCRIPT), "--socket", str(socket_path)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while not daemon_module.daemon_running(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail("the checker daemon did not start")
+        time.sleep(0.05)
+    yield process
+    if process.poll() is None:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.fixture
+def server(daemon_module, socket_path):
+    """A CheckerServer of this process (bound, not serving): dispatch() is called directly."""
+    with daemon_module.CheckerServer(socket_path) as server:
+        yield server
+
+
+@pytest.fixture
+def document(make_docx):
+    return make_docx(paragraph_xml("Введение", ppr='<w:ind w:firstLine="400"/>'), name="ПЗ.docx")
+
+
+def issues_of(result):
+    return [dataclasses.astuple(issue) for issue in result.report.issues]
+
+
+def other_checklist(checker):
+    """The repository checklist with another left margin (and therefore another hash)."""
+    config = dataclasses.replace(checker.default_config().config, margins_left_mm=25.0)
+    return checker.CompiledConfig(config, checker.config_hash(config))
+
+
+class TestDaemonProtocol:
+
+    def test_ping_check_shutdown(self, checker, daemon_module, daemon, socket_path, document):
+        response = daemon_module.request({"op": "ping"}, socket_path)
+        assert response == {"ok": True, "pid": daemon.pid}
+
+        result = daemon_module.check_with_daemon(document, socket_path=socket_path, use_cache=False)
+        expected = checker.check_document(document, checker.default_config(), use_cache=False)
+        assert result is not None
+        assert result.report.documents_checked == ["ПЗ.docx"]
+        assert issues_of(result) == issues_of(expected)
+
+        sent = daemon_module.check_with_daemon(
+            data=document.read_bytes(), doc_name="ПЗ.docx", socket_path=socket_path, use_cache=False
+        )
+        assert issues_of(sent) == issues_of(expected)
+
+        assert daemon_module.request({"op": "shutdown"}, socket_path) == {"ok": True}
+        daemon.wait(timeout=30)
+        assert not daemon_module.daemon_running(socket_path)
+        assert not socket_path.exists()
+
+    def test_sigterm_stops_daemon(self, daemon_module, daemon, socket_path):
+        daemon.terminate()
+        assert daemon.wait(timeout=30) == 0
+        assert not daemon_module.daemon_running(socket_path)
+        assert not socket_path.exists()
+
+    def test_shutdown_in_process(self, server):
+        # The stop thread only calls shutdown() once the pipe is written
+        thread = server.stop_on_request()
+        assert thread.is_alive()
+        assert server.dispatch({"op": "shutdown"}) == {"ok": True}
+        server.serve_forever(poll_interval=0.05)
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+    def test_errors_are_responses(self, daemon_module, daemon, socket_path, tmp_path):
+        unknown = daemon_module.request({"op": "status"}, socket_path)
+        assert unknown["ok"] is False and "unknown op" in unknown["error"]
+        missing = daemon_module.request({"op": "check", "path": str(tmp_path / "missing.docx")}, socket_path)
+        assert missing["ok"] is False and "FileNotFoundError" in missing["error"]
+
+
+class TestDaemonRefusals:
+
+    def test_stale_sources(self, server, document):
+        request = {"op": "check", "path": str(document), "cache": False}
+        assert server.dispatch(request)["ok"]
+        server.stamp = ()  # as if the checker sources changed after the start
+        with pytest.raises(RuntimeError, match="sources changed"):
+            server.dispatch(request)
+        assert server.dispatch({"op": "ping"})["ok"]
+
+    def test_other_checklist(self, checker, server, document):
+        request = {"op": "check", "path": str(document), "cache": False}
+        same = dict(request, config=checker.default_config().hash)
+        assert server.dispatch(same)["ok"]
+        with pytest.raises(ValueError, match="another checklist"):
+            server.dispatch(dict(request, config=other_checklist(checker).hash))
+
+
+class TestRunCheck:
+
+    def test_in_process_without_daemon(self, checker, daemon_module, socket_path, document):
+        assert not daemon_module.daemon_running(socket_path)
+        result = daemon_module.run_check(document, use_cache=False, socket_path=socket_path)
+        expected = checker.check_document(document, checker.default_config(), use_cache=False)
+        assert issues_of(result) == issues_of(expected)
+
+    def test_other_checklist_is_checked_in_process(self, checker, daemon_module, daemon, socket_path, document):
+        compiled = other_checklist(checker)
+        result = daemon_module.run_check(document, use_cache=False, compiled=compiled, socket_path=socket_path)
+        expected = checker.check_document(document, compiled, use_cache=False)
+        assert issues_of(result) == issues_of(expected)
+        assert any("'left'" in issue.description for issue in result.report.issues)
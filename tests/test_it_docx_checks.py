@@ -0,0 +1,171 @@
+"""
+Checks of scripts/standards_verification/check_it_docx.py on small synthetic
+documents (see the make_docx and checker fixtures in conftest.py).
+"""
+from tests.conftest import W_NAMESPACE, paragraph_xml
+
+
+def run_checks(checker, path, *rules):
+    """Issues of the given checks on one document (no result cache)."""
+    result = checker.check_document(path, checker.default_config(), use_cache=False, rules=list(rules) or None)
+    return result.report.issues
+
+
+def descriptions(issues, category=None):
+    return [issue.description for issue in issues if category is None or issue.category == category]
+
+
+class TestLineSpacing:
+    """Line spacing is only judged where lineRule="auto" is written explicitly."""
+
+    SPACING_WARNING = "Много параграфов с явно заданным некорректным интервалом"
+
+    def test_paragraphs_without_line_rule_are_not_auto(self, make_docx, checker):
+        body = paragraph_xml("Текст", ppr='<w:spacing w:line="480"/>') * 5
+        issues = run_checks(checker, make_docx(body), "paragraph_formatting")
+        assert self.SPACING_WARNING not in descriptions(issues)
+
+    def test_explicit_auto_paragraph_does_not_select_others(self, make_docx, checker):
+        body = (
+            paragraph_xml("Текст", ppr='<w:spacing w:line="480"/>') * 5
+            + paragraph_xml("Текст", ppr='<w:spacing w:line="240" w:lineRule="auto"/>')
+        )
+        issues = run_checks(checker, make_docx(body), "paragraph_formatting")
+        assert self.SPACING_WARNING not in descriptions(issues)
+
+    def test_explicit_auto_spacing_is_checked(self, make_docx, checker):
+        body = paragraph_xml("Текст", ppr='<w:spacing w:line="480" w:lineRule="auto"/>') * 5
+        issues = run_checks(checker, make_docx(body), "paragraph_formatting")
+        assert self.SPACING_WARNING in descriptions(issues)
+
+
+class TestReferences:
+    """The sources list is the list between its heading and the next heading."""
+
+    SOURCES_WARNING = "Максимальный номер ссылки больше числа найденных источников"
+
+    NUMBERING = (
+        f'<w:numbering xmlns:w="{W_NAMESPACE}">'
+        '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/>'
+        '<w:numFmt w:val="decimal"/><w:lvlText w:val="%1"/></w:lvl></w:abstractNum>'
+        '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+        '<w:num w:numId="2"><w:abstractNumId w:val="0"/>'
+        '<w:lvlOverride w:ilvl="0"><w:startOverride w:val="1"/></w:lvlOverride></w:num>'
+        '</w:numbering>'
+    )
+
+    @staticmethod
+    def heading(text: str) -> str:
+        return paragraph_xml(text, ppr='<w:pStyle w:val="Heading1"/>')
+
+    @staticmethod
+    def sources(count: int, num_id: str = "1") -> str:
+        item = f'<w:numPr><w:ilvl w:val="0"/><w:numId w:val="{num_id}"/></w:numPr>'
+        return "".join(paragraph_xml(f"Автор {number}. Название.", ppr=item) for number in range(count))
+
+    def check(self, make_docx, checker, body: str):
+        path = make_docx(body, parts={"word/numbering.xml": self.NUMBERING})
+        return run_checks(checker, path, "references")
+
+    def test_long_list_is_counted_to_the_end(self, make_docx, checker):
+        body = (
+            paragraph_xml("Как показано в [95], ...")
+            + self.heading("Список использованных источников")
+            + self.sources(100)
+        )
+        assert self.SOURCES_WARNING not in descriptions(self.check(make_docx, checker, body))
+
+    def test_list_ends_at_the_next_heading(self, make_docx, checker):
+        body = (
+            paragraph_xml("Как показано в [5], ...")
+            + self.heading("Список использованных источников")
+            + self.sources(2)
+            + self.heading("Приложение А")
+            + self.sources(5, num_id="2")
+        )
+        issues = [issue for issue in self.check(make_docx, checker, body) if issue.description == self.SOURCES_WARNING]
+        assert len(issues) == 1
+        assert issues[0].actual == "Найдено источников: 2 (последний номер: 2)"
+
+    def test_sources_numbered_in_text(self, make_docx, checker):
+        body = (
+            paragraph_xml("Как показано в [2], ...")
+            + self.heading("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ")
+            + paragraph_xml("1 Автор. Название.")
+            + paragraph_xml("2 Автор. Название.")
+        )
+        assert self.check(make_docx, checker, body) == []
+
+
+class TestFontHistogram:
+    """The font histogram is reported only as support for a font finding."""
+
+    HISTOGRAM = "Шрифты и размеры по контекстам (доля символов)"
+
+    @staticmethod
+    def text(font: str) -> str:
+        rpr = f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{font}"/><w:sz w:val="28"/>'
+        return paragraph_xml("Основной текст документа.", rpr=rpr) * 3
+
+    def test_clean_document_has_no_histogram(self, make_docx, checker):
+        issues = run_checks(checker, make_docx(self.text("Times New Roman")), "fonts")
+        assert issues == []
+
+    def test_histogram_backs_a_finding(self, make_docx, checker):
+        issues = run_checks(checker, make_docx(self.text("Arial")), "fonts")
+        assert [issue.severity for issue in issues if issue.description != self.HISTOGRAM]
+        histogram = [issue for issue in issues if issue.description == self.HISTOGRAM]
+        assert len(histogram) == 1
+        assert histogram[0].severity == "info"
+        assert "Arial 14pt" in histogram[0].actual
+
+
+class TestPageNumbering:
+    """The first section is exempt from page numbers only with a separate first page."""
+
+    UNNUMBERED = "Разделы без поля PAGE в верхнем колонтитуле"
+
+    HEADER_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header"
+
+    @staticmethod
+    def header(content: str) -> str:
+        return f'<w:hdr xmlns:w="{W_NAMESPACE}"><w:p>{content}</w:p></w:hdr>'
+
+    def document(self, make_docx, first_section: str):
+        """Section 1 (`first_section` header setup) followed by a numbered section 2."""
+        rels = "".join(
+            f'<Relationship Id="{rel_id}" Type="{self.HEADER_TYPE}" Target="{target}"/>'
+            for rel_id, target in (("rIdPlain", "header1.xml"), ("rIdPage", "header2.xml"))
+        )
+        parts = {
+            "word/header1.xml": self.header('<w:r><w:t>Шапка</w:t></w:r>'),
+            "word/header2.xml": self.header('<w:fldSimple w:instr=" PAGE "><w:r><w:t>2</w:t></w:r></w:fldSimple>'),
+        }
+        first = paragraph_xml(ppr=f"<w:sectPr>{first_section}</w:sectPr>")
+        last_sect_pr = (
+            '<w:sectPr><w:headerReference w:type="default" r:id="rIdPage"/>'
+            '<w:pgSz w:w="11906" w:h="16838"/>'
+            '<w:pgMar w:top="1134" w:right="567" w:bottom="1134" w:left="1701"/></w:sectPr>'
+        )
+        body = paragraph_xml("Титульный лист") + first + paragraph_xml("Введение")
+        return make_docx(body, parts=parts, rels=rels, sect_pr=last_sect_pr)
+
+    def unnumbered(self, make_docx, checker, first_section: str):
+        issues = run_checks(checker, self.document(make_docx, first_section), "page_numbering")
+        return [issue.actual for issue in issues if issue.description == self.UNNUMBERED]
+
+    def test_first_section_without_title_page_is_checked(self, make_docx, checker):
+        first_section = '<w:headerReference w:type="default" r:id="rIdPlain"/>'
+        assert self.unnumbered(make_docx, checker, first_section) == ["Раздел 1 (параграфы 1–2)"]
+
+    def test_title_page_is_exempt(self, make_docx, checker):
+        first_section = '<w:headerReference w:type="default" r:id="rIdPlain"/><w:titlePg/>'
+        assert self.unnumbered(make_docx, checker, first_section) == []
+
+    def test_first_page_header_is_exempt(self, make_docx, checker):
+        first_section = '<w:headerReference w:type="first" r:id="rIdPlain"/>'
+        assert self.unnumbered(make_docx, checker, first_section) == []
+
+    def test_all_sections_numbered(self, make_docx, checker):
+        first_section = '<w:headerReference w:type="default" r:id="rIdPage"/>'
+        assert self.unnumbered(make_docx, checker, first_section) == []
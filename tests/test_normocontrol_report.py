@@ -6,8 +6,8 @@ Run with: pytest tests/test_normocontrol_report.py --report-format=markdown
 """
 import pytest
 from pathlib import Path
-from docx import Document
 from tests.helpers.ooxml_utils import (
+    DocxPackage,
     get_document_xml,
     get_page_margins,
     get_page_size,
@@ -33,27 +33,29 @@ def test_all_documents_normocontrol(any_docx, normocontrol_report):
     doc_name = any_docx.name
     normocontrol_report.add_document(doc_name)
     
-    doc_xml = get_document_xml(any_docx)
-    doc = Document(any_docx)
+    # Open the archive once; all checks share the parsed parts.
+    with DocxPackage(any_docx) as package:
+        doc_xml = get_document_xml(package)
+        doc = package.python_docx()
     
-    # Check page margins
-    _check_page_margins(any_docx, doc_xml, normocontrol_report)
+        # Check page margins
+        _check_page_margins(any_docx, doc_xml, normocontrol_report)
     
-    # Check page size
-    _check_page_size(any_docx, doc_xml, normocontrol_report)
+        # Check page size
+        _check_page_size(any_docx, doc_xml, normocontrol_report)
     
-    # Check paragraph formatting
-    _check_paragraph_indents(any_docx, doc_xml, normocontrol_report)
-    _check_line_spacing(any_docx, doc_xml, normocontrol_report)
-    _check_alignment(any_docx, doc_xml, normocontrol_report)
+        # Check paragraph formatting
+        _check_paragraph_indents(any_docx, doc_xml, normocontrol_report)
+        _check_line_spacing(any_docx, doc_xml, normocontrol_report)
+        _check_alignment(any_docx, doc_xml, normocontrol_report)
     
-    # Check fonts
-    _check_fonts(any_docx, doc_xml, normocontrol_report)
-    _check_font_sizes(any_docx, doc_xml, normocontrol_report)
+        # Check fonts
+        _check_fonts(any_docx, doc_xml, normocontrol_report)
+        _check_font_sizes(any_docx, doc_xml, normocontrol_report)
     
-    # Check structure
-    _check_document_structure(any_docx, doc, normocontrol_report)
-    _check_table_captions(any_docx, doc, normocontrol_report)
+        # Check structure
+        _check_document_structure(any_docx, doc, normocontrol_report)
+        _check_table_captions(any_docx, doc, normocontrol_report)
 
 
 def _check_page_margins(docx_path, doc_xml, report):
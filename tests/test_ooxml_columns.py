@@ -0,0 +1,40 @@
+"""
+Tests for the columnar formatting table (tests/helpers/ooxml_columns.py).
+"""
+import pytest
+
+from tests.helpers.ooxml_columns import (
+    CONTEXT_BODY,
+    CONTEXT_CAPTION,
+    CONTEXT_HEADING,
+    CONTEXT_TABLE,
+    paragraph_context,
+)
+
+
+class TestParagraphContext:
+
+    @pytest.mark.parametrize("text", [
+        "Рисунок 1 – Схема алгоритма",
+        "Рисунок 12 — Диаграмма",
+        "Рисунок А.2 – Окно программы",
+        "Рисунок Б1 – Форма входа",
+        "рисунок 3 - Структура",
+    ])
+    def test_figure_captions(self, text):
+        assert paragraph_context(False, None, text) == CONTEXT_CAPTION
+
+    @pytest.mark.parametrize("text", [
+        "Рисунок показывает структуру базы данных.",
+        "Рисунок в приложении А поясняет схему.",
+        "Рисунки 1 и 2 показывают окна программы.",
+    ])
+    def test_sentences_about_figures_are_body_text(self, text):
+        assert paragraph_context(False, None, text) == CONTEXT_BODY
+
+    def test_caption_style(self):
+        assert paragraph_context(False, None, "Схема", style_name="Caption") == CONTEXT_CAPTION
+
+    def test_heading_and_table(self):
+        assert paragraph_context(False, 0, "Введение") == CONTEXT_HEADING
+        assert paragraph_context(True, None, "Ячейка") == CONTEXT_TABLE
@@ -0,0 +1,81 @@
+"""
+Tests for the canonical content fingerprint (tests/helpers/ooxml_fingerprint.py).
+"""
+import zipfile
+
+from tests.conftest import DEFAULT_SECT_PR, W_NAMESPACE
+from tests.helpers.ooxml_fingerprint import content_fingerprint
+from tests.helpers.ooxml_utils import DocxPackage
+
+
+HEADER_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header"
+HEADER = (
+    f'<w:hdr xmlns:w="{W_NAMESPACE}"><w:p>'
+    '<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple></w:p></w:hdr>'
+)
+BOLD = "<w:rPr><w:b/><w:sz w:val=\"28\"/></w:rPr>"
+
+
+def run(text: str, rpr: str = BOLD) -> str:
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def write(make_docx, runs: str, rsid: str = "00A01EE6", rel_id: str = "rId1", header: str = HEADER, **kwargs):
+    """A paragraph of `runs` and a final section using one header part."""
+    body = f'<w:p w:rsidR="{rsid}" w:rsidRDefault="{rsid}">{runs}</w:p>'
+    sect_pr = DEFAULT_SECT_PR.replace("<w:sectPr>", f'<w:sectPr><w:headerReference w:type="default" r:id="{rel_id}"/>')
+    rels = f'<Relationship Id="{rel_id}" Type="{HEADER_TYPE}" Target="header1.xml"/>'
+    return make_docx(body, parts={"word/header1.xml": header}, rels=rels, sect_pr=sect_pr, **kwargs)
+
+
+def fingerprint(path) -> str:
+    with DocxPackage(path) as package:
+        return content_fingerprint(package)
+
+
+BASE_RUNS = run("Пояснительная записка")
+
+
+class TestFingerprintIsStable:
+    """Changes Word makes on re-saving do not change the fingerprint."""
+
+    def test_same_content(self, make_docx):
+        assert fingerprint(write(make_docx, BASE_RUNS)) == fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_rsid_change(self, make_docx):
+        assert fingerprint(write(make_docx, BASE_RUNS)) == fingerprint(write(make_docx, BASE_RUNS, rsid="00FF1234"))
+
+    def test_proof_err_removal(self, make_docx):
+        marked = '<w:proofErr w:type="spellStart"/>' + BASE_RUNS + '<w:proofErr w:type="spellEnd"/>'
+        assert fingerprint(write(make_docx, marked)) == fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_run_splitting(self, make_docx):
+        split = run("Пояснительная ") + run("запи") + run("ска")
+        assert fingerprint(write(make_docx, split)) == fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_rel_id_renumbering(self, make_docx):
+        assert fingerprint(write(make_docx, BASE_RUNS)) == fingerprint(write(make_docx, BASE_RUNS, rel_id="rId7"))
+
+    def test_rezipping(self, make_docx):
+        stored = write(make_docx, BASE_RUNS, compression=zipfile.ZIP_STORED)
+        assert fingerprint(stored) == fingerprint(write(make_docx, BASE_RUNS))
+
+
+class TestFingerprintChanges:
+    """Content and formatting changes change the fingerprint."""
+
+    def test_text_change(self, make_docx):
+        changed = run("Пояснительная записка.")
+        assert fingerprint(write(make_docx, changed)) != fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_formatting_change(self, make_docx):
+        not_bold = run("Пояснительная записка", rpr='<w:rPr><w:sz w:val="28"/></w:rPr>')
+        assert fingerprint(write(make_docx, not_bold)) != fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_split_run_with_other_formatting(self, make_docx):
+        split = run("Пояснительная ") + run("записка", rpr='<w:rPr><w:b/><w:sz w:val="24"/></w:rPr>')
+        assert fingerprint(write(make_docx, split)) != fingerprint(write(make_docx, BASE_RUNS))
+
+    def test_header_change(self, make_docx):
+        dated = write(make_docx, BASE_RUNS, header=HEADER.replace(" PAGE ", " DATE "))
+        assert fingerprint(dated) != fingerprint(write(make_docx, BASE_RUNS))
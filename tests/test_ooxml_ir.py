@@ -0,0 +1,165 @@
+"""
+Tests for the on-disk IR cache (tests/helpers/ooxml_ir.py).
+"""
+import pytest
+
+from tests.conftest import DEFAULT_SECT_PR, W_NAMESPACE, paragraph_xml
+from tests.helpers import ooxml_ir, ooxml_views
+from tests.helpers.ooxml_ir import IRCache
+from tests.helpers.ooxml_utils import DocxPackage
+from tests.helpers.ooxml_views import DocumentViews
+from tests.helpers.report import NormocontrolReport
+from tests.helpers.result_cache import RESULT_CACHE_VERSION
+
+
+VIEWS = ["content_fingerprint", "text_model", "formatting_table", "sections", "paragraph_index"]
+
+BODY = (
+    paragraph_xml("Введение", ppr='<w:pStyle w:val="Heading1"/>')
+    + paragraph_xml("Текст работы.", ppr='<w:ind w:firstLine="709"/>', rpr='<w:sz w:val="28"/>')
+)
+
+
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+# Every part a cold check parses: styles, numbering, theme, header and their relationships
+PARTS = {
+    "word/styles.xml": (
+        f'<w:styles xmlns:w="{W_NAMESPACE}"><w:style w:type="paragraph" w:styleId="Heading1">'
+        '<w:name w:val="heading 1"/><w:pPr><w:outlineLvl w:val="0"/></w:pPr></w:style></w:styles>'
+    ),
+    "word/numbering.xml": f'<w:numbering xmlns:w="{W_NAMESPACE}"/>',
+    "word/theme/theme1.xml": (
+        '<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office">'
+        '<a:themeElements/></a:theme>'
+    ),
+    "word/header1.xml": (
+        f'<w:hdr xmlns:w="{W_NAMESPACE}"><w:p>'
+        '<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple></w:p></w:hdr>'
+    ),
+}
+RELS = "".join(
+    f'<Relationship Id="{rel_id}" Type="{REL}/{kind}" Target="{target}"/>'
+    for rel_id, kind, target in (("rId1", "styles", "styles.xml"), ("rId2", "numbering", "numbering.xml"),
+                                 ("rId3", "theme", "theme/theme1.xml"), ("rId4", "header", "header1.xml"))
+)
+SECT_PR = DEFAULT_SECT_PR.replace("<w:sectPr>", '<w:sectPr><w:headerReference w:type="default" r:id="rId4"/>')
+
+
+def build_and_store(cache: IRCache, path) -> DocumentViews:
+    """Walk a document and store its IR (as check_document does)."""
+    with DocxPackage(path) as package:
+        views = DocumentViews(package).build(VIEWS)
+        assert views.walks == 1
+        assert cache.store(package, paragraph_index=views["paragraph_index"])
+        return views
+
+
+def summary(views: DocumentViews):
+    """Comparable content of the views."""
+    table = views["formatting_table"]
+    return (
+        views["content_fingerprint"],
+        [(p.ordinal, p.text, p.level) for p in views["text_model"].paragraphs],
+        [list(getattr(table, name)) for name in table.PARAGRAPH_COLUMNS + table.RUN_COLUMNS],
+        [(s.index, s.margins, s.page_size) for s in views["sections"]],
+        len(views["paragraph_index"]),
+    )
+
+
+class TestIRRoundTrip:
+
+    def test_restored_views_need_no_walk(self, make_docx, tmp_path):
+        cache = IRCache(tmp_path)
+        path = make_docx(BODY)
+        built = build_and_store(cache, path)
+
+        with DocxPackage(path) as package:
+            ir = cache.load(package)
+            assert ir is not None
+            views = DocumentViews(package, known=ir).build(VIEWS)
+            assert views.walks == 0
+            assert summary(views) == summary(built)
+
+    def test_check_results_from_ir(self, make_docx, checker, cache_dir, monkeypatch):
+        path = make_docx(BODY)
+        compiled = checker.default_config()
+        first = checker.check_document(path, compiled)
+        # Drop the stored results: the second run evaluates the checks on the IR
+        for entry in (cache_dir / f"results-v{RESULT_CACHE_VERSION}").rglob("*.json"):
+            entry.unlink()
+
+        def walk(*args, **kwargs):
+            pytest.fail("document.xml was walked although its IR is cached")
+
+        monkeypatch.setattr(ooxml_views, "walk_document", walk)
+        second = checker.check_document(path, compiled)
+        assert not second.cached
+        assert second.report.issues == first.report.issues
+        assert second.fingerprint == first.fingerprint
+
+
+    def test_ir_only_run_parses_no_part(self, make_docx, checker, cache_dir, monkeypatch):
+        path = make_docx(BODY, parts=PARTS, rels=RELS, sect_pr=SECT_PR)
+        compiled = checker.default_config()
+        first = checker.check_document(path, compiled)
+
+        parsed = []
+        parse_part = DocxPackage._parse_part
+
+        def counting(package, part_name):
+            parsed.append(part_name)
+            return parse_part(package, part_name)
+
+        monkeypatch.setattr(DocxPackage, "_parse_part", counting)
+        registry = checker._rule_registry()
+        with DocxPackage(path) as package:
+            views = DocumentViews(package, known=IRCache().load(package)).build(registry.needs())
+            report = NormocontrolReport()
+            report.add_document(path.name)
+            report._required_sections_in_order = compiled.config.required_sections_in_order
+            for rule in registry.select():
+                rule.run(path.name, views, report, compiled.config)
+        assert views.built == []
+        assert parsed == []
+        assert report.issues == first.report.issues
+
+        # Through check_document, only the relationships naming the inputs of the checks
+        for entry in (cache_dir / f"results-v{RESULT_CACHE_VERSION}").rglob("*.json"):
+            entry.unlink()
+        second = checker.check_document(path, compiled)
+        assert second.report.issues == first.report.issues
+        assert set(parsed) == {"word/_rels/document.xml.rels"}
+
+
+class TestIRInvalidation:
+
+    def test_changed_document_misses(self, make_docx, tmp_path):
+        cache = IRCache(tmp_path)
+        build_and_store(cache, make_docx(BODY))
+        with DocxPackage(make_docx(BODY + paragraph_xml("Новый абзац."))) as package:
+            assert cache.load(package) is None
+
+    def test_resaved_document_shares_the_entry(self, make_docx, tmp_path):
+        cache = IRCache(tmp_path)
+        build_and_store(cache, make_docx(BODY))
+        resaved = make_docx(BODY.replace("<w:p>", '<w:p w:rsidR="00AB12CD">'))
+        with DocxPackage(resaved) as package:
+            assert cache.load(package) is None  # unknown archive bytes: one miss
+        build_and_store(cache, resaved)
+        assert len(list(cache.directory.glob("*.ir"))) == 1
+
+    def test_extractor_change_invalidates(self, make_docx, tmp_path, monkeypatch):
+        path = make_docx(BODY)
+        build_and_store(IRCache(tmp_path), path)
+        monkeypatch.setattr(ooxml_ir, "extractor_version", lambda: "0" * 64)
+        with DocxPackage(path) as package:
+            assert IRCache(tmp_path).load(package) is None
+
+    def test_damaged_entry_is_a_miss(self, make_docx, tmp_path):
+        cache = IRCache(tmp_path)
+        path = make_docx(BODY)
+        build_and_store(cache, path)
+        for entry in cache.directory.glob("*.ir"):
+            entry.write_bytes(entry.read_bytes()[:40])
+        with DocxPackage(path) as package:
+            assert cache.load(package) is None
@@ -0,0 +1,112 @@
+"""
+Tests for NumberingResolver (tests/helpers/ooxml_numbering.py).
+"""
+from tests.conftest import W_NAMESPACE
+from tests.helpers.ooxml_numbering import NumberingResolver
+from tests.helpers.ooxml_utils import DocxPackage, parse_xml
+
+
+def numbering_xml(abstracts: str, nums: str) -> str:
+    return f'<w:numbering xmlns:w="{W_NAMESPACE}">{abstracts}{nums}</w:numbering>'
+
+
+def level(ilvl: int, lvl_text: str, num_fmt: str = "decimal", start: int = 1) -> str:
+    return (
+        f'<w:lvl w:ilvl="{ilvl}"><w:start w:val="{start}"/><w:numFmt w:val="{num_fmt}"/>'
+        f'<w:lvlText w:val="{lvl_text}"/></w:lvl>'
+    )
+
+
+def abstract_num(abstract_id: str, levels: str, extra: str = "") -> str:
+    return f'<w:abstractNum w:abstractNumId="{abstract_id}">{extra}{levels}</w:abstractNum>'
+
+
+def num(num_id: str, abstract_id: str, overrides: str = "") -> str:
+    return f'<w:num w:numId="{num_id}"><w:abstractNumId w:val="{abstract_id}"/>{overrides}</w:num>'
+
+
+def start_override(ilvl: int, start: int) -> str:
+    return f'<w:lvlOverride w:ilvl="{ilvl}"><w:startOverride w:val="{start}"/></w:lvlOverride>'
+
+
+def resolver(abstracts: str, nums: str) -> NumberingResolver:
+    return NumberingResolver(parse_xml(numbering_xml(abstracts, nums).encode("utf-8")))
+
+
+def labels(numbering: NumberingResolver, items) -> list:
+    return [numbering.next_item(num_id, ilvl).label for num_id, ilvl in items]
+
+
+DECIMAL = level(0, "%1.")
+
+
+class TestNumberingResolver:
+
+    def test_consecutive_items(self):
+        numbering = resolver(abstract_num("0", DECIMAL), num("1", "0"))
+        assert labels(numbering, [("1", 0)] * 3) == ["1.", "2.", "3."]
+
+    def test_not_a_list(self):
+        numbering = resolver(abstract_num("0", DECIMAL), num("1", "0"))
+        assert numbering.next_item(None) is None
+        assert numbering.next_item("0") is None
+        assert numbering.next_item("42") is None
+
+    def test_counters_are_kept_per_abstract_num(self):
+        numbering = resolver(
+            abstract_num("0", DECIMAL) + abstract_num("1", level(0, "%1)", "russianLower")),
+            num("1", "0") + num("2", "0") + num("3", "1"),
+        )
+        # numId 1 and 2 share abstractNum 0 and continue each other
+        items = [("1", 0), ("1", 0), ("3", 0), ("2", 0), ("3", 0)]
+        assert labels(numbering, items) == ["1.", "2.", "а)", "3.", "б)"]
+
+    def test_start_override_restarts_a_shared_definition(self):
+        numbering = resolver(
+            abstract_num("0", DECIMAL),
+            num("1", "0") + num("2", "0", start_override(0, 1)) + num("3", "0", start_override(0, 10)),
+        )
+        items = [("1", 0), ("1", 0), ("2", 0), ("2", 0), ("3", 0)]
+        assert labels(numbering, items) == ["1.", "2.", "1.", "2.", "10."]
+
+    def test_start_value(self):
+        numbering = resolver(abstract_num("0", level(0, "%1", start=5)), num("1", "0"))
+        assert labels(numbering, [("1", 0)] * 2) == ["5", "6"]
+
+    def test_multi_level_labels(self):
+        levels = level(0, "%1.") + level(1, "%1.%2") + level(2, "%1.%2.%3", "lowerLetter")
+        numbering = resolver(abstract_num("0", levels), num("1", "0"))
+        items = [("1", 0), ("1", 1), ("1", 1), ("1", 2), ("1", 0), ("1", 1), ("1", 2)]
+        assert labels(numbering, items) == ["1.", "1.1", "1.2", "1.2.a", "2.", "2.1", "2.1.a"]
+
+    def test_bullets(self):
+        numbering = resolver(abstract_num("0", level(0, "•", "bullet")), num("1", "0"))
+        item = numbering.next_item("1", 0)
+        assert item.is_bullet
+        assert item.label == "•"
+
+    def test_reset(self):
+        numbering = resolver(abstract_num("0", DECIMAL), num("1", "0"))
+        labels(numbering, [("1", 0)] * 2)
+        numbering.reset()
+        assert labels(numbering, [("1", 0)]) == ["1."]
+
+    def test_num_style_link(self, make_docx):
+        # abstractNum 1 only links to the numbering style "ListStyle", whose
+        # numPr points at numId 1 (abstractNum 0, which holds the levels)
+        styles = (
+            f'<w:styles xmlns:w="{W_NAMESPACE}">'
+            '<w:style w:type="numbering" w:styleId="ListStyle"><w:name w:val="List Style"/>'
+            '<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>'
+            '</w:styles>'
+        )
+        numbering = numbering_xml(
+            abstract_num("0", level(0, "%1)", "upperRoman"), '<w:styleLink w:val="ListStyle"/>')
+            + abstract_num("1", "", '<w:numStyleLink w:val="ListStyle"/>'),
+            num("1", "0") + num("2", "1"),
+        )
+        path = make_docx(parts={"word/styles.xml": styles, "word/numbering.xml": numbering})
+        with DocxPackage(path) as package:
+            linked = NumberingResolver.from_package(package)
+            assert linked.definition("2")[0] == "0"
+            assert labels(linked, [("2", 0), ("2", 0), ("1", 0)]) == ["I)", "II)", "III)"]
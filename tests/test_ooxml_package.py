@@ -0,0 +1,148 @@
+"""
+Tests for DocxPackage (tests/helpers/ooxml_utils.py) on small synthetic
+archives.
+"""
+import hashlib
+import zipfile
+
+import pytest
+from lxml import etree
+
+from tests.conftest import paragraph_xml
+from tests.helpers.ooxml_utils import DocxPackage, PackageLimitError, PackageLimits, parse_xml
+
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+class TestPartHash:
+    """part_hash identifies parts without loading them whole."""
+
+    def test_xml_part_is_hashed_from_its_bytes(self, make_docx):
+        path = make_docx(paragraph_xml("Текст"))
+        with DocxPackage(path) as package:
+            expected = hashlib.sha256(package.read_bytes("word/document.xml")).hexdigest()
+            assert package.part_hash("word/document.xml") == expected
+            assert package.part_hash("word/missing.xml") == "-"
+
+    def test_xml_part_hash_survives_rezipping(self, make_docx):
+        body = paragraph_xml("Текст")
+        deflated = make_docx(body)
+        stored = make_docx(body, compression=zipfile.ZIP_STORED)
+        with DocxPackage(deflated) as first, DocxPackage(stored) as second:
+            assert first.part_hash("word/document.xml") == second.part_hash("word/document.xml")
+
+    def test_xml_part_is_streamed(self, make_docx, monkeypatch):
+        path = make_docx(paragraph_xml("Текст"))
+        with DocxPackage(path) as package:
+            monkeypatch.setattr(package, "read_bytes", None)
+            assert len(package.part_hash("word/document.xml")) == 64
+
+    def test_binary_part_is_not_decompressed(self, make_docx, monkeypatch):
+        path = make_docx(parts={"word/media/image1.png": PNG_BYTES})
+        with DocxPackage(path) as package:
+            monkeypatch.setattr(package, "read_bytes", None)
+            monkeypatch.setattr(package, "open_part", None)
+            digest = package.part_hash("word/media/image1.png")
+        assert len(digest) == 64
+
+    def test_binary_part_hash_follows_content(self, make_docx):
+        same = [make_docx(parts={"word/media/image1.png": PNG_BYTES}) for _ in range(2)]
+        changed = make_docx(parts={"word/media/image1.png": PNG_BYTES[::-1]})
+        digests = []
+        for path in same + [changed]:
+            with DocxPackage(path) as package:
+                digests.append(package.part_hash("word/media/image1.png"))
+        assert digests[0] == digests[1] != digests[2]
+
+
+class TestPackageLimits:
+    """Untrusted uploads are refused before anything large is inflated."""
+
+    def test_compression_ratio(self, make_docx):
+        # 2 MiB of one byte deflates to a few KiB (ratio ~1000:1)
+        path = make_docx(parts={"word/media/bomb.bin": b"0" * (2 * 1024 * 1024)})
+        with pytest.raises(PackageLimitError, match="степень сжатия"):
+            DocxPackage(path)
+
+    def test_part_size(self, make_docx):
+        path = make_docx(paragraph_xml("Текст " * 200))
+        with pytest.raises(PackageLimitError, match="word/document.xml"):
+            DocxPackage(path, limits=PackageLimits(max_part_size=1000))
+
+    def test_total_size(self, make_docx):
+        parts = {f"word/media/image{number}.png": PNG_BYTES for number in range(4)}
+        path = make_docx(parts=parts)
+        limits = PackageLimits(max_part_size=len(PNG_BYTES), max_total_size=3 * len(PNG_BYTES))
+        with pytest.raises(PackageLimitError, match="объём после распаковки"):
+            DocxPackage(path, limits=limits)
+
+    def test_within_limits(self, make_docx):
+        with DocxPackage(make_docx(paragraph_xml("Текст"))) as package:
+            assert package.has_part("word/document.xml")
+
+    def test_not_a_zip(self, tmp_path):
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip archive")
+        with pytest.raises(PackageLimitError, match="ZIP"):
+            DocxPackage(path)
+
+
+class TestHardenedParser:
+    """parse_xml does not expand entities, load DTDs or build unbounded trees."""
+
+    ENTITY_EXPANSION = (
+        b'<?xml version="1.0"?>'
+        b'<!DOCTYPE bomb ['
+        b'<!ENTITY a "aaaaaaaaaa">'
+        b'<!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">'
+        b'<!ENTITY c "&b;&b;&b;&b;&b;&b;&b;&b;&b;&b;">'
+        b'<!ENTITY d "&c;&c;&c;&c;&c;&c;&c;&c;&c;&c;">'
+        b']><root>&d;&d;&d;&d;&d;&d;&d;&d;&d;&d;</root>'
+    )
+
+    EXTERNAL_ENTITY = (
+        b'<?xml version="1.0"?>'
+        b'<!DOCTYPE root [<!ENTITY secret SYSTEM "file:///etc/hostname">]>'
+        b'<root>&secret;</root>'
+    )
+
+    def test_entity_expansion_is_rejected(self):
+        root = parse_xml(self.ENTITY_EXPANSION)
+        # References stay unresolved entity nodes; nothing is expanded
+        assert root.text is None
+        assert len(root) == 10
+        assert all(child.tag is etree.Entity for child in root)
+        assert "aaaaaaaaaa" not in etree.tostring(root, encoding="unicode")
+
+    def test_external_entity_is_not_loaded(self):
+        root = parse_xml(self.EXTERNAL_ENTITY)
+        assert root.text is None
+        assert [child.tag for child in root] == [etree.Entity]
+        assert etree.tostring(root) == b"<root>&secret;</root>"
+
+    def test_deep_nesting_is_a_limit_error(self, make_docx):
+        depth = 5000
+        body = "<w:p>" + "<w:ins>" * depth + "</w:ins>" * depth + "</w:p>"
+        with DocxPackage(make_docx(body)) as package:
+            with pytest.raises(PackageLimitError, match="word/document.xml"):
+                package.document_xml()
+
+
+class TestCheckDocumentLimits:
+    """check_document reports a refused package as one issue of the document."""
+
+    def test_limit_error_is_reported(self, make_docx, checker):
+        path = make_docx(parts={"word/media/bomb.bin": b"0" * (2 * 1024 * 1024)})
+        result = checker.check_document(path, checker.default_config(), doc_name="bomb.docx", use_cache=False)
+
+        issues = result.report.issues
+        assert [(issue.category, issue.severity) for issue in issues] == [("package", "error")]
+        assert issues[0].description == "Документ не может быть проверен"
+        assert "степень сжатия" in issues[0].actual
+        assert result.report.documents_checked == ["bomb.docx"]
+
+    def test_entity_payload_in_document(self, make_docx, checker):
+        path = make_docx(parts={"word/document.xml": TestHardenedParser.ENTITY_EXPANSION})
+        result = checker.check_document(path, checker.default_config(), use_cache=False)
+        assert all("aaaaaaaaaa" not in issue.actual for issue in result.report.issues)
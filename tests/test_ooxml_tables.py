@@ -0,0 +1,155 @@
+"""
+Tests for the table grid model (tests/helpers/ooxml_tables.py), checked
+against python-docx `row.cells` on the same w:tbl elements.
+"""
+from docx import Document
+
+from tests.helpers.ooxml_paths import W_VAL
+from tests.helpers.ooxml_tables import W_H_MERGE, W_TC_PR, TableGrid
+
+
+GRID = '<w:tblGrid><w:gridCol/><w:gridCol/><w:gridCol/></w:tblGrid>'
+
+
+def tc(text: str = "", pr: str = "") -> str:
+    return f'<w:tc><w:tcPr>{pr}</w:tcPr><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:tc>'
+
+
+def tr(*cells: str, pr: str = "") -> str:
+    pr = f"<w:trPr>{pr}</w:trPr>" if pr else ""
+    return f"<w:tr>{pr}{''.join(cells)}</w:tr>"
+
+
+def tbl(*rows: str) -> str:
+    return f"<w:tbl>{GRID}{''.join(rows)}</w:tbl><w:p/>"
+
+
+def load_table(make_docx, *rows: str):
+    """The first table of a generated document, as python-docx sees it."""
+    return Document(make_docx(tbl(*rows))).tables[0]
+
+
+def docx_cells(table):
+    """w:tc owning each cell of python-docx `row.cells`, row by row."""
+    return [[cell._tc for cell in row.cells] for row in table.rows]
+
+
+def grid_cells(grid: TableGrid):
+    """w:tc owning each grid position (gaps before a row skipped, as in python-docx)."""
+    return [[cell.element for cell in row if cell is not None] for row in grid.rows]
+
+
+def grid_texts(grid: TableGrid):
+    return [[cell.text if cell is not None else None for cell in row] for row in grid.rows]
+
+
+class TestTableGridMatchesPythonDocx:
+
+    def test_plain_table(self, make_docx):
+        table = load_table(make_docx, tr(tc("a"), tc("b"), tc("c")), tr(tc("d"), tc("e"), tc("f")))
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_cells(grid) == docx_cells(table)
+        assert grid.column_count == 3
+        assert len(grid.cells) == 6
+
+    def test_grid_span(self, make_docx):
+        table = load_table(
+            make_docx,
+            tr(tc("a", '<w:gridSpan w:val="2"/>'), tc("b")),
+            tr(tc("c"), tc("d", '<w:gridSpan w:val="2"/>')),
+        )
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_cells(grid) == docx_cells(table)
+        assert grid_texts(grid) == [["a", "a", "b"], ["c", "d", "d"]]
+        assert grid.cell_at(0, 0).col_span == 2
+        assert grid.right_of(grid.cell_at(0, 0)).text == "b"
+
+    def test_vertical_merge_restart_and_continue(self, make_docx):
+        table = load_table(
+            make_docx,
+            tr(tc("a", '<w:vMerge w:val="restart"/>'), tc("b"), tc("c")),
+            tr(tc("", '<w:vMerge/>'), tc("d"), tc("e")),
+            tr(tc("", '<w:vMerge w:val="continue"/>'), tc("f"), tc("g")),
+            tr(tc("h", '<w:vMerge w:val="restart"/>'), tc("i"), tc("j")),
+        )
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_cells(grid) == docx_cells(table)
+        merged = grid.cell_at(2, 0)
+        assert (merged.text, merged.row, merged.row_span) == ("a", 0, 3)
+        assert grid.cell_at(3, 0).text == "h"
+
+    def test_vertical_merge_of_spanned_cells(self, make_docx):
+        table = load_table(
+            make_docx,
+            tr(tc("a", '<w:gridSpan w:val="2"/><w:vMerge w:val="restart"/>'), tc("b")),
+            tr(tc("", '<w:gridSpan w:val="2"/><w:vMerge/>'), tc("c")),
+        )
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_cells(grid) == docx_cells(table)
+        assert grid.cell_at(1, 1) is grid.cell_at(0, 0)
+
+    def test_grid_before(self, make_docx):
+        table = load_table(
+            make_docx,
+            tr(tc("a"), tc("b"), tc("c")),
+            tr(tc("d"), tc("e"), pr='<w:gridBefore w:val="1"/>'),
+        )
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_cells(grid) == docx_cells(table)
+        assert grid_texts(grid)[1] == [None, "d", "e"]
+        assert grid.cell_at(1, 1).col == 1
+
+    def test_horizontal_merge(self, make_docx):
+        # python-docx leaves the legacy w:hMerge unresolved: each w:tc is a cell.
+        # The grid merges a continuation into the cell that restarts it.
+        table = load_table(
+            make_docx,
+            tr(tc("a", '<w:hMerge w:val="restart"/>'), tc("", '<w:hMerge/>'), tc("b")),
+        )
+        grid = TableGrid.from_element(table._tbl)
+
+        expected = []
+        for row in docx_cells(table):
+            owners = []
+            for element in row:
+                h_merge = element.find(f"{W_TC_PR}/{W_H_MERGE}")
+                if h_merge is not None and h_merge.get(W_VAL, "continue") == "continue":
+                    element = owners[-1]
+                owners.append(element)
+            expected.append(owners)
+        assert grid_cells(grid) == expected
+        assert grid_texts(grid) == [["a", "a", "b"]]
+        assert grid.cell_at(0, 1).col_span == 2
+
+
+class TestWrappedRows:
+    """Rows and cells inside content controls (python-docx does not see them)."""
+
+    ROWS = (
+        tr(tc("a", '<w:vMerge w:val="restart"/>'), tc("b"), tc("c")),
+        tr(tc("", '<w:vMerge/>'), tc("d"), tc("e")),
+        tr(tc("f"), tc("g", '<w:gridSpan w:val="2"/>')),
+    )
+
+    def test_sdt_rows_match_the_unwrapped_table(self, make_docx):
+        plain = load_table(make_docx, *self.ROWS)
+        wrapped = load_table(
+            make_docx,
+            self.ROWS[0],
+            f"<w:sdt><w:sdtPr/><w:sdtContent>{self.ROWS[1]}{self.ROWS[2]}</w:sdtContent></w:sdt>",
+        )
+        assert len(wrapped.rows) == 1  # python-docx skips the wrapped rows
+
+        expected = grid_texts(TableGrid.from_element(plain._tbl))
+        assert expected == [[cell.text for cell in row.cells] for row in plain.rows]
+        grid = TableGrid.from_element(wrapped._tbl)
+        assert grid_texts(grid) == expected
+        assert grid.cell_at(1, 0).row_span == 2
+
+    def test_sdt_cells(self, make_docx):
+        table = load_table(
+            make_docx,
+            tr(tc("a"), f"<w:sdt><w:sdtContent>{tc('b')}</w:sdtContent></w:sdt>", tc("c")),
+        )
+        grid = TableGrid.from_element(table._tbl)
+        assert grid_texts(grid) == [["a", "b", "c"]]
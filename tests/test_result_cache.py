@@ -0,0 +1,68 @@
+"""
+Tests for the on-disk result cache (tests/helpers/result_cache.py).
+"""
+import os
+
+import pytest
+
+from tests.helpers.result_cache import SIZE_INDEX, ResultCache, result_key
+
+
+def entry(size: int) -> dict:
+    """A result whose stored JSON is about `size` bytes."""
+    return {"issues": "x" * size}
+
+
+def store(cache: ResultCache, name: str, size: int, mtime: float) -> str:
+    key = result_key(name)
+    cache.put(key, entry(size))
+    os.utime(cache._entry_path(key), (mtime, mtime))
+    return key
+
+
+class TestResultCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        key = result_key("document", "config", "checker")
+        assert cache.get(key) is None
+        cache.put(key, {"issues": [{"severity": "error"}]})
+        assert cache.get(key) == {"issues": [{"severity": "error"}]}
+
+    def test_store_does_not_scan_below_bound(self, tmp_path, monkeypatch):
+        cache = ResultCache(tmp_path, max_bytes=10_000)
+        cache.put(result_key("first"), entry(100))  # initializes the size index
+
+        def scan():
+            pytest.fail("the directory is scanned on a store below the bound")
+
+        monkeypatch.setattr(cache, "_entries", scan)
+        for number in range(5):
+            cache.put(result_key(str(number)), entry(100))
+        assert 600 <= cache._read_size() < 1000
+
+    def test_replacing_an_entry_keeps_the_total(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        cache.put(result_key("same"), entry(100))
+        size = cache._read_size()
+        cache.put(result_key("same"), entry(100))
+        assert cache._read_size() == size
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResultCache(tmp_path, max_bytes=1000)
+        old = store(cache, "old", 300, mtime=1_000)
+        used = store(cache, "used", 300, mtime=2_000)
+        store(cache, "recent", 300, mtime=3_000)
+        cache.get(used)  # a hit marks the entry as recently used
+        store(cache, "new", 300, mtime=4_000)
+
+        assert cache.get(old) is None
+        assert cache.get(used) is not None
+        assert cache._read_size() == cache._scan_size() <= 1000 * 0.8
+
+    def test_lost_index_is_rebuilt(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        cache.put(result_key("first"), entry(100))
+        (cache.directory / SIZE_INDEX).unlink()
+        cache.put(result_key("second"), entry(100))
+        assert cache._read_size() == cache._scan_size()